@@ -1,52 +1,134 @@
 import os
-import time
 import json
+import time
 import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from ai_dashboard.create_design import create_design_json
 from generate_ui import generate_ui_from_design
-from ai_core.feedback_manager import get_feedback_history
+from ai_core.feedback_aggregator import FeedbackAggregator
+from ai_core.feedback_manager import add_tenant_feedback_listener, get_feedback_store, remove_tenant_feedback_listener
+from ai_core.feedback_watcher import FeedbackWatcher
+from ai_core.atomic_io import atomic_write_json
+from ai_core.design_model import DesignCard, load_design
+from ai_core.tenant import clear_pending, get_tenant, pending_tenants
 
 DESIGN_FILE = "data/design.json"
+METRICS_FILE = "logs/agent_metrics.json"
+
+# Geri bildirim gelmese bile en geç bu aralıkla kontrol yapılır (sn)
+AGENT_MAX_INTERVAL = 180
+# Ardışık geri bildirimler bu kadar sessizlik olana kadar birleştirilir (sn)
+AGENT_DEBOUNCE = 2.0
+# Birleştirme en fazla bu kadar sürer (sürekli akışta döngü aç kalmasın)
+AGENT_MAX_DEBOUNCE = 10.0
+# Hata sonrası bekleme (sn)
+AGENT_ERROR_BACKOFF = 60
+# Tasarım bütçesi: agent'ın eklediği kartlar bu sınırlar aşılınca en eskiden başlanarak çıkarılır
+DESIGN_MAX_CARDS = 12
+DESIGN_MAX_BYTES = 16 * 1024
+# Agent'ın eklediği kartları kullanıcı/üretici kartlarından ayıran işaret
+AGENT_CARD_SOURCE = "agent"
+# Çok kiracılı modda aynı anda işlenecek en fazla kiracı
+TENANT_WORKERS = 8
+# Başka süreçlerin bıraktığı bekleyen işaretlerine en geç bu aralıkla bakılır (sn)
+TENANT_POLL_INTERVAL = 1.0
+
+# Kiracı kimliği -> geri bildirim toplayıcı
+_aggregators = {}
+_aggregators_lock = threading.Lock()
 
-def analyze_feedback():
+def get_aggregator(tenant=None):
+    tenant = get_tenant(tenant)
+    with _aggregators_lock:
+        aggregator = _aggregators.get(tenant.tenant_id)
+        if aggregator is None:
+            if tenant.is_default:
+                aggregator = FeedbackAggregator()
+            else:
+                aggregator = FeedbackAggregator(store=get_feedback_store(tenant), state_file=tenant.feedback_state_file)
+            _aggregators[tenant.tenant_id] = aggregator
+    return aggregator
+
+def _design_file(tenant):
+    return DESIGN_FILE if tenant.is_default else tenant.design_file
+
+def analyze_feedback(only_new=False, tenant=None):
     """
     Geri bildirimleri analiz eder.
-    Olumsuz geri bildirimlerde, UI'de daha büyük değişiklikler yapılır.
+    Yalnızca son kontrolden sonra gelen kayıtlar okunur; karar tek bir oya
+    değil, kayan pencere istatistiklerine (son N olay, son saat, seri) dayanır.
+    `only_new` ise yeni kayıt yokken boş sözlük döner.
     """
-    history = get_feedback_history()
-    if not history:
+    aggregator = get_aggregator(tenant)
+    new_events = aggregator.update()
+    if only_new and new_events == 0:
         return {}
+    stats = aggregator.stats()
+    print(f"🔍 {new_events} yeni geri bildirim | son {stats['recent']['count']} olay onay oranı: "
+          f"{stats['recent']['rate']} | son saat: {stats['hour']['rate']} | seri: {stats['streak']}")
+    return aggregator.decide()
 
-    last = history[-1]
-    print(f"🔍 Son geri bildirim: {last}")
+def _card_key(card):
+    data = card.model_dump(mode="json", exclude_unset=True)
+    data.pop("source", None)
+    return json.dumps(data, sort_keys=True, ensure_ascii=False)
 
-    if not last.get("approved"):
-        # Olumsuz geri bildirimde radikal değişiklik
-        return {
-            "force_new_palette": True,
-            "force_new_layout": True,
-            "more_cards": True
-        }
-    else:
-        # Olumluysa küçük iyileştirme
-        return {
-            "refresh_ui": True
-        }
+def _design_size(design):
+    return len(json.dumps(design.to_dict(), indent=2, ensure_ascii=False).encode("utf-8"))
 
-def smart_modify_design():
+def compact_design(design, max_cards=DESIGN_MAX_CARDS, max_bytes=DESIGN_MAX_BYTES):
     """
-    design.json'u okur, geri bildirimlere göre değiştirir ve kaydeder.
+    Tasarımı bütçeye indirir (yerinde) ve çıkarılan kart sayısını döndürür.
+    Önce birebir aynı kartların ilki dışındakiler atılır; sınırlar hâlâ
+    aşılıyorsa agent'ın eklediği kartlar en eskiden başlanarak çıkarılır.
+    Kullanıcı/üretici kartlarına dokunulmaz. Aynı girdi her zaman aynı sonucu verir.
     """
-    if not os.path.exists(DESIGN_FILE):
+    seen = set()
+    cards = []
+    for card in design.cards:
+        key = _card_key(card)
+        if key not in seen:
+            seen.add(key)
+            cards.append(card)
+    removed = len(design.cards) - len(cards)
+
+    agent_cards = [i for i, card in enumerate(cards) if getattr(card, "source", None) == AGENT_CARD_SOURCE]
+    evict = set()
+    while agent_cards and len(cards) - len(evict) > max_cards:
+        evict.add(agent_cards.pop(0))
+    cards = [card for i, card in enumerate(cards) if i not in evict]
+    removed += len(evict)
+
+    design.cards = cards
+    while _design_size(design) > max_bytes:
+        oldest = next((i for i, card in enumerate(design.cards) if getattr(card, "source", None) == AGENT_CARD_SOURCE), None)
+        if oldest is None:
+            print(f"⚠️  Tasarım bütçeyi aşıyor ({_design_size(design)} > {max_bytes} bayt) ama çıkarılabilecek agent kartı yok.")
+            break
+        design.cards = design.cards[:oldest] + design.cards[oldest + 1:]
+        removed += 1
+    return removed
+
+def smart_modify_design(feedback=None, tenant=None):
+    """
+    Kiracının design.json'unu okur, geri bildirimlere göre değiştirir ve kaydeder.
+    Tasarım ortak yükleyiciden gelir; paylaşılan nesne değil kopyası düzenlenir.
+    Kaydetmeden önce kart/boyut bütçesine göre sıkıştırılır (compact_design).
+    """
+    tenant = get_tenant(tenant)
+    design_file = _design_file(tenant)
+    if not os.path.exists(design_file):
         print("❌ design.json bulunamadı, sıfırdan oluşturuluyor...")
-        create_design_json()
+        create_design_json(tenant=tenant)
         return
 
-    with open(DESIGN_FILE, "r", encoding="utf-8") as f:
-        design = json.load(f)
+    design = load_design(design_file).model.model_copy(deep=True)
 
-    feedback = analyze_feedback()
+    if feedback is None:
+        feedback = analyze_feedback(tenant=tenant)
 
     if feedback.get("force_new_palette"):
         palettes = [
@@ -56,63 +138,241 @@ def smart_modify_design():
             {"background": "#ececec", "color": "#222"}
         ]
         new_palette = random.choice(palettes)
-        design["background"] = new_palette["background"]
-        design["color"] = new_palette["color"]
-        design["title"] = random.choice(["Yeni Nesil Panel", "Modern Dashboard", "AI Yeniden Tasarımı"])
-        design["header"] = random.choice(["Merhaba! Yeniden Başladık", "Yeni Tasarım Hazır", "Kullanıcı Geri Bildirimiyle Geliştirildi"])
+        design.background = new_palette["background"]
+        design.color = new_palette["color"]
+        design.title = random.choice(["Yeni Nesil Panel", "Modern Dashboard", "AI Yeniden Tasarımı"])
+        design.header = random.choice(["Merhaba! Yeniden Başladık", "Yeni Tasarım Hazır", "Kullanıcı Geri Bildirimiyle Geliştirildi"])
         print("🎨 Yeni renk paleti ve başlık seçildi.")
 
     if feedback.get("more_cards"):
         # Kart sayısını artırıyoruz
         extra_cards = [
-            {"title": "Yeni Öneri", "content": "Bu yeni kart AI tarafından önerildi."},
-            {"title": "İpucu", "content": "Daha açık renklerle tasarımı deniyoruz."}
+            DesignCard(title="Yeni Öneri", content="Bu yeni kart AI tarafından önerildi.", source=AGENT_CARD_SOURCE),
+            DesignCard(title="İpucu", content="Daha açık renklerle tasarımı deniyoruz.", source=AGENT_CARD_SOURCE)
         ]
-        design["cards"].extend(random.sample(extra_cards, k=min(2, len(extra_cards))))
+        design.cards = design.cards + random.sample(extra_cards, k=min(2, len(extra_cards)))
         print("🃏 Ekstra kartlar eklendi.")
 
     # Layout rastgele değiştirilebilir
     if feedback.get("force_new_layout"):
         layouts = ["grid", "list", "masonry"]
-        design["layout"] = random.choice(layouts)
-        print(f"📐 Layout tipi değiştirildi: {design['layout']}")
+        design.layout = random.choice(layouts)
+        print(f"📐 Layout tipi değiştirildi: {design.layout}")
+
+    removed = compact_design(design)
+    if removed:
+        print(f"🧹 Bütçe için {removed} kart çıkarıldı ({len(design.cards)} kart kaldı).")
 
-    # Dosyayı kaydet
-    with open(DESIGN_FILE, "w", encoding="utf-8") as f:
-        json.dump(design, f, indent=2, ensure_ascii=False)
+    # Dosyayı kaydet (atomik; izleyici yarım dosya görmez)
+    atomic_write_json(design_file, design.to_dict())
 
     print(f"💾 Yeni design.json kaydedildi ({datetime.now().strftime('%H:%M:%S')})")
 
-def update_design_based_on_feedback():
+def update_design_based_on_feedback(skip_if_unchanged=True, tenant=None):
     """
-    Geri bildirimleri değerlendirip UI'yi günceller.
+    Kiracının geri bildirimlerini değerlendirip UI'yi günceller.
+    Yeni geri bildirim yoksa hiçbir şey yapmaz ve False döndürür.
     """
-    print("🕵️  Geri bildirim analizi başlatıldı...")
-    feedback = analyze_feedback()
+    tenant = get_tenant(tenant)
+    design_file = _design_file(tenant)
+    print(f"🕵️  Geri bildirim analizi başlatıldı ({tenant.tenant_id})...")
+    feedback = analyze_feedback(only_new=skip_if_unchanged, tenant=tenant)
+    if not feedback:
+        print("⏭  Yeni geri bildirim yok, tasarım yeniden üretilmedi.")
+        return False
 
     if feedback.get("force_new_palette") or feedback.get("force_new_layout"):
-        smart_modify_design()
+        smart_modify_design(feedback, tenant=tenant)
+        # Varsayılan kiracıda UI'yi auto_folder_manager izleyicisi üretir; kök
+        # izleyici tenants/ klasörünü yok saydığı için (bir kiracının tasarımı
+        # varsayılan çıktıya yazılmasın) adlandırılmış kiracılarda burada üretilir.
+        if not tenant.is_default and os.path.exists(design_file):
+            generate_ui_from_design(design_file_path=design_file, tenant=tenant)
     else:
         # sadece refresh
-        if os.path.exists(DESIGN_FILE):
-            generate_ui_from_design(design_file_path=DESIGN_FILE)
+        if os.path.exists(design_file):
+            generate_ui_from_design(design_file_path=design_file, tenant=tenant)
             print("🔄 Mevcut tasarımdan UI yeniden üretildi.")
+    return True
 
-def agent_loop():
+class TenantScheduler:
     """
-    3 dakikada bir geri bildirim kontrolü ve UI güncelleme
+    Tek süreçte çok sayıda kiracıya hizmet veren zamanlayıcı.
+
+    Yalnızca bekleyen geri bildirimi olan kiracılar uyandırılır: aynı süreçteki
+    kayıtlar dinleyiciyle, başka süreçlerinkiler tenants/.pending/<id>
+    işaretleriyle yakalanır. Bir turun maliyeti toplam kiracı sayısıyla değil
+    bekleyen kiracı sayısıyla orantılıdır. İşaret kiracı işlenmeden önce
+    silinir; işlem sırasında gelen geri bildirim yeni işaret bırakır ve bir
+    sonraki turda ele alınır.
     """
-    print("🤖 Adaptif Agent Loop başlatıldı (3 dakikada bir). Ctrl+C ile çık.")
-    while True:
+
+    def __init__(self, workers=TENANT_WORKERS, poll_interval=TENANT_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.wakeups = 0
+        self.serviced = 0
+        self.errors = 0
+        self._ready = set()
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tenant")
+
+    def start(self):
+        add_tenant_feedback_listener(self._on_feedback)
+        return self
+
+    def stop(self):
+        remove_tenant_feedback_listener(self._on_feedback)
+        self._executor.shutdown(wait=True)
+
+    def _on_feedback(self, tenant, record):
+        if tenant.is_default:
+            return
+        with self._cond:
+            self._ready.add(tenant.tenant_id)
+            self._cond.notify()
+
+    def collect(self, timeout=0):
+        """Bekleyen kiracı kimlikleri; hiçbiri yoksa en fazla `timeout` sn bekler."""
+        with self._cond:
+            if not self._ready and timeout:
+                self._cond.wait(timeout)
+            ready, self._ready = self._ready, set()
+        return ready | pending_tenants()
+
+    def _service(self, tenant_id):
+        clear_pending(tenant_id)
         try:
-            update_design_based_on_feedback()
-            time.sleep(180)
+            return update_design_based_on_feedback(tenant=tenant_id)
+        except Exception as e:
+            with self._cond:
+                self.errors += 1
+            print(f"❌ Kiracı {tenant_id} işlenemedi: {e}")
+            return False
+
+    def run_once(self, timeout=0) -> int:
+        """Bekleyen kiracıları paralel işler ve işlenen kiracı sayısını döndürür."""
+        tenants = sorted(self.collect(timeout))
+        if not tenants:
+            return 0
+        self.wakeups += 1
+        list(self._executor.map(self._service, tenants))
+        self.serviced += len(tenants)
+        return len(tenants)
+
+    def run_forever(self):
+        while True:
+            self.run_once(timeout=self.poll_interval)
+
+    def stats(self):
+        return {"wakeups": self.wakeups, "serviced": self.serviced, "errors": self.errors}
+
+class LoopMetrics:
+    """Tur başına gecikme ve atlanan tur sayısı."""
+
+    def __init__(self, path=METRICS_FILE):
+        self.path = path
+        self.ticks = 0
+        self.skipped_ticks = 0
+        self.errors = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.last_wake_reason = None
+
+    def record(self, latency, skipped, reason):
+        self.ticks += 1
+        self.skipped_ticks += int(skipped)
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+        self.last_wake_reason = reason
+        self.save()
+
+    def as_dict(self):
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "ticks": self.ticks,
+            "skipped_ticks": self.skipped_ticks,
+            "errors": self.errors,
+            "last_tick_latency_ms": round(self.last_latency * 1000, 2),
+            "avg_tick_latency_ms": round(self.total_latency / self.ticks * 1000, 2) if self.ticks else 0.0,
+            "max_tick_latency_ms": round(self.max_latency * 1000, 2),
+            "last_wake_reason": self.last_wake_reason
+        }
+
+    def save(self):
+        try:
+            atomic_write_json(self.path, self.as_dict())
+        except OSError as e:
+            print(f"⚠️ Metrikler yazılamadı: {e}")
+
+def run_tick(metrics, reason):
+    started = time.perf_counter()
+    updated = update_design_based_on_feedback()
+    latency = time.perf_counter() - started
+    metrics.record(latency, skipped=not updated, reason=reason)
+    print(f"⏱  Tur süresi: {latency * 1000:.1f} ms | atlanan tur: {metrics.skipped_ticks}/{metrics.ticks}")
+
+def agent_loop(mode="event", max_interval=AGENT_MAX_INTERVAL, debounce=AGENT_DEBOUNCE):
+    """
+    Geri bildirim kontrolü ve UI güncelleme döngüsü.
+
+    event: yeni geri bildirim yazıldığında uyanır (ardışık kayıtlar
+           `debounce` ile birleştirilir), en geç `max_interval` saniyede bir kontrol eder.
+    poll : eskisi gibi sabit `max_interval` aralıkla kontrol eder.
+    """
+    metrics = LoopMetrics()
+    watcher = FeedbackWatcher().start() if mode == "event" else None
+    if watcher:
+        print(f"🤖 Adaptif Agent Loop başlatıldı (olay tabanlı, en geç {max_interval} sn). Ctrl+C ile çık.")
+    else:
+        print(f"🤖 Adaptif Agent Loop başlatıldı ({max_interval} sn'de bir). Ctrl+C ile çık.")
+
+    reason = "startup"
+    try:
+        while True:
+            try:
+                run_tick(metrics, reason)
+                if watcher:
+                    if watcher.wait(max_interval):
+                        watcher.wait_quiet(debounce, AGENT_MAX_DEBOUNCE)
+                        reason = "feedback"
+                    else:
+                        reason = "timeout"
+                else:
+                    time.sleep(max_interval)
+                    reason = "timeout"
+            except KeyboardInterrupt:
+                print("⏹ Agent loop durduruldu.")
+                break
+            except Exception as e:
+                metrics.errors += 1
+                print(f"❌ Agent loop hatası: {e}")
+                time.sleep(AGENT_ERROR_BACKOFF)
+                reason = "retry"
+    finally:
+        if watcher:
+            watcher.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Geri bildirime göre tasarımı güncelleyen agent döngüsü.")
+    parser.add_argument("--mode", choices=["event", "poll"], default="event", help="Uyanma stratejisi.")
+    parser.add_argument("--max-interval", type=float, default=AGENT_MAX_INTERVAL, help="En uzun bekleme süresi (sn).")
+    parser.add_argument("--debounce", type=float, default=AGENT_DEBOUNCE, help="Ardışık geri bildirimleri birleştirme süresi (sn).")
+    parser.add_argument("--tenants", action="store_true", help="Çok kiracılı mod: yalnızca bekleyen geri bildirimi olan kiracıları işle.")
+    parser.add_argument("--workers", type=int, default=TENANT_WORKERS, help="Çok kiracılı modda paralel işlenecek kiracı sayısı.")
+    args = parser.parse_args()
+    if args.tenants:
+        scheduler = TenantScheduler(workers=args.workers).start()
+        print(f"🤖 Çok kiracılı agent başlatıldı ({args.workers} işçi). Ctrl+C ile çık.")
+        try:
+            scheduler.run_forever()
         except KeyboardInterrupt:
             print("⏹ Agent loop durduruldu.")
-            break
-        except Exception as e:
-            print(f"❌ Agent loop hatası: {e}")
-            time.sleep(60)
+        finally:
+            scheduler.stop()
+        return
+    agent_loop(mode=args.mode, max_interval=args.max_interval, debounce=args.debounce)
 
 if __name__ == "__main__":
-    agent_loop()
+    main()
@@ -0,0 +1,190 @@
+# activity_log.py - Son etkinlikler: bellekte sınırlı halka + süreçler arası paylaşılan günlük
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from ai_core.file_lock import FileLock
+from ai_core.jsonl_store import JsonlStore
+
+# Tüm süreçlerin eklediği ortak etkinlik günlüğü (yerel kanal)
+ACTIVITY_LOG = "data/activity.jsonl"
+# Bellekte tutulan son etkinlik sayısı
+ACTIVITY_BUFFER_SIZE = 200
+# Günlük dosyası bu kadar kayda sıkıştırılır (fazlası arşive)
+ACTIVITY_MAX_RECORDS = 2000
+# Başka süreçlerin eklediği etkinlikler için günlüğün kontrol aralığı (sn)
+ACTIVITY_POLL_INTERVAL = 0.5
+
+# Etkinlik türleri
+ACTIVITY_FEEDBACK = "feedback_saved"
+ACTIVITY_DESIGN = "design_generated"
+ACTIVITY_UI = "ui_regenerated"
+ACTIVITY_FILE = "file_organized"
+
+
+class ActivityFeed:
+    """
+    Son etkinliklerin bellekteki sınırlı halkası (`deque(maxlen=size)`).
+
+    Etkinlikler ortak bir JSONL günlüğüne eklenir; her süreç günlüğü kaldığı
+    bayt konumundan okuyarak (sıkıştırma sonrası dosya kimliği değişince
+    baştan, görülmüş kimlikleri atlayarak) diğer süreçlerin etkinliklerini de
+    halkasına alır. Okumalar hiçbir zaman geçmişin tamamını taramaz.
+
+    Her etkinliğin `id`'si günlükteki sıra numarasıdır: günlük kilidi altında
+    son kaydın kimliğine bir eklenerek atanır, bu yüzden tüm süreçlerde
+    benzersizdir ve ekleme sırasıyla artar. Halka da bu sırayla dolar;
+    sayfalama ve akışta imleç olarak kullanılır.
+    """
+
+    def __init__(self, path=ACTIVITY_LOG, size=ACTIVITY_BUFFER_SIZE, max_records=ACTIVITY_MAX_RECORDS,
+                 poll_interval=ACTIVITY_POLL_INTERVAL):
+        self.store = JsonlStore(path, max_records=max_records, durable=False)
+        # Deponun kullandığı kilit; aynı yol için yeniden girilebilir
+        self._log_lock = FileLock(path + ".lock")
+        self.size = size
+        self.poll_interval = poll_interval
+        self.recorded = 0
+        self._events = deque(maxlen=size)
+        self._offset = 0
+        self._file_id = None
+        self._last_id = 0
+        self._cond = threading.Condition()
+        self._bootstrap()
+
+    def _bootstrap(self):
+        # Son `size` kayıt ve okuma konumu kilit altında tek seferde alınır;
+        # arada eklenen kayıt kaybolmaz, ardından gelenler _sync ile alınır
+        with self._log_lock, self._cond:
+            self._file_id = self.store.file_id()
+            self._offset = self.store.size()
+            for event in self.store.tail(self.size):
+                self._push(event)
+
+    def _push(self, event):
+        # Halka kimliğe göre sıralı kalır: görülmüş son kimlikten büyük olmayanlar
+        # (sıkıştırma sonrası yeniden okunanlar) alınmaz
+        event_id = event.get("id")
+        if not isinstance(event_id, int) or event_id <= self._last_id:
+            return False
+        self._events.append(event)
+        self._last_id = event_id
+        return True
+
+    def _sync(self):
+        """Günlükte bu süreçten sonra eklenmiş kayıtları halkaya alır; yeni kayıt sayısını döndürür."""
+        # Değişiklik yoksa (aynı dosya, aynı boyut) süreçler arası kilit hiç alınmaz;
+        # bekleyen akış okuyucuları yazanları yavaşlatmaz
+        file_id, size = self.store.file_id(), self.store.size()
+        with self._cond:
+            if file_id == self._file_id and size == self._offset:
+                return 0
+        with self._log_lock, self._cond:
+            file_id = self.store.file_id()
+            if file_id != self._file_id or self.store.size() < self._offset:
+                # Sıkıştırıldı ya da yeniden oluşturuldu (inode yeniden kullanılmış
+                # olabilir; dosya küçüldüyse de): baştan oku
+                self._file_id, self._offset = file_id, 0
+            records, self._offset = self.store.read_from(self._offset)
+            added = sum(self._push(event) for event in records)
+            if added:
+                self._cond.notify_all()
+            return added
+
+    # --- Yazma ---
+    def record(self, kind, message, **details) -> dict:
+        """Etkinliği ortak günlüğe ekler ve halkaya alır."""
+        event = {
+            "timestamp": datetime.now().isoformat(),
+            "kind": kind,
+            "message": message,
+            "pid": os.getpid(),
+            **details
+        }
+        with self._log_lock:
+            # Kimlik, günlüğün son kaydının kimliğinin bir fazlasıdır
+            self._sync()
+            last = self.store.latest()
+            last_id = last.get("id") if last else None
+            if isinstance(last_id, int) and last_id > self.last_id():
+                # Halka geride: sıkıştırılan dosyanın kimliği (inode) yeniden
+                # kullanılmış, okuma konumu geçersiz; baştan oku
+                with self._cond:
+                    self._offset = 0
+                self._sync()
+            with self._cond:
+                event = {"id": max(self._last_id, last_id or 0) + 1, **event}
+            self.store.append(event)
+            self._sync()
+        with self._cond:
+            self.recorded += 1
+        return event
+
+    # --- Okuma ---
+    def recent(self, limit=20, before=None, kind=None) -> list:
+        """En yeniden eskiye en fazla `limit` etkinlik; `before` verilirse o kimlikten eskiler."""
+        self._sync()
+        with self._cond:
+            events = list(self._events)
+        result = []
+        for event in reversed(events):
+            if before is not None and event["id"] >= before:
+                continue
+            if kind is not None and event["kind"] != kind:
+                continue
+            result.append(event)
+            if len(result) >= limit:
+                break
+        return result
+
+    def wait(self, after, timeout=None) -> list:
+        """
+        `after` kimliğinden yeni etkinlikleri eskiden yeniye döndürür; yoksa
+        yenisi gelene (bu süreçte hemen, diğerlerinde en geç `poll_interval`
+        içinde) ya da `timeout` dolana kadar bekler.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._sync()
+            with self._cond:
+                events = [e for e in self._events if e["id"] > after]
+                if events:
+                    return events
+                remaining = self.poll_interval
+                if deadline is not None:
+                    remaining = min(remaining, deadline - time.monotonic())
+                    if remaining <= 0:
+                        return []
+                self._cond.wait(remaining)
+
+    def last_id(self) -> int:
+        with self._cond:
+            return self._last_id
+
+    def stats(self):
+        with self._cond:
+            return {"buffered": len(self._events), "capacity": self.size, "recorded": self.recorded,
+                    "log_bytes": self._offset}
+
+
+_feed = None
+_init_lock = threading.Lock()
+
+
+def get_activity_feed() -> ActivityFeed:
+    global _feed
+    with _init_lock:
+        if _feed is None:
+            _feed = ActivityFeed()
+    return _feed
+
+
+def record_activity(kind, message, **details):
+    """Etkinlik kaydeder; kayıt hatası çağıran işi (geri bildirim, üretim, taşıma) bozmaz."""
+    try:
+        return get_activity_feed().record(kind, message, **details)
+    except Exception as e:
+        print(f"⚠️  Etkinlik kaydedilemedi ({kind}): {e}")
+        return None
@@ -0,0 +1,31 @@
+# atomic_io.py
+import json
+import os
+import tempfile
+
+
+def atomic_write(path: str, data, encoding="utf-8"):
+    """
+    Dosyayı geçici dosya + yeniden adlandırma ile yazar; okuyucular hiçbir
+    zaman yarım yazılmış içerik görmez.
+    """
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, obj, indent=2):
+    """JSON nesnesini atomik olarak yazar."""
+    atomic_write(path, json.dumps(obj, indent=indent, ensure_ascii=False))
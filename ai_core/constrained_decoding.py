@@ -0,0 +1,361 @@
+# constrained_decoding.py
+import codecs
+import json
+import re
+import time
+
+from ai_core.design_model import DesignValidationError, validate_design
+from ai_core.prefix_cache import prefill
+
+# Tasarımın tamamı dilbilgisiyle yazılır: bu önek zorlanır, ardından
+# başlık, üst başlık, stil renkleri ve bileşenler örneklenir
+DESIGN_PREFIX = '{"title": "'
+# Tasarım düzeyindeki metin alanları (sırasıyla) ve stil renk alanları
+DESIGN_FIELDS = ["title", "header"]
+STYLE_FIELDS = ["background", "color"]
+# Renkler "#" + bu kadar onaltılık rakam
+HEX_COLOR_DIGITS = 6
+_HEX_COLOR = re.compile(r"^#[0-9a-fA-F]{%d}$" % HEX_COLOR_DIGITS)
+_HEX_DIGITS = set("0123456789abcdefABCDEF")
+
+# Bileşen şeması: her alan için (JSON anahtarı) listesi
+COMPONENT_SCHEMA = {
+    "card": ["title", "value"],
+    "button": ["label"],
+}
+MAX_COMPONENTS = 6
+MAX_STRING_TOKENS = 12
+# Yarım kalmış çok baytlı UTF-8 karakterini tamamlamak için sınırın üstüne izin verilen token
+MAX_CHAR_COMPLETION_TOKENS = 3
+# Bozuk bayt dizisi oluşturan aday token reddedilip en fazla bu kadar yeniden örneklenir
+MAX_RESAMPLES = 64
+# Bayt düzeyindeki token'ların tek başına ya da yarım karakterle çözümü
+_REPLACEMENT = "\ufffd"
+
+# Tokenizer başına önceden hesaplanmış vocab maskeleri
+_mask_cache = {}
+
+
+class DecodingStats:
+    """Geçerli JSON oranı ve geçerli tasarım başına üretilen token sayısı."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.valid = 0
+        self.sampled_tokens = 0
+        self.forced_tokens = 0
+        self.elapsed = 0.0
+
+    def record(self, valid, sampled, forced, elapsed):
+        self.attempts += 1
+        self.valid += int(valid)
+        self.sampled_tokens += sampled
+        self.forced_tokens += forced
+        self.elapsed += elapsed
+
+    def as_dict(self):
+        return {
+            "attempts": self.attempts,
+            "valid": self.valid,
+            "valid_rate": round(self.valid / self.attempts, 3) if self.attempts else None,
+            "tokens_per_valid_design": round((self.sampled_tokens + self.forced_tokens) / self.valid, 1) if self.valid else None,
+            "sampled_tokens_per_valid_design": round(self.sampled_tokens / self.valid, 1) if self.valid else None,
+            "seconds_per_valid_design": round(self.elapsed / self.valid, 4) if self.valid else None
+        }
+
+
+def _string_masks(tokenizer, torch):
+    """
+    (gövde, kapanış) maskelerini döndürür.
+    gövde  : JSON metni içinde kaçış gerektirmeyen token'lar (çok baytlı
+             karakterin parçası olan bayt token'ları dahil)
+    kapanış: güvenli metin + sonda tek bir '"' içeren, tam karakterlerden
+             oluşan token'lar
+    """
+    key = (getattr(tokenizer, "name_or_path", None), len(tokenizer))
+    if key in _mask_cache:
+        return _mask_cache[key]
+
+    def safe(text):
+        return all(ch not in '"\\' and ord(ch) >= 0x20 for ch in text)
+
+    size = len(tokenizer)
+    body = torch.zeros(size, dtype=torch.bool)
+    closing = torch.zeros(size, dtype=torch.bool)
+    special = set(tokenizer.all_special_ids)
+    for token_id in range(size):
+        if token_id in special:
+            continue
+        text = tokenizer.decode([token_id])
+        if text and safe(text):
+            body[token_id] = True
+        elif text.endswith('"') and safe(text[:-1]) and _REPLACEMENT not in text:
+            closing[token_id] = True
+    _mask_cache[key] = (body, closing, _token_bytes(tokenizer, special))
+    return _mask_cache[key]
+
+
+def _hex_masks(tokenizer, torch):
+    """
+    Uzunluk sınırına göre onaltılık rakam maskeleri ({k: en fazla k rakamlı
+    token'lar}) ve token -> metin eşlemesi.
+    """
+    key = ("hex", getattr(tokenizer, "name_or_path", None), len(tokenizer))
+    if key in _mask_cache:
+        return _mask_cache[key]
+    size = len(tokenizer)
+    special = set(tokenizer.all_special_ids)
+    texts = {}
+    for token_id in range(size):
+        if token_id in special:
+            continue
+        text = tokenizer.decode([token_id])
+        if text and len(text) <= HEX_COLOR_DIGITS and set(text) <= _HEX_DIGITS:
+            texts[token_id] = text
+    masks = {}
+    for limit in range(1, HEX_COLOR_DIGITS + 1):
+        mask = torch.zeros(size, dtype=torch.bool)
+        mask[[i for i, text in texts.items() if len(text) <= limit]] = True
+        masks[limit] = mask
+    _mask_cache[key] = (masks, texts)
+    return _mask_cache[key]
+
+
+def _token_bytes(tokenizer, special):
+    """
+    Bayt düzeyli BPE (GPT-2) token'larının ham baytları; çok baytlı bir
+    karakterin hangi parçası olduklarını metinden ayırt etmek mümkün değildir.
+    Tokenizer bayt düzeyli değilse None.
+    """
+    try:
+        from transformers.models.gpt2.tokenization_gpt2 import bytes_to_unicode
+    except ImportError:
+        return None
+    byte_decoder = {ch: b for b, ch in bytes_to_unicode().items()}
+    result = []
+    for token_id, token in enumerate(tokenizer.convert_ids_to_tokens(list(range(len(tokenizer))))):
+        if token_id in special:
+            result.append(None)
+        elif token is None or any(ch not in byte_decoder for ch in token):
+            return None
+        else:
+            result.append(bytes(byte_decoder[ch] for ch in token))
+    return result
+
+
+def is_valid_design(design, text) -> bool:
+    """
+    Üretilen tasarım kullanılabilir mi: metin geri ayrıştırıldığında aynı
+    tasarımı verir, tasarım şeması (ai_core.design_model) doğrulanır; başlık,
+    üst başlık ve her bileşenin COMPONENT_SCHEMA alanları boş olmayan, bozuk
+    karakter (U+FFFD) içermeyen metinlerdir ve stil renkleri #rrggbb biçimindedir.
+    """
+    try:
+        if json.loads(text) != design:
+            return False
+        validate_design(design)
+    except (json.JSONDecodeError, DesignValidationError):
+        return False
+    if not all(_is_text(design.get(field)) for field in DESIGN_FIELDS):
+        return False
+    style = design.get("style")
+    if not isinstance(style, dict) or set(style) != set(STYLE_FIELDS):
+        return False
+    if not all(isinstance(style[field], str) and _HEX_COLOR.match(style[field]) for field in STYLE_FIELDS):
+        return False
+    for component in design.get("components", []):
+        fields = COMPONENT_SCHEMA.get(component.get("type"))
+        if fields is None or set(component) != {"type", *fields}:
+            return False
+        if not all(_is_text(component[field]) for field in fields):
+            return False
+    return True
+
+
+def _is_text(value):
+    return isinstance(value, str) and bool(value.strip()) and _REPLACEMENT not in value
+
+
+class ConstrainedDesignDecoder:
+    """
+    GPT-2 çıktısını tasarım JSON şemasına kısıtlayan, dilbilgisi güdümlü örnekleyici.
+
+    Tasarımın tamamı (title, header, style, components) dilbilgisiyle yazılır:
+    JSON iskeleti (parantezler, anahtarlar, virgüller) örnekleyici tarafından
+    yazılır; model başlık ve bileşen metinlerini, stil renklerinin onaltılık
+    rakamlarını, bileşen türünü ve devam/kapat kararını seçer. Metin
+    token'ları tırnak/kaçış içermeyenlerle sınırlandırılır ve `components`
+    dizisi kapanınca üretim durur. Sonuç her zaman geçerli JSON'dur.
+    """
+
+    def __init__(self, model, tokenizer, device="cpu", stats=None, prefix_cache=None):
+        import torch
+
+        self.torch = torch
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.stats = stats or DecodingStats()
+        self.prefix_cache = prefix_cache
+        self.body_mask, self.closing_mask, self.token_bytes = _string_masks(tokenizer, torch)
+        self.allowed_mask = (self.body_mask | self.closing_mask).to(device)
+        self.body_mask_device = self.body_mask.to(device)
+        self.closing_mask = self.closing_mask.to(device)
+        hex_masks, self.hex_texts = _hex_masks(tokenizer, torch)
+        self.hex_masks = {limit: mask.to(device) for limit, mask in hex_masks.items()}
+
+    # --- Model adımları ---
+    def _feed(self, token_ids):
+        """Token'ları KV önbelleğiyle modele verir, son konumun logit'lerini saklar."""
+        if not token_ids:
+            return
+        input_ids = self.torch.tensor([token_ids], device=self.device)
+        with self.torch.no_grad():
+            output = self.model(input_ids=input_ids, past_key_values=self._past, use_cache=True)
+        self._past = output.past_key_values
+        self._logits = output.logits[0, -1]
+
+    def _force(self, text):
+        ids = self.tokenizer.encode(text)
+        self._feed(ids)
+        self._forced += len(ids)
+
+    def _sample(self, logits, temperature):
+        if temperature and temperature > 0:
+            probs = self.torch.softmax(logits / temperature, dim=-1)
+            return int(self.torch.multinomial(probs, 1))
+        return int(self.torch.argmax(logits))
+
+    def _choose(self, options, temperature):
+        """Seçeneklerin ilk token'larının logit'lerine göre birini seçer ve yazar."""
+        first_ids = [self.tokenizer.encode(option)[0] for option in options]
+        index = self._sample(self._logits[first_ids], temperature)
+        self._force(options[index])
+        return index
+
+    def _extends_text(self, utf8, ids, candidate):
+        """Aday token metinde bozuk bayt dizisi bırakmıyor mu (sondaki yarım karakter hariç)?"""
+        if self.token_bytes is None:
+            return _REPLACEMENT not in self.tokenizer.decode(ids + [candidate])[:-1]
+        state = utf8.getstate()
+        try:
+            utf8.decode(self.token_bytes[candidate])
+        except UnicodeDecodeError:
+            return False
+        finally:
+            utf8.setstate(state)
+        return True
+
+    def _string(self, temperature, max_tokens):
+        """
+        Kapanış tırnağına kadar boş olmayan bir metin değeri örnekler (tırnak
+        dahil). Metin yalnızca sonunda yarım (tamamlanmayı bekleyen) bir UTF-8 karakteri
+        taşıyabilir: ortada bozuk bayt dizisi bırakacak aday token reddedilip
+        yeniden örneklenir, karakter yarımken kapanışa izin verilmez ve sınıra
+        ulaşıldığında karakterin tamamlanması için birkaç token daha beklenir.
+        """
+        ids = []
+        incomplete = False
+        # Bayt düzeyli tokenizer'da artımlı (katı) UTF-8 çözücü durumu
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        for step in range(max_tokens + MAX_CHAR_COMPLETION_TOKENS):
+            if step >= max_tokens and not incomplete:
+                break
+            # Boş metin ve yarım karakterle kapanış yok: o durumlarda yalnızca gövde token'ları
+            can_close = bool(ids) and not incomplete
+            mask = self.allowed_mask if can_close else self.body_mask_device
+            logits = self._logits.masked_fill(~mask, float("-inf"))
+            token_id = None
+            for _ in range(MAX_RESAMPLES):
+                candidate = self._sample(logits, temperature)
+                closing = can_close and bool(self.closing_mask[candidate])
+                if closing or self._extends_text(utf8, ids, candidate):
+                    token_id = candidate
+                    break
+                logits[candidate] = float("-inf")
+            if token_id is None:
+                break
+            self._feed([token_id])
+            self._sampled += 1
+            if closing:
+                text = self.tokenizer.decode(ids + [token_id])
+                return text[:-1] if text.endswith('"') else text
+            ids.append(token_id)
+            if self.token_bytes is not None:
+                utf8.decode(self.token_bytes[token_id])
+                incomplete = bool(utf8.getstate()[0])
+            else:
+                incomplete = self.tokenizer.decode(ids).endswith(_REPLACEMENT)
+        # Sınıra ulaşıldı: tırnağı biz kapatırız; tamamlanamamış son karakter atılır
+        self._force('"')
+        return self.tokenizer.decode(ids).rstrip(_REPLACEMENT)
+
+    def _hex(self, temperature, digits=HEX_COLOR_DIGITS):
+        """Tam `digits` onaltılık rakam örnekler (kalan uzunluğu aşan token'lar maskelenir)."""
+        text = ""
+        while len(text) < digits:
+            logits = self._logits.masked_fill(~self.hex_masks[digits - len(text)], float("-inf"))
+            token_id = self._sample(logits, temperature)
+            self._feed([token_id])
+            self._sampled += 1
+            text += self.hex_texts[token_id]
+        return text
+
+    @property
+    def generated_tokens(self):
+        """Son üretimde modele verilen (örneklenen + yazılan) token sayısı."""
+        return self._sampled + self._forced
+
+    # --- Üretim ---
+    def generate(self, prompt="", temperature=0.8, max_components=MAX_COMPONENTS, max_string_tokens=MAX_STRING_TOKENS):
+        """
+        Tasarım sözlüğünü baştan sona dilbilgisiyle üretir. `prompt` verilirse
+        JSON'dan önce modele bağlam olarak verilir (çıktıya girmez).
+        (tasarım, json_metni) döndürür.
+        """
+        started = time.perf_counter()
+        self._past = None
+        self._logits = None
+        self._sampled = 0
+        self._forced = 0
+
+        # Bağlam + JSON açılışı önbellekteki KV durumundan devam eder (yoksa baştan işlenir)
+        opening = self.tokenizer.encode(prompt + DESIGN_PREFIX)
+        self._past, self._logits = prefill(self.model, opening, self.prefix_cache, self.device)
+        self._forced += len(self.tokenizer.encode(DESIGN_PREFIX))
+
+        base = {}
+        for i, field in enumerate(DESIGN_FIELDS):
+            if i:
+                self._force(f', "{field}": "')
+            base[field] = self._string(temperature, max_string_tokens)
+        style = {}
+        for i, field in enumerate(STYLE_FIELDS):
+            self._force(f', "{field}": "#' if i else f', "style": {{"{field}": "#')
+            style[field] = "#" + self._hex(temperature)
+            self._force('"')
+        base["style"] = style
+        self._force('}, "components": [')
+
+        components = []
+        types = list(COMPONENT_SCHEMA)
+        while True:
+            self._force('{"type": "')
+            component_type = types[self._choose([f'{t}"' for t in types], temperature)]
+            component = {"type": component_type}
+            for field in COMPONENT_SCHEMA[component_type]:
+                self._force(f', "{field}": "')
+                component[field] = self._string(temperature, max_string_tokens)
+            self._force("}")
+            components.append(component)
+
+            if len(components) >= max_components:
+                break
+            if self._choose([", ", "]}"], temperature) == 1:
+                break
+
+        base["components"] = components
+        text = json.dumps(base, ensure_ascii=False)
+        valid = is_valid_design(base, text)
+        self.stats.record(valid, self._sampled, self._forced, time.perf_counter() - started)
+        return base, text
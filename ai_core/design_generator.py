@@ -1,56 +1,157 @@
 import os
 import json
 import random
-from transformers import pipeline
+import argparse
+
+from ai_core.constrained_decoding import DESIGN_PREFIX, is_valid_design
+from ai_core.model_server import GenerationClient, get_server
 
 MODEL_PATH = "gpt2-soru-model/final_model"
 OUTPUT_FILE = "data/design.json"
+# Tanımlıysa model ayrı bir süreçte çalışan yerel sunucudan kullanılır (ör. 6060)
+MODEL_SERVER_PORT = os.environ.get("MODEL_SERVER_PORT")
+
+PROMPTS = [
+    '{"title": "Uzay Keşfi Paneli", "header": "Galaksi Raporları", "style": {"background": "#0a192f", "color": "#ccd6f6"}, "components": [',
+    '{"title": "Doğa Yürüyüşü Uygulaması", "header": "Patika Notları", "style": {"background": "#f0fff0", "color": "#2e8b57"}, "components": [',
+    '{"title": "Müzik Festivali Sayfası", "header": "Sahne Programı", "style": {"background": "#121212", "color": "#1DB954"}, "components": [',
+]
+
+# Üretim modu başına deneme / geçerli tasarım (is_valid_design) / üretilen token sayıları
+GENERATION_STATS = {
+    "free": {"attempts": 0, "valid": 0, "tokens": 0},
+    "constrained": {"attempts": 0, "valid": 0, "tokens": 0},
+}
+
+ERROR_DESIGN = { "title": "Hata", "header": "Tasarım Üretilemedi", "components": [{"type": "card", "title": "Hata", "value": "Model geçerli bir JSON üretemedi."}] }
+
+
+_client = None
+
+
+def get_generator():
+    """Sıcak model sunucusunu (ya da yerel soket istemcisini) döndürür."""
+    global _client
+    if MODEL_SERVER_PORT:
+        if _client is None:
+            _client = GenerationClient(port=int(MODEL_SERVER_PORT))
+        return _client
+    server = get_server(MODEL_PATH)
+    # Sabit prompt iskeletlerinin ve kısıtlı çözümleme açılışının KV durumu bir kez hesaplanır
+    server.warm_prefixes(PROMPTS + [DESIGN_PREFIX])
+    return server
+
+
+def parse_generated_design(prompt, generated_text):
+    """Üretilen metni geçerli bir JSON'a dönüştürmeye çalışır; olmazsa None."""
+    # En basit yöntem, açılan son '[''den sonrasını alıp kapatmaktır.
+    try:
+        start_index = generated_text.rfind('[')
+        json_body = generated_text[start_index:]
+        # Açık kalan parantezleri kapatmaya çalış
+        if json_body.count('[') > json_body.count(']'): json_body += ']'
+        if json_body.count('{') > json_body.count('}'): json_body += '}'
+        # Başlangıç prompt'unu alıp sonuna ekle
+        final_json_str = prompt + json_body.strip("[]") + ']}'
+        return json.loads(final_json_str)
+    except (json.JSONDecodeError, IndexError):
+        return None
+
 
-def generate_random_design():
+def generate_free(generator, max_new_tokens=200, temperature=1.0):
+    """Serbest metin üretip parantez onarımıyla JSON'a çevirmeye çalışır (eski yöntem)."""
+    # Tüm prompt'lar tek batch'te üretilir, geçerli olanlardan biri rastgele seçilir
+    prompts = list(PROMPTS)
+    random.shuffle(prompts)
+    # Token sayıları üreticiden gelir (soket istemcisinde tokenizer yoktur)
+    generated_texts, token_counts = generator.generate(
+        prompts, max_new_tokens=max_new_tokens, temperature=temperature, with_tokens=True
+    )
+
+    stats = GENERATION_STATS["free"]
+    design_data = None
+    for prompt, generated_text, tokens in zip(prompts, generated_texts, token_counts):
+        print(f"\nSeçilen Prompt: {prompt[:50]}...")
+        print("Üretilen Ham Metin:", generated_text)
+        stats["attempts"] += 1
+        stats["tokens"] += tokens
+        parsed = parse_generated_design(prompt, generated_text)
+        if parsed is not None:
+            stats["valid"] += int(is_valid_design(parsed, json.dumps(parsed, ensure_ascii=False)))
+            if design_data is None:
+                design_data = parsed
+    return design_data
+
+
+def generate_constrained(generator, temperature=0.8):
+    """
+    Şemaya kısıtlı çözümleme: başlık, üst başlık, stil ve bileşenlerin tamamı
+    dilbilgisiyle üretilir (PROMPTS yalnızca serbest modda kullanılır); çıktı
+    her zaman geçerli JSON'dur ve dizi kapanınca durur.
+    """
+    design_data, text, tokens = generator.generate_design(temperature=temperature, with_tokens=True)
+    print("Üretilen JSON:", text)
+
+    stats = GENERATION_STATS["constrained"]
+    stats["attempts"] += 1
+    stats["valid"] += int(is_valid_design(design_data, text))
+    stats["tokens"] += tokens
+    return design_data
+
+
+def get_generation_stats():
+    """
+    Mod başına geçerli tasarım oranı ve geçerli tasarım başına token sayısı.
+    Her iki modda da tasarım aynı ölçütle (is_valid_design) sayılır.
+    """
+    return {
+        mode: {
+            **s,
+            "valid_rate": round(s["valid"] / s["attempts"], 3) if s["attempts"] else None,
+            "tokens_per_valid_design": round(s["tokens"] / s["valid"], 1) if s["valid"] else None
+        }
+        for mode, s in GENERATION_STATS.items()
+    }
+
+
+def generate_random_design(mode="constrained", max_new_tokens=200, temperature=1.0):
     print("--- 🤖 Yapay Zeka Tasarımcı Başlatılıyor ---")
     try:
-        generator = pipeline('text-generation', model=MODEL_PATH)
-        print("✅ Model başarıyla yüklendi.")
+        generator = get_generator()
     except Exception as e:
         print(f"❌ HATA: Model yüklenirken bir sorun oluştu: {e}")
         return
 
-    prompts = [
-        '{"title": "Uzay Keşfi Paneli", "header": "Galaksi Raporları", "style": {"background": "#0a192f", "color": "#ccd6f6"}, "components": [',
-        '{"title": "Doğa Yürüyüşü Uygulaması", "header": "Patika Notları", "style": {"background": "#f0fff0", "color": "#2e8b57"}, "components": [',
-        '{"title": "Müzik Festivali Sayfası", "header": "Sahne Programı", "style": {"background": "#121212", "color": "#1DB954"}, "components": [',
-    ]
-    selected_prompt = random.choice(prompts)
-    print(f"Seçilen Prompt: {selected_prompt[:50]}...")
-
     try:
-        generated_text = generator(selected_prompt, max_new_tokens=200)[0]['generated_text']
-        print("\nÜretilen Ham Metin:", generated_text)
-        
-        # Üretilen metni geçerli bir JSON'a dönüştürmeye çalış
-        # En basit yöntem, açılan son '[''den sonrasını alıp kapatmaktır.
-        try:
-            start_index = generated_text.rfind('[')
-            json_body = generated_text[start_index:]
-            # Açık kalan parantezleri kapatmaya çalış
-            if json_body.count('[') > json_body.count(']'): json_body += ']'
-            if json_body.count('{') > json_body.count('}'): json_body += '}'
-            # Başlangıç prompt'unu alıp sonuna ekle
-            final_json_str = selected_prompt + json_body.strip("[]") + ']}'
-            design_data = json.loads(final_json_str)
+        if mode == "constrained":
+            design_data = generate_constrained(generator, temperature=temperature)
+        else:
+            design_data = generate_free(generator, max_new_tokens=max_new_tokens, temperature=temperature)
+
+        if design_data is not None:
             print("\n✅ Geçerli bir JSON tasarımı üretildi!")
-        except (json.JSONDecodeError, IndexError):
+        else:
             print("❌ UYARI: AI geçerli bir JSON üretemedi. Varsayılan tasarım kullanılıyor.")
-            design_data = { "title": "Hata", "header": "Tasarım Üretilemedi", "components": [{"type": "card", "title": "Hata", "value": "Model geçerli bir JSON üretemedi."}] }
+            design_data = ERROR_DESIGN
 
         os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
         with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
             json.dump(design_data, f, ensure_ascii=False, indent=4)
-            
+
         print(f"🎯 Yeni tasarım '{OUTPUT_FILE}' dosyasına kaydedildi.")
+        print(f"📈 Üretim istatistikleri: {get_generation_stats()[mode]}")
 
     except Exception as e:
         print(f"❌ HATA: Tasarım üretimi sırasında bir sorun oluştu: {e}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Yerel GPT-2 modeliyle tasarım JSON'u üretir.")
+    parser.add_argument("--mode", choices=["constrained", "free"], default="constrained",
+                        help="constrained: şemaya kısıtlı çözümleme, free: serbest metin + onarım")
+    parser.add_argument("--temperature", type=float, default=1.0)
+    parser.add_argument("--max-new-tokens", type=int, default=200, help="Yalnızca free modunda")
+    args = parser.parse_args()
+    generate_random_design(mode=args.mode, max_new_tokens=args.max_new_tokens, temperature=args.temperature)
+
 if __name__ == "__main__":
-    generate_random_design()
\ No newline at end of file
+    main()
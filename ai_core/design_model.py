@@ -0,0 +1,136 @@
+# design_model.py
+import json
+import os
+import threading
+from collections import namedtuple
+from typing import List, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, StrictFloat, StrictInt, StrictStr, ValidationError
+
+from ai_core.lru_cache import LRUCache
+
+# Bellekte tutulacak en fazla ayrıştırılmış tasarım dosyası (yol başına son sürüm)
+DESIGN_LOADER_CACHE_SIZE = 32
+
+# Metin alanlarında sayılar da kabul edilir (AI tasarımlarında "value": 42 gibi)
+Text = Union[StrictStr, StrictInt, StrictFloat]
+_UNION_MEMBERS = {"str", "int", "float"}
+
+
+class DesignCard(BaseModel):
+    model_config = ConfigDict(extra="allow", validate_assignment=True)
+
+    title: Optional[Text] = None
+    content: Optional[Text] = None
+
+
+class DesignButton(BaseModel):
+    model_config = ConfigDict(extra="allow", validate_assignment=True)
+
+    text: Optional[Text] = None
+    action: Optional[StrictStr] = None
+
+
+class Design(BaseModel):
+    """
+    Arayüz tasarımı. Şablonların kullandığı alanlar doğrulanır; bilinmeyen
+    alanlar (widgets, components, ...) olduğu gibi korunur. `to_dict()`
+    yalnızca dosyada bulunan/atanan alanları döndürür, böylece doğrulama
+    tasarım özetini değiştirmez.
+    """
+    model_config = ConfigDict(extra="allow", validate_assignment=True)
+
+    title: Optional[StrictStr] = None
+    header: Optional[StrictStr] = None
+    description: Optional[StrictStr] = None
+    background: Optional[StrictStr] = None
+    color: Optional[StrictStr] = None
+    layout: Optional[StrictStr] = None
+    cards: List[DesignCard] = []
+    buttons: List[DesignButton] = []
+
+    def to_dict(self) -> dict:
+        return self.model_dump(mode="json", exclude_unset=True)
+
+
+class DesignValidationError(ValueError):
+    """Tasarım dosyası okunamadı ya da şemaya uymuyor."""
+
+    def __init__(self, path, message):
+        super().__init__(f"Geçersiz tasarım ({path}): {message}")
+        self.path = path
+
+
+def validate_design(data, path="<bellek>") -> Design:
+    """Sözlüğü doğrular ve `Design` döndürür; geçersizse DesignValidationError."""
+    if not isinstance(data, dict):
+        raise DesignValidationError(path, "kök nesne bir JSON nesnesi değil")
+    try:
+        return Design.model_validate(data)
+    except ValidationError as e:
+        # Birleşik (Text) alanlarda her seçenek ayrı hata verir; alan başına ilki yeterli
+        problems = {}
+        for err in e.errors():
+            loc = ".".join(str(p) for p in err["loc"] if p not in _UNION_MEMBERS)
+            problems.setdefault(loc, err["msg"])
+        message = "; ".join(f"{loc}: {msg}" for loc, msg in list(problems.items())[:5])
+        raise DesignValidationError(path, message) from None
+
+
+# model: paylaşılan Design (değiştirilmemeli, düzenlemek için model_copy(deep=True))
+# data : şablonlara verilen sözlük (salt okunur kullanılır)
+LoadedDesign = namedtuple("LoadedDesign", ["path", "model", "data", "version"])
+
+
+class DesignLoader:
+    """
+    Tasarım dosyalarını bir kez ayrıştırıp doğrulayan ortak yükleyici.
+
+    Sonuç (yol, mtime, boyut) anahtarıyla önbellekte tutulur; dosya değişmedikçe
+    aynı `LoadedDesign` nesnesi arayüz üreticisi, sayfa önbelleği ve agent
+    arasında paylaşılır. Geçersiz dosyalar önbelleğe alınmaz, her seferinde
+    DesignValidationError ile reddedilir.
+    """
+
+    def __init__(self, max_entries=DESIGN_LOADER_CACHE_SIZE):
+        self._cache = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.parses = 0
+
+    def load(self, path) -> LoadedDesign:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        version = (st.st_mtime_ns, st.st_size)
+        loaded = self._cache.get(path)
+        if loaded is not None and loaded.version == version:
+            return loaded
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise DesignValidationError(path, f"JSON ayrıştırılamadı ({e})") from None
+        model = validate_design(data, path)
+        loaded = LoadedDesign(path, model, model.to_dict(), version)
+        with self._lock:
+            self.parses += 1
+        self._cache.put(path, loaded)
+        return loaded
+
+    def invalidate(self):
+        self._cache.clear()
+
+    def stats(self):
+        return {**self._cache.stats(), "parses": self.parses}
+
+
+_loader = DesignLoader()
+
+
+def get_design_loader() -> DesignLoader:
+    return _loader
+
+
+def load_design(path) -> LoadedDesign:
+    """Paylaşılan yükleyiciyle tasarımı yükler (önbellekli, doğrulanmış)."""
+    return _loader.load(path)
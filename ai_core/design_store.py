@@ -0,0 +1,326 @@
+# design_store.py
+import argparse
+import bisect
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+from datetime import datetime
+
+from ai_core.atomic_io import atomic_write, atomic_write_json
+from ai_core.file_lock import FileLock
+from ai_core.jsonl_store import JsonlStore
+from ai_core.lru_cache import LRUCache
+from ai_core.tenant import get_tenant
+
+DESIGN_STORE_DIR = "data/designs"
+# Paketlenmiş segment dosyası bu boyutu geçince yenisine geçilir (bayt)
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+# Çözülmüş tasarım baytları için bellek içi önbellek
+DESIGN_CACHE_ENTRIES = 256
+# Eski format: data/ altında her üretimde ayrı, girintili JSON dosyası
+LEGACY_DATA_DIR = "data"
+LEGACY_PATTERN = "tasarim-*.json"
+LATEST_POINTER = "data/latest.txt"
+
+# Eski dosya adındaki numara; yalnızca aktarım sırası için (depo id'si değildir)
+_LEGACY_NUMBER = re.compile(r"(\d+)")
+
+
+def canonical_bytes(design: dict) -> bytes:
+    return json.dumps(design, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def content_digest(design: dict) -> str:
+    return hashlib.sha256(canonical_bytes(design)).hexdigest()
+
+
+class DesignStore:
+    """
+    Tasarım geçmişi deposu.
+
+    - İçerik adresli: aynı tasarım (normalize JSON'un sha256'sı) bir kez saklanır,
+      tekrar kayıtları yalnızca yeni bir dizin satırı ekler.
+    - Tasarımlar zlib ile sıkıştırılıp sona eklenen segment dosyalarında
+      (`segment-00001.pack`) paketlenir.
+    - `index.jsonl` her kayıt için (id, özet, segment, konum, başlık, zaman)
+      tutar; id sayacı ve "son tasarım" bu dizinden türetilir ve tüm yazmalar
+      tek bir dosya kilidi altında yapıldığı için süreçler arasında tekildir.
+    - `latest.json` son tasarımın açık kopyasıdır; `data/latest.txt` ona işaret
+      eder, böylece mevcut okuyucular (get_latest_design_file) değişmeden çalışır.
+    """
+
+    def __init__(self, root=DESIGN_STORE_DIR, segment_max_bytes=SEGMENT_MAX_BYTES, latest_pointer=LATEST_POINTER):
+        self.root = root
+        self.segment_max_bytes = segment_max_bytes
+        self.latest_pointer = latest_pointer
+        self.latest_path = os.path.join(root, "latest.json")
+        os.makedirs(root, exist_ok=True)
+        self.index = JsonlStore(os.path.join(root, "index.jsonl"))
+        self._lock = FileLock(os.path.join(root, "store.lock"))
+        self._mutex = threading.RLock()
+        self._cache = LRUCache(max_entries=DESIGN_CACHE_ENTRIES)
+        self._records = []       # id sırasına göre dizin kayıtları
+        self._by_id = {}
+        self._by_hash = {}
+        self._by_title = {}
+        self._by_name = {}
+        self._timestamps = []
+        # Dizin zamana göre sıralı mı (eski dosyalar dolu bir depoya aktarılınca bozulur)
+        self._time_sorted = True
+        self._offset = 0
+        self._file_id = None
+        self.deduplicated = 0
+
+    # --- Dizin ---
+    def refresh(self):
+        """Dizine (başka süreçler dahil) eklenen yeni kayıtları belleğe alır."""
+        with self._mutex:
+            file_id = self.index.file_id()
+            if file_id != self._file_id:
+                self._file_id = file_id
+                self._offset = 0
+                self._records, self._by_id, self._by_hash, self._by_title, self._by_name = [], {}, {}, {}, {}
+                self._timestamps = []
+                self._time_sorted = True
+            records, self._offset = self.index.read_from(self._offset)
+            for record in records:
+                self._index_record(record)
+            return len(records)
+
+    def _index_record(self, record):
+        if self._timestamps and record["timestamp"] < self._timestamps[-1]:
+            self._time_sorted = False
+        self._records.append(record)
+        self._timestamps.append(record["timestamp"])
+        self._by_id[record["id"]] = record
+        self._by_hash.setdefault(record["hash"], record)
+        if record.get("title"):
+            self._by_title.setdefault(record["title"], []).append(record["id"])
+        if record.get("name"):
+            self._by_name[record["name"]] = record["id"]
+
+    def __len__(self):
+        self.refresh()
+        return len(self._records)
+
+    # --- Yazma ---
+    def _segment_path(self, number):
+        return os.path.join(self.root, f"segment-{number:05d}.pack")
+
+    def _write_blob(self, blob):
+        """Sıkıştırılmış tasarımı son segmente ekler; (segment, konum) döndürür."""
+        number = self._records[-1]["segment"] if self._records else 1
+        path = self._segment_path(number)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size and size + len(blob) > self.segment_max_bytes:
+            number += 1
+            path, size = self._segment_path(number), 0
+        with open(path, "ab") as f:
+            offset = f.tell()
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        return number, offset
+
+    def put(self, design: dict, source=None, name=None, timestamp=None) -> dict:
+        """
+        Tasarımı kaydeder ve dizin kaydını döndürür ({"id", "hash", ...}).
+        İçerik daha önce saklandıysa segmentlere yeni veri yazılmaz.
+        """
+        raw = canonical_bytes(design)
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._mutex, self._lock:
+            self.refresh()
+            existing = self._by_hash.get(digest)
+            if existing:
+                segment, offset, length = existing["segment"], existing["offset"], existing["length"]
+                self.deduplicated += 1
+            else:
+                blob = zlib.compress(raw, 6)
+                segment, offset = self._write_blob(blob)
+                length = len(blob)
+            record = {
+                "id": (self._records[-1]["id"] + 1) if self._records else 1,
+                "hash": digest,
+                "segment": segment,
+                "offset": offset,
+                "length": length,
+                "size": len(raw),
+                "title": design.get("title"),
+                "source": source,
+                "name": name,
+                "timestamp": timestamp or datetime.now().isoformat(),
+                "duplicate_of": existing["id"] if existing else None
+            }
+            self.index.append(record)
+            self._offset = self.index.size()
+            self._index_record(record)
+            self._cache.put(digest, raw)
+            self._publish_latest(design)
+        return record
+
+    def _publish_latest(self, design):
+        """Son tasarımın açık kopyasını ve data/latest.txt işaretçisini günceller."""
+        atomic_write_json(self.latest_path, design)
+        if not self.latest_pointer:
+            return
+        # İşaretçinin içeriği sabittir; yalnızca farklıysa (ör. eski dosya adı) yazılır
+        target = os.path.relpath(self.latest_path, os.path.dirname(self.latest_pointer) or ".")
+        try:
+            with open(self.latest_pointer, "r", encoding="utf-8") as f:
+                if f.read().strip() == target:
+                    return
+        except FileNotFoundError:
+            pass
+        atomic_write(self.latest_pointer, target)
+
+    # --- Okuma ---
+    def record(self, design_id):
+        """
+        Dizin kaydı; id depo id'si ya da aktarılmış eski dosyanın adı
+        ('tasarim-5.json' veya 'tasarim-5') olabilir. Eski adlar yalnızca
+        aktarımda yazılan ad -> id eşlemesiyle çözülür; eşleşme yoksa None.
+        """
+        self.refresh()
+        if isinstance(design_id, str):
+            if design_id.isdigit():
+                design_id = int(design_id)
+            else:
+                name = design_id if design_id.endswith(".json") else design_id + ".json"
+                design_id = self._by_name.get(design_id, self._by_name.get(name))
+        return self._by_id.get(design_id)
+
+    def _load(self, record):
+        raw = self._cache.get(record["hash"])
+        if raw is None:
+            with open(self._segment_path(record["segment"]), "rb") as f:
+                f.seek(record["offset"])
+                raw = zlib.decompress(f.read(record["length"]))
+            self._cache.put(record["hash"], raw)
+        return json.loads(raw)
+
+    def get(self, design_id):
+        """Tasarımı döndürür (her çağrıda yeni bir sözlük); yoksa None."""
+        record = self.record(design_id)
+        return self._load(record) if record else None
+
+    def latest_record(self):
+        self.refresh()
+        return self._records[-1] if self._records else None
+
+    def latest(self):
+        """Son kaydedilen tasarım; depo boşsa None."""
+        record = self.latest_record()
+        return self._load(record) if record else None
+
+    def history(self, n=20):
+        """Son `n` dizin kaydı (yeniden eskiye)."""
+        self.refresh()
+        return list(reversed(self._records[-n:]))
+
+    def find(self, title=None, start=None, end=None):
+        """
+        Başlığa ve/veya ISO zaman aralığına göre dizin kayıtları (id sırasıyla).
+        Dizin zamana göre sıralıysa aralık ikili aramayla, değilse (ör. eski
+        dosyalar dolu bir depoya aktarıldıysa) doğrusal taramayla bulunur.
+        """
+        self.refresh()
+        if self._time_sorted:
+            lo = bisect.bisect_left(self._timestamps, start) if start else 0
+            hi = bisect.bisect_right(self._timestamps, end) if end else len(self._records)
+            records = self._records[lo:hi]
+        else:
+            records = [r for r in self._records
+                       if (not start or r["timestamp"] >= start) and (not end or r["timestamp"] <= end)]
+        if title is not None:
+            ids = set(self._by_title.get(title, ()))
+            records = [r for r in records if r["id"] in ids]
+        return records
+
+    def stats(self):
+        self.refresh()
+        segments = glob.glob(os.path.join(self.root, "segment-*.pack"))
+        return {
+            "designs": len(self._records),
+            "unique": len(self._by_hash),
+            "segments": len(segments),
+            "packed_bytes": sum(os.path.getsize(p) for p in segments),
+            "raw_bytes": sum(r["size"] for r in self._by_hash.values()),
+            "cache": self._cache.stats()
+        }
+
+    # --- Eski dosyalar ---
+    def migrate(self, data_dir=LEGACY_DATA_DIR, pattern=LEGACY_PATTERN, remove=False):
+        """
+        data/ altındaki tasarim-*.json dosyalarını önce mtime, eşitse numara
+        sırasıyla içe aktarır (zaman damgası mtime'dan alınır; boş depoda dizin
+        zamana göre sıralı kalır, dolu depoda `find()` doğrusal taramaya geçer). Dosya adı dizin kaydına
+        yazılır; `record()` eski adları bu eşlemeyle çözer. Daha önce aktarılan
+        dosya adları atlanır. Aktarılan sayıyı döndürür.
+        """
+        def order(path):
+            match = _LEGACY_NUMBER.search(os.path.basename(path))
+            return (os.path.getmtime(path), int(match.group(1)) if match else 0)
+
+        self.refresh()
+        imported = 0
+        for path in sorted(glob.glob(os.path.join(data_dir, pattern)), key=order):
+            name = os.path.basename(path)
+            if name not in self._by_name:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        design = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  Aktarılamadı: {path} ({e})")
+                    continue
+                timestamp = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+                self.put(design, source="migrated", name=name, timestamp=timestamp)
+                imported += 1
+            if remove:
+                os.remove(path)
+        return imported
+
+
+# Kiracı kimliği -> tasarım deposu
+_stores = {}
+_init_lock = threading.Lock()
+
+
+def get_design_store(tenant=None) -> DesignStore:
+    """Kiracının tasarım deposu; ilk açılışta eski tasarim-*.json dosyalarını içe aktarır."""
+    tenant = get_tenant(tenant)
+    with _init_lock:
+        store = _stores.get(tenant.tenant_id)
+        if store is None:
+            if tenant.is_default:
+                store = DesignStore()
+            else:
+                store = DesignStore(root=tenant.design_store_dir, latest_pointer=tenant.latest_pointer)
+            if not os.path.exists(store.index.path):
+                imported = store.migrate(data_dir=tenant.data_dir)
+                if imported:
+                    print(f"📥 {imported} eski tasarım '{store.root}' deposuna aktarıldı.")
+            _stores[tenant.tenant_id] = store
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tasarım geçmişi deposu.")
+    parser.add_argument("--migrate", action="store_true", help="data/tasarim-*.json dosyalarını içe aktar")
+    parser.add_argument("--remove", action="store_true", help="Aktarılan eski dosyaları sil")
+    parser.add_argument("--stats", action="store_true", help="Depo istatistiklerini yazdır")
+    args = parser.parse_args()
+
+    store = DesignStore()
+    if args.migrate:
+        print(f"📥 {store.migrate(remove=args.remove)} tasarım aktarıldı.")
+    if args.stats or not args.migrate:
+        print(json.dumps(store.stats(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# feedback_aggregator.py
+import json
+import os
+from collections import deque
+from datetime import datetime, timedelta
+
+from ai_core.atomic_io import atomic_write_json
+from ai_core.feedback_manager import get_feedback_store
+
+STATE_FILE = "data/feedback_state.json"
+
+# Kayan pencere: son N olay
+RECENT_WINDOW = 20
+# Karar vermek için pencerede bulunması gereken en az olay
+MIN_SAMPLES = 5
+# Bu orandan düşük onay oranı radikal değişiklik demektir
+LOW_APPROVAL = 0.4
+# Bu orandan düşük onay oranında yalnızca yerleşim değiştirilir
+MID_APPROVAL = 0.6
+# Art arda bu kadar olumsuz oy radikal değişikliği tetikler
+NEGATIVE_STREAK = 3
+
+
+def _minute_key(timestamp: str) -> str:
+    # "2025-07-27T22:11:07.752574" -> "2025-07-27T22:11"
+    return timestamp[:16]
+
+
+def _rate(approved, total):
+    return round(approved / total, 3) if total else None
+
+
+class FeedbackAggregator:
+    """
+    Geri bildirimleri artımlı olarak toplar.
+
+    Kaldığı bayt konumu (cursor) ve istatistikler `STATE_FILE` içinde saklanır;
+    her `update()` çağrısı yalnızca yeni eklenen kayıtları okur. Döngü yeniden
+    başlatıldığında geçmiş tekrar taranmaz.
+    """
+
+    def __init__(self, store=None, state_file=STATE_FILE, recent_window=RECENT_WINDOW):
+        self.store = store or get_feedback_store()
+        self.state_file = state_file
+        self.recent_window = recent_window
+        self._load()
+
+    # --- Durum ---
+    def _load(self):
+        state = {}
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                state = {}
+
+        cursor = state.get("cursor", {})
+        self.offset = cursor.get("offset", 0)
+        self.file_id = cursor.get("file_id")
+        self.last_timestamp = cursor.get("last_timestamp", "")
+        self.total = state.get("total", [0, 0])
+        self.recent = deque(state.get("recent", []), maxlen=self.recent_window)
+        self.minutes = state.get("minutes", {})
+        self.per_design = state.get("per_design", {})
+        self.streak = state.get("streak", {"approved": None, "length": 0})
+        self.last_event = state.get("last_event")
+
+    def _save(self):
+        atomic_write_json(self.state_file, {
+            "cursor": {
+                "offset": self.offset,
+                "file_id": self.file_id,
+                "last_timestamp": self.last_timestamp
+            },
+            "total": self.total,
+            "recent": list(self.recent),
+            "minutes": self.minutes,
+            "per_design": self.per_design,
+            "streak": self.streak,
+            "last_event": self.last_event
+        })
+
+    # --- Güncelleme ---
+    def update(self) -> int:
+        """Yeni kayıtları işler, durumu kaydeder ve işlenen kayıt sayısını döndürür."""
+        file_id = self.store.file_id()
+        resync = file_id != self.file_id or self.offset > self.store.size()
+        if resync:
+            # Dosya sıkıştırılmış/yeniden yazılmış: son görülen zamandan devam et
+            self.offset = self.store.offset_of(self.last_timestamp) if self.last_timestamp else 0
+            self.file_id = file_id
+
+        records, new_offset = self.store.read_from(self.offset)
+        new_events = 0
+        for record in records:
+            ts = record.get("timestamp", "")
+            if resync and ts <= self.last_timestamp:
+                continue
+            self._consume(record)
+            new_events += 1
+
+        self.offset = new_offset
+        self._prune_minutes()
+        self._save()
+        return new_events
+
+    def _consume(self, record):
+        approved = bool(record.get("approved"))
+        ts = record.get("timestamp", "")
+        vote = int(approved)
+
+        self.total = [self.total[0] + vote, self.total[1] + 1]
+        self.recent.append(vote)
+
+        bucket = self.minutes.setdefault(_minute_key(ts), [0, 0])
+        bucket[0] += vote
+        bucket[1] += 1
+
+        design = record.get("design") or "unknown"
+        per_design = self.per_design.setdefault(design, [0, 0])
+        per_design[0] += vote
+        per_design[1] += 1
+
+        if self.streak["approved"] == approved:
+            self.streak["length"] += 1
+        else:
+            self.streak = {"approved": approved, "length": 1}
+
+        self.last_timestamp = max(self.last_timestamp, ts)
+        self.last_event = record
+
+    def _prune_minutes(self):
+        # Bir günden eski dakika kovalarını at (en fazla 1440 kova tutulur)
+        cutoff = _minute_key((datetime.now() - timedelta(days=1)).isoformat())
+        for key in [k for k in self.minutes if k < cutoff]:
+            del self.minutes[key]
+
+    # --- Sorgular ---
+    def window_rate(self, delta: timedelta):
+        """Son `delta` süresindeki (onay oranı, olay sayısı)."""
+        cutoff = _minute_key((datetime.now() - delta).isoformat())
+        approved = total = 0
+        for key, (a, t) in self.minutes.items():
+            if key >= cutoff:
+                approved += a
+                total += t
+        return _rate(approved, total), total
+
+    def stats(self) -> dict:
+        hour_rate, hour_count = self.window_rate(timedelta(hours=1))
+        day_rate, day_count = self.window_rate(timedelta(days=1))
+        return {
+            "total": {"rate": _rate(*self.total), "count": self.total[1]},
+            "recent": {"rate": _rate(sum(self.recent), len(self.recent)), "count": len(self.recent)},
+            "hour": {"rate": hour_rate, "count": hour_count},
+            "day": {"rate": day_rate, "count": day_count},
+            "per_design": {name: _rate(a, t) for name, (a, t) in self.per_design.items()},
+            "streak": dict(self.streak),
+            "last_event": self.last_event
+        }
+
+    def decide(self) -> dict:
+        """Pencere istatistiklerine göre tasarım değişikliği kararını döndürür."""
+        if self.last_event is None:
+            return {}
+
+        recent_rate = _rate(sum(self.recent), len(self.recent))
+        hour_rate, hour_count = self.window_rate(timedelta(hours=1))
+        negative_streak = self.streak["approved"] is False and self.streak["length"] >= NEGATIVE_STREAK
+
+        if len(self.recent) < MIN_SAMPLES:
+            # Yeterli örnek yoksa eskisi gibi son oya bak
+            poor = not self.last_event.get("approved")
+            mediocre = False
+        else:
+            poor = negative_streak or recent_rate < LOW_APPROVAL or (
+                hour_count >= MIN_SAMPLES and hour_rate < LOW_APPROVAL
+            )
+            mediocre = recent_rate < MID_APPROVAL
+
+        if poor:
+            # Olumsuz eğilimde radikal değişiklik
+            return {
+                "force_new_palette": True,
+                "force_new_layout": True,
+                "more_cards": True
+            }
+        if mediocre:
+            return {"force_new_layout": True}
+        # Olumluysa küçük iyileştirme
+        return {"refresh_ui": True}
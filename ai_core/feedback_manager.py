@@ -1,38 +1,124 @@
 # feedback_manager.py
-import json
 import os
+import threading
 from datetime import datetime
 
+from ai_core.activity_log import ACTIVITY_FEEDBACK, record_activity
+from ai_core.jsonl_store import GroupCommitWriter, JsonlStore
+from ai_core.tenant import get_tenant, mark_pending
+
+# Eski format: tek bir JSON dizisi (her kayıtta tüm dosya yeniden yazılıyordu)
 FEEDBACK_FILE = "data/feedback_loop.json"
+# Yeni format: satır başına bir kayıt, sadece sona ekleme
+FEEDBACK_LOG = "data/feedback_loop.jsonl"
+# Sıkıştırmada dosyada tutulacak en fazla kayıt (fazlası arşive taşınır)
+FEEDBACK_MAX_RECORDS = 10000
+# Grup commit: ilk kayıttan sonra en fazla bu kadar beklenip toplu yazılır
+FEEDBACK_FLUSH_INTERVAL = 0.02
+
+# Kiracı kimliği -> geri bildirim deposu
+_stores = {}
+_writer = None
+_init_lock = threading.Lock()
+# Varsayılan kiracıya yeni geri bildirim yazıldığında çağrılacak süreç içi dinleyiciler
+_listeners = []
+# Her kiracı için çağrılacak dinleyiciler: callback(tenant, record)
+_tenant_listeners = []
+
+
+def get_feedback_store(tenant=None) -> JsonlStore:
+    """Kiracının geri bildirim deposunu döndürür; ilk çağrıda eski dosyayı içe aktarır."""
+    tenant = get_tenant(tenant)
+    with _init_lock:
+        store = _stores.get(tenant.tenant_id)
+        if store is None:
+            log_path = FEEDBACK_LOG if tenant.is_default else tenant.feedback_log
+            legacy_path = FEEDBACK_FILE if tenant.is_default else tenant.feedback_legacy_file
+            store = JsonlStore(log_path, max_records=FEEDBACK_MAX_RECORDS)
+            if not os.path.exists(log_path) and os.path.exists(legacy_path):
+                imported = store.import_json_array(legacy_path, if_missing=True)
+                if imported:
+                    print(f"📥 {imported} eski geri bildirim '{log_path}' dosyasına aktarıldı.")
+            _stores[tenant.tenant_id] = store
+    return store
+
 
-def save_feedback(feedback: dict):
-    """Kullanıcı geri bildirimi kaydeder."""
-    os.makedirs("data", exist_ok=True)
+def get_feedback_writer() -> GroupCommitWriter:
+    """Süreç içindeki eşzamanlı kayıtları (tüm kiracılar) toplu yazan paylaşılan yazıcı."""
+    global _writer
+    store = get_feedback_store()
+    with _init_lock:
+        if _writer is None:
+            _writer = GroupCommitWriter(store, flush_interval=FEEDBACK_FLUSH_INTERVAL)
+    return _writer
 
-    history = []
-    if os.path.exists(FEEDBACK_FILE):
-        try:
-            with open(FEEDBACK_FILE, "r", encoding="utf-8") as f:
-                history = json.load(f)
-        except Exception:
-            history = []
 
+def save_feedback(feedback: dict, tenant=None):
+    """
+    Kullanıcı geri bildirimi kaydeder. Adlandırılmış kiracılarda ayrıca bekleyen
+    geri bildirim işareti bırakılır (agent zamanlayıcısı yalnızca bunları uyandırır).
+    """
+    tenant = get_tenant(tenant)
     feedback_record = {
         "timestamp": datetime.now().isoformat(),
         **feedback
     }
 
-    history.append(feedback_record)
+    # Kayıt diske kalıcı olarak yazılana kadar bekler
+    get_feedback_writer().submit(feedback_record, store=get_feedback_store(tenant))
+
+    if tenant.is_default:
+        for listener in list(_listeners):
+            listener(feedback_record)
+        approved = "👍" if feedback_record.get("approved") else "👎"
+        record_activity(ACTIVITY_FEEDBACK, f"{approved} Geri bildirim: {feedback_record.get('comments', '')}",
+                        design=feedback_record.get("design"))
+    else:
+        mark_pending(tenant.tenant_id)
+    for listener in list(_tenant_listeners):
+        listener(tenant, feedback_record)
+
+    print(f"💾 Geri bildirim kaydedildi ({tenant.tenant_id}): {feedback_record}")
+
+
+def add_feedback_listener(callback):
+    """Varsayılan kiracıya her kayıt diske yazıldıktan sonra `callback(record)` çağrılır."""
+    _listeners.append(callback)
+
+
+def remove_feedback_listener(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def add_tenant_feedback_listener(callback):
+    """Herhangi bir kiracıya kayıt yazıldıktan sonra `callback(tenant, record)` çağrılır."""
+    _tenant_listeners.append(callback)
+
+
+def remove_tenant_feedback_listener(callback):
+    if callback in _tenant_listeners:
+        _tenant_listeners.remove(callback)
+
+
+def get_latest_feedback(tenant=None):
+    """En son geri bildirimi döndürür (yoksa None)."""
+    return get_feedback_store(tenant).latest()
+
+
+def get_recent_feedback(n: int = 50, tenant=None):
+    """Son n geri bildirimi eskiden yeniye döndürür."""
+    return get_feedback_store(tenant).tail(n)
 
-    with open(FEEDBACK_FILE, "w", encoding="utf-8") as f:
-        json.dump(history, f, indent=2, ensure_ascii=False)
 
-    print(f"💾 Geri bildirim kaydedildi: {feedback_record}")
+def get_feedback_between(start=None, end=None, tenant=None):
+    """
+    ISO zaman damgası aralığındaki geri bildirimleri döndürür. Canlı günlük
+    FEEDBACK_MAX_RECORDS kayda sıkıştırılır; daha eski aralıklar arşivden okunur.
+    """
+    return get_feedback_store(tenant).between(start, end)
 
 
-def get_feedback_history():
-    """Tüm geri bildirim geçmişini döndürür."""
-    if os.path.exists(FEEDBACK_FILE):
-        with open(FEEDBACK_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
+def get_feedback_history(tenant=None):
+    """Tüm geri bildirim geçmişini (sıkıştırmayla arşive taşınanlar dahil) döndürür."""
+    return get_feedback_store(tenant).history()
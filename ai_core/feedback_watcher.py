@@ -0,0 +1,83 @@
+# feedback_watcher.py
+import os
+import threading
+import time
+
+from ai_core.feedback_manager import FEEDBACK_LOG, add_feedback_listener, remove_feedback_listener
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog yoksa yalnızca süreç içi bildirim kullanılır
+    Observer = None
+    FileSystemEventHandler = object
+
+
+class _LogChangeHandler(FileSystemEventHandler):
+    def __init__(self, path, notify):
+        self.path = os.path.abspath(path)
+        self.notify = notify
+
+    def on_modified(self, event):
+        if os.path.abspath(event.src_path) == self.path:
+            self.notify()
+
+    on_created = on_modified
+
+
+class FeedbackWatcher:
+    """
+    Yeni geri bildirim geldiğinde agent döngüsünü uyandırır.
+
+    Aynı süreçteki `save_feedback` çağrıları dinleyici ile, başka süreçlerden
+    (ör. Flask işçileri) gelen yazmalar ise JSONL dosyasındaki değişiklik
+    bildirimiyle yakalanır.
+    """
+
+    def __init__(self, path=FEEDBACK_LOG):
+        self.path = path
+        self._event = threading.Event()
+        self._observer = None
+        self.notifications = 0
+
+    def start(self):
+        add_feedback_listener(self._on_feedback)
+        if Observer is not None:
+            folder = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(folder, exist_ok=True)
+            self._observer = Observer()
+            self._observer.schedule(_LogChangeHandler(self.path, self.notify), folder, recursive=False)
+            self._observer.daemon = True
+            self._observer.start()
+        return self
+
+    def stop(self):
+        remove_feedback_listener(self._on_feedback)
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def notify(self):
+        self.notifications += 1
+        self._event.set()
+
+    def _on_feedback(self, record):
+        self.notify()
+
+    def wait(self, timeout=None) -> bool:
+        """Bildirim gelene ya da süre dolana kadar bekler; bildirim geldiyse True."""
+        signaled = self._event.wait(timeout)
+        self._event.clear()
+        return signaled
+
+    def wait_quiet(self, debounce: float, max_wait: float):
+        """
+        Ardışık bildirimleri birleştirir: `debounce` saniye sessizlik olana
+        (en fazla `max_wait` saniye) kadar bekler.
+        """
+        deadline = time.monotonic() + max_wait
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.wait(min(debounce, remaining)):
+                return
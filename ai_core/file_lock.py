@@ -0,0 +1,94 @@
+# file_lock.py
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Aynı süreçteki iş parçacıkları için yol başına kilit durumu: iş parçacığı
+# kilidi, yeniden girme derinliği ve flock tutulan dosya tanımlayıcısı. Aynı
+# yol için oluşturulan tüm FileLock örnekleri bu durumu paylaşır; böylece aynı
+# iş parçacığında iç içe alınan iki örnek aynı tanımlayıcıyı kullanır.
+_path_states = {}
+_path_states_guard = threading.Lock()
+
+
+class _PathState:
+    __slots__ = ("lock", "depth", "fd")
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+
+def _state_for(path):
+    with _path_states_guard:
+        state = _path_states.get(path)
+        if state is None:
+            state = _path_states[path] = _PathState()
+        return state
+
+
+class FileLock:
+    """
+    Süreçler ve iş parçacıkları arasında geçerli özel (exclusive) dosya kilidi.
+
+    Kullanım:
+        with FileLock("data/feedback_loop.jsonl.lock"):
+            ...
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self._state = _state_for(self.path)
+
+    def acquire(self):
+        state = self._state
+        state.lock.acquire()
+        state.depth += 1
+        if state.depth > 1:
+            return
+        try:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            except BaseException:
+                os.close(fd)
+                raise
+            state.fd = fd
+        except BaseException:
+            state.depth -= 1
+            state.lock.release()
+            raise
+
+    def release(self):
+        state = self._state
+        state.depth -= 1
+        if state.depth == 0:
+            fd, state.fd = state.fd, None
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(fd)
+        state.lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
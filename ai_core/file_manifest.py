@@ -0,0 +1,231 @@
+# file_manifest.py
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from ai_core.atomic_io import atomic_write_json
+from ai_core.jsonl_store import JsonlStore
+
+MANIFEST_LOG = "logs/manifest.jsonl"
+MANIFEST_SNAPSHOT = "logs/manifest_snapshot.json"
+# Günlükte bu kadar kayıt birikince anlık görüntü alınır ve günlük boşaltılır
+MANIFEST_SNAPSHOT_EVERY = 5000
+_HASH_BLOCK = 1024 * 1024
+
+
+def content_hash(data: bytes = None, path: str = None) -> str:
+    """Bayt içeriğinin ya da dosyanın sha256 özeti."""
+    digest = hashlib.sha256()
+    if data is not None:
+        digest.update(data)
+    else:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _norm(path):
+    # Projedeki diğer yollar gibi çalışma klasörüne göreli tutulur
+    # (os.path.relpath toplu taşımalarda darboğaz olduğu için önek kontrolü)
+    if os.path.isabs(path):
+        cwd = os.getcwd()
+        if path.startswith(cwd + os.sep):
+            path = path[len(cwd) + 1:]
+    return os.path.normpath(path)
+
+
+class FileManifest:
+    """
+    Yönetilen dosyaların (yol, boyut, mtime, içerik özeti, hedef) kalıcı listesi.
+
+    Değişiklikler yalnızca sona eklenen bir JSONL günlüğüne yazılır; günlük
+    belirli bir uzunluğa ulaşınca tüm liste anlık görüntüye (snapshot) yazılıp
+    günlük boşaltılır. Açılışta anlık görüntü + günlük okunur. `diff()` dosyaları
+    yalnızca stat ile karşılaştırır; özet sadece boyutu/mtime'ı değişenler için
+    hesaplanır.
+    """
+
+    def __init__(self, log_path=MANIFEST_LOG, snapshot_path=MANIFEST_SNAPSHOT, snapshot_every=MANIFEST_SNAPSHOT_EVERY):
+        self.store = JsonlStore(log_path, durable=False)
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+        self.entries = {}
+        self._offset = 0
+        self._log_records = 0
+        self._snapshot_sig = None
+        self._lock = threading.RLock()
+        self.refresh()
+
+    # --- Okuma ---
+    def _snapshot_signature(self):
+        try:
+            st = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _load_snapshot(self):
+        self.entries = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+        self._offset = 0
+
+    def refresh(self):
+        """Anlık görüntü değiştiyse onu, ardından günlükteki yeni kayıtları uygular."""
+        with self._lock:
+            signature = self._snapshot_signature()
+            if signature != self._snapshot_sig or self._offset > self.store.size():
+                # Günlük (başka bir süreç tarafından) döndürülmüş olabilir
+                self._load_snapshot()
+                self._snapshot_sig = signature
+                self._log_records = 0
+            records, self._offset = self.store.read_from(self._offset)
+            self._apply(records)
+            self._log_records += len(records)
+            return len(records)
+
+    def _apply(self, records):
+        for record in records:
+            if record.get("op") == "delete":
+                self.entries.pop(record["path"], None)
+            elif record.get("op") == "put":
+                entry = {k: record.get(k) for k in ("size", "mtime_ns", "hash", "route")}
+                self.entries[record["path"]] = entry
+
+    def get(self, path):
+        return self.entries.get(_norm(path))
+
+    def __len__(self):
+        return len(self.entries)
+
+    # --- Yazma ---
+    def _append(self, records):
+        if not records:
+            return
+        now = datetime.now().isoformat()
+        for record in records:
+            record["timestamp"] = now
+        with self._lock:
+            self.store.append_many(records)
+            # Kendi kayıtlarımız (ve arada başka süreçlerin yazdıkları) günlükten uygulanır
+            self.refresh()
+            if self.snapshot_every and self._log_records >= self.snapshot_every:
+                self.snapshot()
+
+    @staticmethod
+    def _put(path, st, digest, route):
+        return {"op": "put", "path": path, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": digest, "route": route}
+
+    def record(self, path, route=None, data: bytes = None):
+        """Dosyanın güncel durumunu kaydeder (değişmemişse hiçbir şey yazmaz)."""
+        path = _norm(path)
+        st = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and self._stat_matches(entry, st) and entry.get("route") == route and entry.get("hash"):
+            return False
+        digest = content_hash(data=data) if data is not None else content_hash(path=path)
+        self._append([self._put(path, st, digest, route)])
+        return True
+
+    def record_moves(self, moves):
+        """
+        [(kaynak, hedef, hedef_klasör, stat)] taşımalarını tek seferde kaydeder.
+        Kaynağın özeti biliniyorsa hedefe taşınır; değilse sonraki diff'te hesaplanır.
+        """
+        records = []
+        for src, dst, route, st in moves:
+            src, dst = _norm(src), _norm(dst)
+            previous = self.entries.get(src)
+            digest = previous.get("hash") if previous and previous.get("size") == st.st_size else None
+            if previous:
+                records.append({"op": "delete", "path": src})
+            records.append(self._put(dst, st, digest, route))
+        self._append(records)
+
+    def remove(self, path):
+        path = _norm(path)
+        if path in self.entries:
+            self._append([{"op": "delete", "path": path}])
+
+    def snapshot(self):
+        """Tüm listeyi anlık görüntüye yazar ve günlüğü boşaltır."""
+        def write():
+            self.refresh()
+            atomic_write_json(self.snapshot_path, {"timestamp": datetime.now().isoformat(), "entries": self.entries}, indent=None)
+
+        with self._lock:
+            self.store.rotate(write)
+            self._offset = 0
+            self._log_records = 0
+            self._snapshot_sig = self._snapshot_signature()
+
+    # --- Karşılaştırma ---
+    @staticmethod
+    def _stat_matches(entry, st):
+        return entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns
+
+    def content_matches(self, path, data: bytes) -> bool:
+        """Diskteki dosya `data` ile aynı mı? Kayıt ve stat eşleşirse dosya okunmaz."""
+        path = _norm(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if st.st_size != len(data):
+            return False
+        entry = self.entries.get(path)
+        if entry and entry.get("hash") and self._stat_matches(entry, st):
+            return entry["hash"] == content_hash(data=data)
+        with open(path, "rb") as f:
+            return f.read() == data
+
+    def diff(self, roots, route_of=None):
+        """
+        Kök klasörlerdeki dosyaları listeyle karşılaştırır ve listeyi günceller.
+        {"added", "modified", "removed", "unchanged"} sayılarını döndürür;
+        içerik özeti yalnızca eklenen/stat'ı değişen dosyalar için hesaplanır.
+        """
+        self.refresh()
+        roots = sorted({_norm(r) for r in roots})
+        # İç içe kökler (ör. static ve static/css) bir kez taranır
+        roots = [r for r in roots if not any(r.startswith(o + os.sep) for o in roots if o != r)]
+        seen = set()
+        records = []
+        counts = {"added": 0, "modified": 0, "removed": 0, "unchanged": 0}
+        for root in roots:
+            for folder, dirs, names in os.walk(root):
+                dirs[:] = [d for d in dirs if not d.startswith(".") and d != "__pycache__"]
+                for name in names:
+                    path = _norm(os.path.join(folder, name))
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    seen.add(path)
+                    entry = self.entries.get(path)
+                    if entry and self._stat_matches(entry, st):
+                        counts["unchanged"] += 1
+                        if not entry.get("hash"):
+                            # Taşınarak eklenen dosyaların eksik özeti bir kez tamamlanır
+                            records.append(self._put(path, st, content_hash(path=path), entry.get("route")))
+                        continue
+                    digest = content_hash(path=path)
+                    route = entry.get("route") if entry else (route_of(path) if route_of else root)
+                    if entry is None:
+                        counts["added"] += 1
+                    elif entry.get("hash") == digest:
+                        counts["unchanged"] += 1  # yalnızca mtime değişmiş
+                    else:
+                        counts["modified"] += 1
+                    records.append(self._put(path, st, digest, route))
+
+        for path in list(self.entries):
+            if path not in seen and any(path == r or path.startswith(r + os.sep) for r in roots):
+                counts["removed"] += 1
+                records.append({"op": "delete", "path": path})
+        self._append(records)
+        return counts
@@ -0,0 +1,387 @@
+# jsonl_store.py
+import gzip
+import json
+import os
+import re
+import threading
+import time
+
+from ai_core.atomic_io import atomic_write
+from ai_core.file_lock import FileLock
+
+# Okuma/yazma blok boyutu (tail ve ikili arama için)
+_BLOCK_SIZE = 64 * 1024
+# Yalnızca tarih içeren zaman damgası (ör. "2025-07-27")
+_DATE_ONLY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _end_bound(end: str) -> str:
+    # "2025-07-27" metin olarak "2025-07-27T..." değerlerinden küçüktür; yalnızca
+    # tarih verilen üst sınır o günün tamamını kapsar
+    return end + "\uffff" if _DATE_ONLY.match(end) else end
+
+
+class JsonlStore:
+    """
+    Yalnızca sona ekleme yapılan JSON Lines kayıt deposu.
+
+    Her kayıt tek satırdır; ekleme O(1), `latest()` / `tail(n)` dosyanın
+    sonundan geriye doğru okur, zaman aralığı sorguları zaman damgasına göre
+    sıralı dosyada ikili arama yapar. Yazmalar `<dosya>.lock` kilidi altında
+    yapıldığı için birden fazla süreç aynı dosyaya güvenle ekleme yapabilir.
+    """
+
+    def __init__(self, path, timestamp_key="timestamp", max_records=None, compact_every=1000, durable=True):
+        self.path = path
+        self.timestamp_key = timestamp_key
+        self.max_records = max_records
+        self.compact_every = compact_every
+        self.durable = durable
+        self._appends_since_compact = 0
+        self._lock = FileLock(path + ".lock")
+        # compact() ile kırpılan eski kayıtlar (sırayla) buraya eklenir
+        self.archive_path = path + ".archive.jsonl.gz"
+
+    # --- Yazma ---
+    def append(self, record: dict) -> dict:
+        """Tek kaydı dosyanın sonuna ekler."""
+        self.append_many([record])
+        return record
+
+    def append_many(self, records):
+        """Birden fazla kaydı tek yazma işlemiyle ekler."""
+        if not records:
+            return
+        payload = b"".join(self._encode(r) for r in records)
+        self._ensure_dir()
+        with self._lock:
+            with open(self.path, "a+b") as f:
+                # Yarım kalmış son satır varsa yeni kaydı ona yapıştırma
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        payload = b"\n" + payload
+                f.write(payload)
+                f.flush()
+                if self.durable:
+                    os.fsync(f.fileno())
+
+            self._appends_since_compact += len(records)
+            if self.max_records and self._appends_since_compact >= self.compact_every:
+                self.compact()
+
+    # --- Okuma ---
+    def latest(self):
+        """En son kaydı döndürür, dosya boşsa None."""
+        records = self.tail(1)
+        return records[-1] if records else None
+
+    def tail(self, n: int):
+        """Son n kaydı eskiden yeniye sıralı döndürür."""
+        if n <= 0 or not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            buffer = b""
+            # n kayıt için n+1 satır sonu yeterli (ilk satır yarım olabilir)
+            while pos > 0 and buffer.count(b"\n") <= n:
+                step = min(_BLOCK_SIZE, pos)
+                pos -= step
+                f.seek(pos)
+                buffer = f.read(step) + buffer
+
+        lines = buffer.split(b"\n")
+        if pos > 0:
+            lines = lines[1:]
+        records = [r for r in (self._decode(line) for line in lines) if r is not None]
+        return records[-n:]
+
+    def iter_records(self, start_offset=0):
+        """Kayıtları verilen bayt konumundan itibaren sırayla üretir."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(start_offset)
+            for line in f:
+                record = self._decode(line)
+                if record is not None:
+                    yield record
+
+    def read_from(self, offset=0):
+        """
+        `offset` konumundan sonraki tamamlanmış satırları okur.
+        (kayıtlar, yeni_offset) döndürür; yarım yazılmış son satır atlanır.
+        """
+        if not os.path.exists(self.path):
+            return [], 0
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        records = [r for r in (self._decode(line) for line in data[:end].split(b"\n")) if r is not None]
+        return records, offset + end
+
+    def file_id(self):
+        """Dosya kimliği (cihaz, inode); sıkıştırma sonrası değişir. Dosya yoksa None."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return [st.st_dev, st.st_ino]
+
+    def size(self):
+        """Dosyanın bayt cinsinden boyutu."""
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def all(self):
+        """Canlı dosyadaki tüm kayıtları liste olarak döndürür (arşiv hariç)."""
+        return list(self.iter_records())
+
+    def iter_archived(self):
+        """compact() ile arşive taşınmış kayıtları eskiden yeniye üretir."""
+        if not os.path.exists(self.archive_path):
+            return
+        with gzip.open(self.archive_path, "rb") as f:
+            for line in f:
+                record = self._decode(line)
+                if record is not None:
+                    yield record
+
+    def history(self):
+        """Arşiv + canlı dosya: sıkıştırmayla kırpılanlar dahil tüm kayıtlar."""
+        if not os.path.exists(self.archive_path):
+            return self.all()
+        # Kilit altında: eşzamanlı sıkıştırma kayıtları arşive taşırken çift/eksik okunmasın
+        with self._lock:
+            return list(self.iter_archived()) + self.all()
+
+    def between(self, start=None, end=None):
+        """
+        Zaman damgası [start, end] aralığındaki kayıtları döndürür (ISO metin).
+        Yalnızca tarih olan `end` o günün sonuna kadar olan kayıtları da içerir.
+        Aralık canlı dosyanın ilk kaydından eskiye uzanıyorsa arşiv de (baştan
+        sona, sıkıştırılmış) taranır; canlı dosyadaki kısım ikili aramayla bulunur.
+        """
+        if end:
+            end = _end_bound(end)
+        if os.path.exists(self.archive_path):
+            with self._lock:
+                first = next(self.iter_records(), None)
+                first_ts = first.get(self.timestamp_key, "") if first else None
+                if first_ts is None or not start or start < first_ts:
+                    archived = [r for r in self.iter_archived()
+                                if self._in_range(r.get(self.timestamp_key, ""), start, end)]
+                    return archived + self._between_live(start, end)
+        return self._between_live(start, end)
+
+    def _between_live(self, start, end):
+        if not os.path.exists(self.path):
+            return []
+        offset = self.offset_of(start) if start else 0
+        result = []
+        for record in self.iter_records(offset):
+            ts = record.get(self.timestamp_key, "")
+            if end and ts > end:
+                break
+            result.append(record)
+        return result
+
+    @staticmethod
+    def _in_range(ts, start, end):
+        return (not start or ts >= start) and (not end or ts <= end)
+
+    def offset_of(self, timestamp: str) -> int:
+        """Zaman damgası `timestamp` değerinden küçük olmayan ilk kaydın bayt konumu."""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            lo, hi = 0, f.tell()
+            while lo < hi:
+                mid = (lo + hi) // 2
+                pos = self._line_start_at_or_after(f, mid)
+                if pos >= hi:
+                    pos = lo
+                f.seek(pos)
+                line = f.readline()
+                record = self._decode(line)
+                ts = record.get(self.timestamp_key, "") if record else ""
+                if ts < timestamp:
+                    lo = pos + len(line)
+                else:
+                    hi = pos
+            return lo
+
+    # --- Bakım ---
+    def compact(self, max_records=None) -> int:
+        """
+        Bozuk satırları temizler ve dosyayı son `max_records` kayda indirir.
+        Kırpılan kayıtlar `<dosya>.archive.jsonl.gz` arşivine eklenir;
+        `history()` ve `between()` onları okumaya devam eder.
+        """
+        with self._lock:
+            self._appends_since_compact = 0
+            if not os.path.exists(self.path):
+                return 0
+            limit = max_records or self.max_records
+            records = self.all()
+            dropped = []
+            if limit and len(records) > limit:
+                dropped, records = records[:-limit], records[-limit:]
+
+            if dropped:
+                with gzip.open(self.archive_path, "ab") as archive:
+                    archive.write(b"".join(self._encode(r) for r in dropped))
+
+            self._atomic_rewrite(records)
+            return len(dropped)
+
+    def rotate(self, callback):
+        """
+        Kilit altında `callback()`'i çağırır ve ardından dosyayı boşaltır
+        (ör. günlük bir anlık görüntüye yazıldıktan sonra). Boşaltılan dosya
+        yeni bir dosya kimliği alır; okuyucular bunu `file_id()` ile fark eder.
+        """
+        with self._lock:
+            result = callback()
+            self._atomic_rewrite([])
+            self._appends_since_compact = 0
+            return result
+
+    def import_json_array(self, legacy_path: str, if_missing=False) -> int:
+        """
+        Eski JSON dizi dosyasındaki kayıtları bir kereliğine içe aktarır.
+        `if_missing` ise yalnızca JSONL dosyası henüz yoksa aktarım yapılır.
+        """
+        if not os.path.exists(legacy_path):
+            return 0
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        if not isinstance(legacy, list):
+            return 0
+
+        records = [r for r in legacy if isinstance(r, dict)]
+        records.sort(key=lambda r: r.get(self.timestamp_key, ""))
+        with self._lock:
+            if if_missing and os.path.exists(self.path):
+                return 0
+            self._atomic_rewrite(records + self.all())
+        return len(records)
+
+    # --- Yardımcılar ---
+    def _ensure_dir(self):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    def _atomic_rewrite(self, records):
+        atomic_write(self.path, b"".join(self._encode(r) for r in records))
+
+    @staticmethod
+    def _line_start_at_or_after(f, pos):
+        if pos == 0:
+            return 0
+        f.seek(pos - 1)
+        f.readline()
+        return f.tell()
+
+    @staticmethod
+    def _encode(record):
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @staticmethod
+    def _decode(line):
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        return record if isinstance(record, dict) else None
+
+
+class GroupCommitWriter:
+    """
+    Eşzamanlı yazma isteklerini toplayıp tek bir kalıcı yazmada (fsync) işler.
+
+    İlk kayıt geldikten sonra en fazla `flush_interval` saniye ya da
+    `max_batch` kayıt birikene kadar beklenir; `submit(wait=True)` kayıt
+    diske yazılana kadar döner. `submit(store=...)` ile kayıt başka bir depoya
+    yönlendirilebilir (ör. kiracı başına dosya); tek iş parçacığı tüm depoların
+    kayıtlarını depo başına tek yazmada işler.
+    """
+
+    def __init__(self, store: JsonlStore, flush_interval=0.02, max_batch=512):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.commits = 0
+        self.records_written = 0
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: dict, wait=True, timeout=None, store: JsonlStore = None):
+        """Kaydı kuyruğa ekler; `wait` ise kalıcı olarak yazılana kadar bekler."""
+        done = threading.Event()
+        entry = {"record": record, "store": store or self.store, "done": done, "error": None}
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("GroupCommitWriter kapatıldı.")
+            self._pending.append(entry)
+            self._cond.notify_all()
+        if wait:
+            if not done.wait(timeout):
+                raise TimeoutError("Geri bildirim zamanında yazılamadı.")
+            if entry["error"] is not None:
+                raise entry["error"]
+        return record
+
+    def close(self):
+        """Bekleyen kayıtları yazar ve arka plan iş parçacığını durdurur."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                # Grup oluşsun diye kısa süre bekle (üst sınırlı)
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+
+            groups = {}
+            for entry in batch:
+                groups.setdefault(id(entry["store"]), []).append(entry)
+            for entries in groups.values():
+                error = None
+                try:
+                    entries[0]["store"].append_many([e["record"] for e in entries])
+                    self.commits += 1
+                    self.records_written += len(entries)
+                except Exception as e:
+                    error = e
+                for entry in entries:
+                    entry["error"] = error
+                    entry["done"].set()
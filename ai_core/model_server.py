@@ -0,0 +1,320 @@
+# model_server.py
+import argparse
+import os
+import secrets
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+from ai_core.prefix_cache import PrefixCache, prefill
+
+DEFAULT_MODEL_PATH = "gpt2-soru-model/final_model"
+# Yerel soket sunucusu adresi
+MODEL_SERVER_HOST = "127.0.0.1"
+MODEL_SERVER_PORT = 6060
+# Kimlik doğrulama anahtarı: ortam değişkeni, yoksa sunucunun ilk açılışta
+# rastgele üretip yalnızca sahibinin okuyabileceği dosyaya yazdığı anahtar.
+# (multiprocessing.connection gelen mesajları unpickle eder; anahtarı bilen
+# her süreç sunucuda kod çalıştırabilir, bu yüzden sabit varsayılan yoktur.)
+MODEL_SERVER_AUTHKEY_ENV = "MODEL_SERVER_AUTHKEY"
+MODEL_SERVER_KEY_FILE = "data/model_server.key"
+
+
+def _read_authkey(key_file):
+    env_key = os.environ.get(MODEL_SERVER_AUTHKEY_ENV)
+    if env_key:
+        return env_key.encode("utf-8")
+    try:
+        with open(key_file, "rb") as f:
+            key = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return key or None
+
+
+def server_authkey(key_file=MODEL_SERVER_KEY_FILE) -> bytes:
+    """Sunucu anahtarı; tanımlı değilse rastgele üretilip 0600 izinli dosyaya yazılır."""
+    key = _read_authkey(key_file)
+    if key:
+        return key
+    key = secrets.token_hex(32).encode("ascii")
+    folder = os.path.dirname(key_file)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    try:
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Aynı anda başlayan başka bir sunucu yazdı
+        return client_authkey(key_file)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    print(f"🔑 Model sunucusu anahtarı üretildi: {key_file}")
+    return key
+
+
+def client_authkey(key_file=MODEL_SERVER_KEY_FILE) -> bytes:
+    """İstemci anahtarı (ortam değişkeni ya da sunucunun yazdığı dosya)."""
+    key = _read_authkey(key_file)
+    if not key:
+        raise RuntimeError(
+            f"Model sunucusu anahtarı bulunamadı: {MODEL_SERVER_AUTHKEY_ENV} tanımlayın "
+            f"ya da sunucunun yazdığı '{key_file}' dosyasını kullanın."
+        )
+    return key
+
+
+class GenerationServer:
+    """
+    GPT-2 modelini bir kez yükleyip bellekte sıcak tutan üretim servisi.
+
+    `generate()` birden fazla prompt'u tek bir ileri geçişte (batch) işler;
+    `max_new_tokens` ve `temperature` her istekte ayrı verilebilir.
+    """
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, model=None, tokenizer=None, device=None, prefix_cache=True):
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+
+        self.torch = torch
+        self.model_path = model_path
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+
+        started = time.perf_counter()
+        self.tokenizer = tokenizer or AutoTokenizer.from_pretrained(model_path)
+        self.model = model or AutoModelForCausalLM.from_pretrained(model_path)
+        self.model.to(self.device)
+        self.model.eval()
+        self.load_time = time.perf_counter() - started
+
+        # Batch için sola dolgu: üretim her satırın gerçek sonundan devam eder
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        self.requests = 0
+        self.prompts = 0
+        self.generated_tokens = 0
+        self.generation_time = 0.0
+        self._decoder = None
+        self.prefix_cache = PrefixCache() if prefix_cache is True else (prefix_cache or None)
+        self._lock = threading.Lock()
+
+    def generate(self, prompts, max_new_tokens=200, temperature=1.0, with_tokens=False):
+        """
+        Prompt listesini tek batch'te üretir. Her eleman için pipeline ile
+        uyumlu olarak prompt + üretilen metni döndürür; `with_tokens` ise
+        (metinler, prompt başına üretilen token sayıları) döndürür.
+        """
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        sampling = temperature is not None and temperature > 0
+        kwargs = {"do_sample": sampling, "temperature": temperature} if sampling else {"do_sample": False}
+
+        # Hızlı tokenizer iş parçacığı güvenli değildir; tokenizer da kilit altında kullanılır
+        with self._lock:
+            encoded = self.tokenizer(prompts, return_tensors="pt", padding=True).to(self.device)
+            started = time.perf_counter()
+            with self.torch.no_grad():
+                output = self.model.generate(
+                    **encoded,
+                    max_new_tokens=max_new_tokens,
+                    pad_token_id=self.tokenizer.pad_token_id,
+                    **kwargs
+                )
+            elapsed = time.perf_counter() - started
+            new_tokens = output[:, encoded["input_ids"].shape[1]:]
+            counts = [int((tokens != self.tokenizer.pad_token_id).sum()) for tokens in new_tokens]
+            # Sayaçlar kilit altında: her bağlantı ayrı iş parçacığında çalışır
+            self.requests += 1
+            self.prompts += len(prompts)
+            self.generated_tokens += sum(counts)
+            self.generation_time += elapsed
+            texts = [
+                prompt + self.tokenizer.decode(tokens[tokens != self.tokenizer.pad_token_id], skip_special_tokens=True)
+                for prompt, tokens in zip(prompts, new_tokens)
+            ]
+        return (texts, counts) if with_tokens else texts
+
+    def generate_cached(self, prompt, max_new_tokens=200, temperature=1.0):
+        """
+        Tek prompt'u önek KV önbelleğinden devam ederek üretir.
+        (prompt + üretilen metin, ilk token süresi sn) döndürür.
+        """
+        eos = self.tokenizer.eos_token_id
+        generated = []
+        first_token_latency = None
+        with self._lock:
+            token_ids = self.tokenizer.encode(prompt)
+            started = time.perf_counter()
+            with self.torch.no_grad():
+                past, logits = prefill(self.model, token_ids, self.prefix_cache, self.device)
+                for step in range(max_new_tokens):
+                    if temperature and temperature > 0:
+                        token_id = int(self.torch.multinomial(self.torch.softmax(logits / temperature, dim=-1), 1))
+                    else:
+                        token_id = int(self.torch.argmax(logits))
+                    if step == 0:
+                        first_token_latency = time.perf_counter() - started
+                    if token_id == eos:
+                        break
+                    generated.append(token_id)
+                    output = self.model(
+                        input_ids=self.torch.tensor([[token_id]], device=self.device),
+                        past_key_values=past, use_cache=True
+                    )
+                    past, logits = output.past_key_values, output.logits[0, -1]
+            elapsed = time.perf_counter() - started
+            self.requests += 1
+            self.prompts += 1
+            self.generated_tokens += len(generated)
+            self.generation_time += elapsed
+            text = prompt + self.tokenizer.decode(generated, skip_special_tokens=True)
+        return text, first_token_latency
+
+    def warm_prefixes(self, prefixes):
+        """Verilen önekleri önceden işleyip önbelleğe alır (ör. sabit prompt iskeletleri)."""
+        if self.prefix_cache is None:
+            return
+        with self._lock, self.torch.no_grad():
+            for prefix in prefixes:
+                prefill(self.model, self.tokenizer.encode(prefix), self.prefix_cache, self.device)
+
+    def generate_design(self, prompt="", temperature=0.8, max_components=None, with_tokens=False):
+        """
+        Şemaya kısıtlı çözümleme ile tek bir tasarım üretir: (tasarım, json_metni);
+        `prompt` JSON'dan önce verilen isteğe bağlı bağlamdır. `with_tokens` ise
+        üçüncü eleman modele verilen token sayısıdır.
+        """
+        from ai_core.constrained_decoding import MAX_COMPONENTS, ConstrainedDesignDecoder
+
+        with self._lock:
+            if self._decoder is None:
+                self._decoder = ConstrainedDesignDecoder(
+                    self.model, self.tokenizer, device=self.device, prefix_cache=self.prefix_cache
+                )
+            with self.torch.no_grad():
+                design, text = self._decoder.generate(prompt, temperature=temperature,
+                                                      max_components=max_components or MAX_COMPONENTS)
+            tokens = self._decoder.generated_tokens
+        return (design, text, tokens) if with_tokens else (design, text)
+
+    def decoding_stats(self):
+        return self._decoder.stats.as_dict() if self._decoder else {}
+
+    def first_token_latency(self, prompt):
+        """Tek prompt için ilk token'ın üretilme süresi (sn)."""
+        started = time.perf_counter()
+        self.generate([prompt], max_new_tokens=1, temperature=0)
+        return time.perf_counter() - started
+
+    def stats(self):
+        return {
+            "model_path": self.model_path,
+            "device": self.device,
+            "load_time_s": round(self.load_time, 3),
+            "requests": self.requests,
+            "prompts": self.prompts,
+            "generated_tokens": self.generated_tokens,
+            "tokens_per_sec": round(self.generated_tokens / self.generation_time, 1) if self.generation_time else None,
+            "prefix_cache": self.prefix_cache.stats() if self.prefix_cache else None
+        }
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def get_server(model_path=DEFAULT_MODEL_PATH) -> GenerationServer:
+    """Süreç içinde model yolu başına tek bir sıcak sunucu döndürür."""
+    with _servers_lock:
+        server = _servers.get(model_path)
+        if server is None:
+            server = _servers[model_path] = GenerationServer(model_path)
+            print(f"✅ Model yüklendi ({server.load_time:.2f} sn): {model_path}")
+        return server
+
+
+# --- Yerel soket sunucusu ---
+def _handle_connection(server, conn):
+    with conn:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                return
+            try:
+                if request.get("op") == "stats":
+                    conn.send({"stats": server.stats()})
+                    continue
+                if request.get("op") == "design":
+                    design, text, tokens = server.generate_design(
+                        request.get("prompt", ""), temperature=request.get("temperature", 0.8), with_tokens=True
+                    )
+                    conn.send({"design": design, "text": text, "tokens": tokens})
+                    continue
+                texts, tokens = server.generate(
+                    request["prompts"],
+                    max_new_tokens=request.get("max_new_tokens", 200),
+                    temperature=request.get("temperature", 1.0),
+                    with_tokens=True
+                )
+                conn.send({"texts": texts, "tokens": tokens})
+            except Exception as e:
+                conn.send({"error": str(e)})
+
+
+def serve(server: GenerationServer, host=MODEL_SERVER_HOST, port=MODEL_SERVER_PORT, authkey=None):
+    """Sunucuyu yerel sokette yayınlar; her bağlantı ayrı iş parçacığında işlenir."""
+    authkey = authkey or server_authkey()
+    with Listener((host, port), authkey=authkey) as listener:
+        print(f"🛰  Model sunucusu dinliyor: {host}:{port}")
+        while True:
+            conn = listener.accept()
+            threading.Thread(target=_handle_connection, args=(server, conn), daemon=True).start()
+
+
+class GenerationClient:
+    """Yerel soket üzerindeki model sunucusuna bağlanan istemci (GenerationServer ile aynı arayüz)."""
+
+    def __init__(self, host=MODEL_SERVER_HOST, port=MODEL_SERVER_PORT, authkey=None):
+        self._conn = Client((host, port), authkey=authkey or client_authkey())
+        self._lock = threading.Lock()
+
+    def _call(self, request):
+        with self._lock:
+            self._conn.send(request)
+            response = self._conn.recv()
+        if "error" in response:
+            raise RuntimeError(f"Model sunucusu hatası: {response['error']}")
+        return response
+
+    def generate(self, prompts, max_new_tokens=200, temperature=1.0, with_tokens=False):
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        response = self._call({"prompts": prompts, "max_new_tokens": max_new_tokens, "temperature": temperature})
+        return (response["texts"], response["tokens"]) if with_tokens else response["texts"]
+
+    def generate_design(self, prompt="", temperature=0.8, with_tokens=False):
+        response = self._call({"op": "design", "prompt": prompt, "temperature": temperature})
+        if with_tokens:
+            return response["design"], response["text"], response["tokens"]
+        return response["design"], response["text"]
+
+    def stats(self):
+        return self._call({"op": "stats"})["stats"]
+
+    def close(self):
+        self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GPT-2 modelini sıcak tutan yerel üretim sunucusu.")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Model klasörü")
+    parser.add_argument("--host", default=MODEL_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=MODEL_SERVER_PORT)
+    args = parser.parse_args()
+    serve(get_server(args.model), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# prefix_cache.py
+from collections import namedtuple
+
+from ai_core.lru_cache import LRUCache
+
+# Önbellekteki KV durumları için bellek bütçesi (bayt)
+PREFIX_CACHE_BYTES = 256 * 1024 * 1024
+PREFIX_CACHE_ENTRIES = 64
+
+PrefixState = namedtuple("PrefixState", ["length", "past_key_values", "logits"])
+
+
+def _past_nbytes(state):
+    size = state.logits.numel() * state.logits.element_size()
+    for layer in state.past_key_values:
+        for tensor in layer:
+            size += tensor.numel() * tensor.element_size()
+    return size
+
+
+class PrefixCache:
+    """
+    Sık kullanılan prompt önekleri için past_key_values önbelleği.
+
+    Anahtar, önekin token dizisidir; `lookup()` verilen prompt'un önbellekteki
+    en uzun önekini döndürür, model yalnızca kalan token'ları işler. Bellek
+    bütçesi aşıldığında en uzun süredir kullanılmayan durumlar atılır.
+    Model `past_key_values` demetlerini yerinde değiştirmediği için aynı
+    durum farklı isteklerde güvenle paylaşılabilir.
+    """
+
+    def __init__(self, max_bytes=PREFIX_CACHE_BYTES, max_entries=PREFIX_CACHE_ENTRIES):
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes, sizeof=_past_nbytes)
+        self.full_hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.reused_tokens = 0
+
+    def lookup(self, token_ids):
+        """En uzun eşleşen öneki döndürür; yoksa None."""
+        token_ids = tuple(token_ids)
+        best = None
+        for key in self._cache.keys():
+            if len(key) <= len(token_ids) and (best is None or len(key) > len(best)) and token_ids[:len(key)] == key:
+                best = key
+        if best is None:
+            self.misses += 1
+            return None
+        state = self._cache.get(best)
+        if state is None:  # arada atılmış olabilir
+            self.misses += 1
+            return None
+        if len(best) == len(token_ids):
+            self.full_hits += 1
+        else:
+            self.partial_hits += 1
+        self.reused_tokens += len(best)
+        return state
+
+    def store(self, token_ids, past_key_values, logits):
+        token_ids = tuple(token_ids)
+        self._cache.put(token_ids, PrefixState(len(token_ids), past_key_values, logits))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return {
+            "entries": len(self._cache),
+            "bytes": self._cache.total_bytes,
+            "evictions": self._cache.evictions,
+            "full_hits": self.full_hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "reused_tokens": self.reused_tokens
+        }
+
+
+def prefill(model, token_ids, cache=None, device="cpu"):
+    """
+    Prompt'u modele verir; önbellekte eşleşen önek varsa yalnızca kalan
+    token'ları işler. (past_key_values, son_logitler) döndürür ve sonucu
+    önbelleğe yazar. torch.no_grad() içinde çağrılmalıdır.
+    """
+    import torch
+
+    state = cache.lookup(token_ids) if cache is not None else None
+    past, logits, done = (state.past_key_values, state.logits, state.length) if state else (None, None, 0)
+    if done < len(token_ids):
+        input_ids = torch.tensor([list(token_ids[done:])], device=device)
+        output = model(input_ids=input_ids, past_key_values=past, use_cache=True)
+        past, logits = output.past_key_values, output.logits[0, -1]
+        if cache is not None:
+            cache.store(token_ids, past, logits)
+    return past, logits
@@ -0,0 +1,119 @@
+# tenant.py
+import json
+import os
+import re
+import threading
+
+# Adlandırılmış kiracıların kök klasörü: tenants/<id>/{data,templates,static}
+TENANTS_ROOT = "tenants"
+# Bekleyen geri bildirim işaretleri: tenants/.pending/<id> (süreçler arası)
+TENANT_PENDING_DIR = os.path.join(TENANTS_ROOT, ".pending")
+# Kiracı ayarları (tema vb.), kiracı kökünde isteğe bağlı
+TENANT_CONFIG_FILE = "tenant.json"
+# Varsayılan kiracı proje kökünü kullanır; yollar eski sabitlerle aynıdır
+DEFAULT_TENANT = "default"
+# Adlandırılmış kiracıların sayfa ve statik dosyalarının adres öneki (app.py'deki /t/<id>/ rotaları)
+TENANT_URL_PREFIX = "/t"
+
+_TENANT_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+class TenantContext:
+    """
+    Bir panelin (kiracının) depolama kökü, çıktı hedefleri ve teması.
+
+    Tüm yollar `root` altındadır; varsayılan kiracının kökü "." olduğu için
+    yolları eski modül sabitleriyle (data/design.json, templates/generated_ui.html
+    ...) birebir aynıdır. feedback_manager, generate_ui, create_design ve
+    agent_loop fonksiyonları `tenant=None` aldığında varsayılan kiracıyı kullanır.
+    `theme` generate_ui'da kiracının sayfasına uygulanır (tema sınıfı ve
+    static/themes/<tema>/css/main.css).
+    """
+
+    def __init__(self, tenant_id=DEFAULT_TENANT, root=None, theme="default"):
+        if not _TENANT_ID.match(tenant_id):
+            raise ValueError(f"Geçersiz kiracı kimliği: {tenant_id!r}")
+        self.tenant_id = tenant_id
+        if root is None:
+            root = "." if tenant_id == DEFAULT_TENANT else os.path.join(TENANTS_ROOT, tenant_id)
+        self.root = root
+        self.theme = theme
+
+        self.data_dir = self.path("data")
+        self.design_file = self.path("data/design.json")
+        self.latest_pointer = self.path("data/latest.txt")
+        self.design_store_dir = self.path("data/designs")
+        self.feedback_log = self.path("data/feedback_loop.jsonl")
+        self.feedback_legacy_file = self.path("data/feedback_loop.json")
+        self.feedback_state_file = self.path("data/feedback_state.json")
+        self.output_html = self.path("templates/generated_ui.html")
+        self.output_css = self.path("static/css/generated_ui.css")
+
+    @property
+    def is_default(self):
+        return self.tenant_id == DEFAULT_TENANT
+
+    @property
+    def static_url(self):
+        """Kiracının `static/` klasörünün sunulduğu adres (sonunda / yok)."""
+        return "/static" if self.is_default else f"{TENANT_URL_PREFIX}/{self.tenant_id}/static"
+
+    def path(self, relative):
+        return os.path.normpath(os.path.join(self.root, relative))
+
+    def __repr__(self):
+        return f"TenantContext({self.tenant_id!r}, root={self.root!r}, theme={self.theme!r})"
+
+
+_tenants = {}
+_tenants_lock = threading.Lock()
+
+
+def get_tenant(tenant=None) -> TenantContext:
+    """
+    Kiracı bağlamını döndürür; `tenant` None, kimlik ya da TenantContext olabilir.
+    Bağlamlar bir kez oluşturulur (tema kiracı kökündeki tenant.json'dan okunur).
+    """
+    if isinstance(tenant, TenantContext):
+        return tenant
+    tenant_id = tenant or DEFAULT_TENANT
+    with _tenants_lock:
+        context = _tenants.get(tenant_id)
+        if context is None:
+            context = TenantContext(tenant_id)
+            config_path = context.path(TENANT_CONFIG_FILE)
+            if not context.is_default and os.path.exists(config_path):
+                try:
+                    with open(config_path, "r", encoding="utf-8") as f:
+                        context.theme = json.load(f).get("theme", context.theme)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  {config_path} okunamadı: {e}")
+            _tenants[tenant_id] = context
+    return context
+
+
+# --- Bekleyen geri bildirim işaretleri ---
+def mark_pending(tenant_id):
+    """Kiracıda işlenmemiş geri bildirim olduğunu (boş bir dosyayla) işaretler."""
+    path = os.path.join(TENANT_PENDING_DIR, tenant_id)
+    try:
+        open(path, "a").close()
+    except FileNotFoundError:
+        os.makedirs(TENANT_PENDING_DIR, exist_ok=True)
+        open(path, "a").close()
+
+
+def clear_pending(tenant_id):
+    try:
+        os.remove(os.path.join(TENANT_PENDING_DIR, tenant_id))
+    except FileNotFoundError:
+        pass
+
+
+def pending_tenants():
+    """İşareti olan kiracı kimlikleri; maliyet kiracı sayısıyla değil bekleyenlerle orantılı."""
+    try:
+        with os.scandir(TENANT_PENDING_DIR) as it:
+            return {entry.name for entry in it if _TENANT_ID.match(entry.name)}
+    except FileNotFoundError:
+        return set()
@@ -0,0 +1,235 @@
+# ai_client.py - OpenAI istemci havuzu, kalıcı yanıt önbelleği ve istek birleştirme
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+import openai
+
+CACHE_FILE = "data/openai_cache.sqlite3"
+# Önbellekteki yanıtın geçerlilik süresi (sn) ve en fazla kayıt sayısı
+CACHE_TTL = 24 * 60 * 60
+CACHE_MAX_ENTRIES = 1000
+
+# base_url başına tek istemci: bağlantı havuzu (httpx) çağrılar arasında paylaşılır
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(base_url=None) -> openai.OpenAI:
+    """Yeniden kullanılan OpenAI istemcisini döndürür (OPENAI_BASE_URL da dikkate alınır)."""
+    base_url = base_url or os.environ.get("OPENAI_BASE_URL")
+    with _clients_lock:
+        client = _clients.get(base_url)
+        if client is None:
+            client = _clients[base_url] = openai.OpenAI(base_url=base_url) if base_url else openai.OpenAI()
+        return client
+
+
+def cache_key(model, prompt, temperature, max_tokens):
+    raw = json.dumps([model, prompt, temperature, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite tabanlı kalıcı yanıt önbelleği. Kayıtlar `ttl` saniye sonra geçersiz
+    olur; kayıt sayısı `max_entries` değerini aşınca en uzun süredir
+    kullanılmayanlar silinir.
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, model TEXT, content TEXT, created REAL, accessed REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key, model, content):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedCompletionClient:
+    """
+    Sohbet tamamlama çağrıları için önbellekli istemci.
+
+    Aynı (model, prompt, temperature, max_tokens) için önbellekteki yanıt
+    döner; aynı anda gelen özdeş istekler tek bir üst akış çağrısında
+    birleştirilir.
+    """
+
+    def __init__(self, client=None, cache=None, base_url=None):
+        self.client = client or get_client(base_url)
+        self.cache = cache if cache is not None else ResponseCache()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.hit_latency = 0.0
+        self.upstream_latency = 0.0
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def complete(self, model, prompt, temperature=0.7, max_tokens=800):
+        """Yanıt metnini döndürür."""
+        started = time.perf_counter()
+        key = cache_key(model, prompt, temperature, max_tokens)
+
+        cached = self.cache.get(key)
+        # Boş yanıtlar önbelleğe yazılmaz; eskiden yazılmış boş kayıt da ıskalama sayılır
+        if cached:
+            with self._lock:
+                self.hits += 1
+                self.hit_latency += time.perf_counter() - started
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            # Önceki lider önbelleğe yazıp ayrılmış olabilir
+            content = self.cache.get(key)
+            if not content:
+                content = self._call_upstream(model, prompt, temperature, max_tokens)
+                if content:
+                    self.cache.put(key, model, content)
+            future.set_result(content)
+            return content
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stream(self, model, prompt, temperature=0.7, max_tokens=800):
+        """
+        Yanıtı metin parçaları halinde üretir. Önbellekte varsa tek parça
+        olarak döner; yoksa akış bitince tam yanıt (boş değilse) önbelleğe yazılır.
+        """
+        started = time.perf_counter()
+        key = cache_key(model, prompt, temperature, max_tokens)
+        cached = self.cache.get(key)
+        # Boş yanıtlar önbelleğe yazılmaz; eskiden yazılmış boş kayıt da ıskalama sayılır
+        if cached:
+            with self._lock:
+                self.hits += 1
+                self.hit_latency += time.perf_counter() - started
+            yield cached
+            return
+
+        with self._lock:
+            self.misses += 1
+        parts = []
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            )
+            for chunk in response:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    parts.append(text)
+                    yield text
+        finally:
+            with self._lock:
+                self.upstream_calls += 1
+                self.upstream_latency += time.perf_counter() - started
+        if parts:
+            self.cache.put(key, model, "".join(parts))
+
+    def _call_upstream(self, model, prompt, temperature, max_tokens):
+        started = time.perf_counter()
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            return response.choices[0].message.content
+        finally:
+            with self._lock:
+                self.upstream_calls += 1
+                self.upstream_latency += time.perf_counter() - started
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "upstream_calls": self.upstream_calls,
+            "avg_hit_ms": round(self.hit_latency / self.hits * 1000, 3) if self.hits else None,
+            "avg_upstream_ms": round(self.upstream_latency / self.upstream_calls * 1000, 3) if self.upstream_calls else None,
+            "cache_entries": len(self.cache)
+        }
+
+
+_completion_clients = {}
+_completion_lock = threading.Lock()
+
+
+def get_completion_client(base_url=None) -> CachedCompletionClient:
+    """Süreç içinde base_url başına paylaşılan önbellekli istemci."""
+    with _completion_lock:
+        client = _completion_clients.get(base_url)
+        if client is None:
+            client = _completion_clients[base_url] = CachedCompletionClient(base_url=base_url)
+        return client
@@ -4,6 +4,9 @@ import os
 import sys
 import json
 import io
+import time
+import random
+import asyncio
 import argparse
 from datetime import datetime
 import openai
@@ -35,6 +38,11 @@ except ImportError:
     print("Lütfen bu betiğin ve 'generate_ui.py'nin aynı ana klasörde olduğundan emin olun.")
     sys.exit(1)
 
+from ai_core.design_model import validate_design
+from ai_core.design_store import get_design_store
+from ai_dashboard.ai_client import get_completion_client
+from ai_dashboard.design_stream import stream_design
+
 # OpenAI API anahtarını ortam değişkeninden güvenli bir şekilde oku
 if "OPENAI_API_KEY" not in os.environ:
     print("❌ KRİTİK HATA: OPENAI_API_KEY ortam değişkeni tanımlı değil!")
@@ -47,23 +55,18 @@ openai.api_key = os.environ["OPENAI_API_KEY"]
 # 2. YARDIMCI FONKSİYONLAR
 # ==============================================================================
 
-def save_design_to_file(design_data: dict, base_dir: str = "data") -> str:
-    """Verilen tasarım sözlüğünü sıralı bir JSON dosyasına kaydeder."""
-    os.makedirs(base_dir, exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    file_name = f"tasarim-ai-{timestamp}.json"
-    file_path = os.path.join(base_dir, file_name)
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(design_data, f, indent=2, ensure_ascii=False)
-
-    # En son üretilen dosyanın adını 'latest.txt'ye yaz
-    latest_file_path = os.path.join(base_dir, "latest.txt")
-    with open(latest_file_path, "w", encoding="utf-8") as f:
-        f.write(file_name)
-
-    print(f"🎨 Yeni AI tasarım dosyası kaydedildi: {file_path}")
-    return file_path
+def save_design_to_file(design_data: dict) -> str:
+    """
+    Tasarımı doğrular, tasarım deposuna kaydeder ve son tasarımın açık
+    kopyasının (data/designs/latest.json) yolunu döndürür. Geçersiz tasarım
+    (DesignValidationError) hiçbir şey yazılmadan reddedilir.
+    """
+    validate_design(design_data)
+    store = get_design_store()
+    record = store.put(design_data, source="ai_designer")
+    note = f" (#{record['duplicate_of']} ile aynı içerik)" if record["duplicate_of"] else ""
+    print(f"🎨 Yeni AI tasarımı #{record['id']} depoya kaydedildi{note}: {store.latest_path}")
+    return store.latest_path
 
 def clean_ai_response(raw_response: str) -> dict:
     """AI'dan gelen ham metni temizleyip geçerli bir JSON sözlüğüne dönüştürür."""
@@ -87,22 +90,18 @@ def clean_ai_response(raw_response: str) -> dict:
 # 3. ANA İŞ MANTIĞI
 # ==============================================================================
 
-def generate_and_build_design(prompt: str, model_name: str):
+def generate_and_build_design(prompt: str, model_name: str, base_url: str = None):
     """
     OpenAI API'sini kullanarak bir tasarım üretir, kaydeder ve bu tasarımdan
-    HTML/CSS arayüzünü oluşturur.
+    HTML/CSS arayüzünü oluşturur. Aynı istek daha önce yanıtlandıysa yanıt
+    önbellekten gelir.
     """
     print("🤖 OpenAI API'ye istek gönderiliyor...")
     try:
-        client = openai.OpenAI() # En güncel API kullanımı için client oluştur
-        response = client.chat.completions.create(
-            model=model_name,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=800,
-            temperature=0.7
-        )
-        raw_content = response.choices[0].message.content
-        print("✅ Yanıt alındı.")
+        # Havuzlanmış istemci + kalıcı yanıt önbelleği (bkz. ai_client.py)
+        client = get_completion_client(base_url)
+        raw_content = client.complete(model_name, prompt, temperature=0.7, max_tokens=800)
+        print(f"✅ Yanıt alındı. (önbellek: {client.stats()})")
         
         design = clean_ai_response(raw_content)
         design_file_path = save_design_to_file(design)
@@ -119,8 +118,174 @@ def generate_and_build_design(prompt: str, model_name: str):
     except Exception as e:
         print(f"❌ Ana süreçte bir hata oluştu: {e}")
 
+def stream_and_build_design(prompt: str, model_name: str, base_url: str = None):
+    """
+    Yanıtı akış halinde alır; her bileşen tamamlandıkça ekrana yazar, akış
+    bitince tasarımı kaydedip arayüzü oluşturur.
+    """
+    print("🤖 OpenAI API'ye akış isteği gönderiliyor...")
+    try:
+        for event in stream_design(prompt, model_name, base_url=base_url):
+            if event["event"] == "component":
+                component = event["component"]
+                print(f"🧩 [{event['elapsed']:.2f} sn] {component.get('type')}: "
+                      f"{component.get('title') or component.get('label')}")
+                continue
+            stats = event["stats"]
+            print(f"✅ Akış tamamlandı: ilk bileşen {stats['time_to_first_component']} sn, "
+                  f"toplam {stats['total_time']} sn ({stats['components']} bileşen)")
+            design_file_path = save_design_to_file(event["design"])
+            generate_ui_from_design(
+                design_file_path=design_file_path,
+                output_html_path="templates/generated_ui.html",
+                output_css_path="static/css/generated_ui.css"
+            )
+            print("🚀 Yeni UI başarıyla oluşturuldu ve sunulmaya hazır.")
+
+    except openai.APIError as e:
+        print(f"❌ OpenAI API Hatası: {e}")
+    except Exception as e:
+        print(f"❌ Ana süreçte bir hata oluştu: {e}")
+
+# ==============================================================================
+# 4. TOPLU (BATCH) ÜRETİM
+# ==============================================================================
+
+BATCH_OUTPUT_FILE = "data/batch_designs.jsonl"
+BATCH_CONCURRENCY = 8
+# Hız sınırı / geçici hatalarda üstel geri çekilme
+BATCH_MAX_RETRIES = 6
+BATCH_BACKOFF_BASE = 1.0
+BATCH_BACKOFF_MAX = 30.0
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+def load_batch_prompts(path: str) -> list:
+    """
+    JSONL dosyasından (id, prompt) listesi okur. Satırlar {"id", "prompt"} ya da
+    requests.jsonl biçiminde {"request_id", "title", "body"} olabilir.
+    """
+    items, seen = [], set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            prompt_id = str(record.get("id") or record.get("request_id") or line_no)
+            prompt = record.get("prompt") or "\n\n".join(filter(None, [record.get("title"), record.get("body")]))
+            if prompt_id not in seen and prompt:
+                seen.add(prompt_id)
+                items.append((prompt_id, prompt))
+    return items
+
+def load_completed_ids(output_path: str) -> set:
+    """Çıktı dosyasında başarıyla tamamlanmış prompt id'lerini döndürür."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # çökme sırasında yarım kalmış satır
+            if "design" in record:
+                done.add(record["id"])
+    return done
+
+def _retry_delay(error, attempt: int) -> float:
+    """Üstel geri çekilme (jitter ile); sunucu Retry-After verdiyse ondan kısa olmaz."""
+    retry_after = 0.0
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            retry_after = float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+    backoff = min(BATCH_BACKOFF_MAX, BATCH_BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+    return max(backoff, retry_after)
+
+async def _generate_one(client, semaphore, prompt_id, prompt, model_name, stats):
+    """Tek prompt'u üretir; (id, tasarım, süre, hata) döndürür."""
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            for attempt in range(BATCH_MAX_RETRIES + 1):
+                try:
+                    response = await client.chat.completions.create(
+                        model=model_name,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=800,
+                        temperature=0.7
+                    )
+                    break
+                except RETRYABLE_ERRORS as e:
+                    if attempt == BATCH_MAX_RETRIES:
+                        raise
+                    stats["retries"] += 1
+                    await asyncio.sleep(_retry_delay(e, attempt))
+            design = clean_ai_response(response.choices[0].message.content)
+            return prompt_id, design, time.perf_counter() - started, None
+        except Exception as e:
+            return prompt_id, None, time.perf_counter() - started, str(e)
+
+async def run_batch(input_path: str, output_path: str = BATCH_OUTPUT_FILE, model_name: str = "gpt-4o-mini",
+                    concurrency: int = BATCH_CONCURRENCY, base_url: str = None) -> dict:
+    """
+    Prompt'ları en fazla `concurrency` eşzamanlı istekle üretir. Her sonuç
+    biter bitmez çıktı JSONL dosyasına eklenir; yeniden çalıştırıldığında
+    tamamlanmış id'ler atlanır (başarısız olanlar yeniden denenir).
+    """
+    items = load_batch_prompts(input_path)
+    completed = load_completed_ids(output_path)
+    pending = [(prompt_id, prompt) for prompt_id, prompt in items if prompt_id not in completed]
+    stats = {"total": len(items), "skipped": len(items) - len(pending), "succeeded": 0, "failed": 0, "retries": 0}
+    print(f"📦 Toplu üretim: {len(pending)} prompt ({stats['skipped']} tamamlanmış atlandı), eşzamanlılık {concurrency}")
+
+    folder = os.path.dirname(output_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    # Yarım kalmış son satır varsa yeni kayıtlar ayrı satırda başlasın
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        with open(output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+        if needs_newline:
+            with open(output_path, "ab") as f:
+                f.write(b"\n")
+
+    client = openai.AsyncOpenAI(base_url=base_url, max_retries=0) if base_url else openai.AsyncOpenAI(max_retries=0)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    started = time.perf_counter()
+    try:
+        with open(output_path, "a", encoding="utf-8") as out:
+            tasks = [
+                asyncio.create_task(_generate_one(client, semaphore, prompt_id, prompt, model_name, stats))
+                for prompt_id, prompt in pending
+            ]
+            for task in asyncio.as_completed(tasks):
+                prompt_id, design, elapsed, error = await task
+                record = {"id": prompt_id, "model": model_name, "elapsed": round(elapsed, 3),
+                          "timestamp": datetime.now().isoformat()}
+                if error is None:
+                    record["design"] = design
+                    stats["succeeded"] += 1
+                    print(f"✅ {prompt_id} ({elapsed:.2f} sn)")
+                else:
+                    record["error"] = error
+                    stats["failed"] += 1
+                    print(f"❌ {prompt_id}: {error}")
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        await client.close()
+
+    stats["elapsed"] = round(time.perf_counter() - started, 3)
+    print(f"📈 Toplu üretim bitti: {stats} -> {output_path}")
+    return stats
+
 # ==============================================================================
-# 4. BETİĞİN GİRİŞ NOKTASI VE KOMUT SATIRI ARGÜMANLARI
+# 5. BETİĞİN GİRİŞ NOKTASI VE KOMUT SATIRI ARGÜMANLARI
 # ==============================================================================
 
 def main():
@@ -142,9 +307,22 @@ def main():
     parser = argparse.ArgumentParser(description="OpenAI kullanarak dinamik web arayüz tasarımları üretir.")
     parser.add_argument("-p", "--prompt", type=str, default=default_prompt, help="Tasarım üretimi için AI'ya verilecek olan prompt metni.")
     parser.add_argument("-m", "--model", type=str, default="gpt-4o-mini", help="Kullanılacak OpenAI modelinin adı.")
+    parser.add_argument("--base-url", type=str, default=None, help="OpenAI uyumlu API adresi (ör. yerel test sunucusu).")
+    parser.add_argument("--stream", action="store_true", help="Yanıtı akış halinde al ve bileşenleri geldikçe göster.")
+    parser.add_argument("--batch", type=str, default=None, help="Prompt'ları içeren JSONL dosyası (toplu üretim modu).")
+    parser.add_argument("--out", type=str, default=BATCH_OUTPUT_FILE, help="Toplu üretim sonuçlarının yazılacağı JSONL dosyası.")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Aynı anda gönderilecek en fazla istek.")
     args = parser.parse_args()
 
-    generate_and_build_design(prompt=args.prompt, model_name=args.model)
+    if args.batch:
+        asyncio.run(run_batch(args.batch, args.out, model_name=args.model,
+                              concurrency=args.concurrency, base_url=args.base_url))
+        return
+    if args.stream:
+        stream_and_build_design(prompt=args.prompt, model_name=args.model, base_url=args.base_url)
+        return
+
+    generate_and_build_design(prompt=args.prompt, model_name=args.model, base_url=args.base_url)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
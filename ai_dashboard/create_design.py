@@ -1,7 +1,9 @@
-import json
-import os
 import random
 from datetime import datetime
+
+from ai_core.activity_log import ACTIVITY_DESIGN, record_activity
+from ai_core.design_store import get_design_store
+from ai_core.tenant import get_tenant
 from generate_ui import generate_ui_from_design
 
 # Sadece açık renk paletleri
@@ -41,53 +43,39 @@ BUTTONS = [
     {"text": "Kaydet", "action": "#"}
 ]
 
-COUNTER_FILE = "data/design_counter.txt"
-
-def get_next_design_name():
-    os.makedirs("data", exist_ok=True)
-    count = 1
-    if os.path.exists(COUNTER_FILE):
-        with open(COUNTER_FILE, "r", encoding="utf-8") as f:
-            try:
-                count = int(f.read().strip()) + 1
-            except:
-                count = 1
-    with open(COUNTER_FILE, "w", encoding="utf-8") as f:
-        f.write(str(count))
-    return f"tasarim-{count}.json"
+def build_random_design(rng=random):
+    """Rastgele bir tasarım sözlüğü üretir; diske hiçbir şey yazmaz."""
+    palette = rng.choice(COLOR_PALETTES)
+    selected_cards = rng.sample(CARDS, 3)
+    selected_buttons = rng.sample(BUTTONS, 2)
 
-def create_design_json():
-    """Yeni tasarımı oluştur ve JSON+HTML kaydet."""
-    palette = random.choice(COLOR_PALETTES)
-    selected_cards = random.sample(CARDS, 3)
-    selected_buttons = random.sample(BUTTONS, 2)
-
-    design = {
-        "title": random.choice(TITLES),
-        "header": random.choice(HEADERS),
-        "description": f"{random.choice(DESCRIPTIONS)} ({datetime.now().strftime('%H:%M:%S')})",
+    return {
+        "title": rng.choice(TITLES),
+        "header": rng.choice(HEADERS),
+        "description": f"{rng.choice(DESCRIPTIONS)} ({datetime.now().strftime('%H:%M:%S')})",
         "background": palette["background"],
         "color": palette["color"],
         "cards": [{"title": t, "content": c} for t, c in selected_cards],
         "buttons": selected_buttons
     }
 
-    # Dosya ismi
-    file_name = get_next_design_name()
-    file_path = os.path.join("data", file_name)
-
-    # JSON kaydet
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(design, f, indent=2, ensure_ascii=False)
+def create_design_json(tenant=None):
+    """Yeni tasarımı oluştur ve kiracının deposuna JSON, çıktı hedeflerine HTML/CSS olarak kaydet."""
+    design = build_random_design()
 
-    # latest.txt güncelle
-    with open("data/latest.txt", "w", encoding="utf-8") as f:
-        f.write(file_name)
+    # Depoya kaydet (id, latest.txt ve latest.json depo kilidi altında güncellenir)
+    store = get_design_store(tenant)
+    record = store.put(design, source="create_design")
+    file_path = store.latest_path
 
-    print(f"Yeni tasarım dosyası: {file_path}")
+    print(f"Yeni tasarım #{record['id']} kaydedildi: {file_path}")
+    if get_tenant(tenant).is_default:
+        record_activity(ACTIVITY_DESIGN, f"Yeni tasarım #{record['id']}: {record['title']}",
+                        design_id=record["id"], hash=record["hash"])
 
     # HTML/CSS üret
-    generate_ui_from_design(design_file_path=file_path)
+    generate_ui_from_design(design_file_path=file_path, tenant=tenant)
+    return record
 
 if __name__ == "__main__":
     create_design_json()
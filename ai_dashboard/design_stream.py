@@ -0,0 +1,130 @@
+# design_stream.py - Akış halinde gelen tasarım JSON'unun artımlı ayrıştırılması
+
+import json
+import time
+
+from ai_dashboard.ai_client import get_completion_client
+
+
+class IncrementalDesignParser:
+    """
+    Parça parça gelen model çıktısından `components` dizisinin elemanlarını,
+    her nesne kapanır kapanmaz çıkarır.
+
+    Metin karakter karakter bir kez taranır (dize/kaçış durumu ve parantez
+    yığını tutulur), yani toplam maliyet çıktı uzunluğuyla doğrusaldır.
+    ```json bloğu gibi JSON öncesi metinler ilk '{' görülene kadar yok sayılır.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_key = None
+        self._in_components = False
+        self._component_start = None
+        self.components = []
+
+    def feed(self, text):
+        """Yeni metin parçasını işler; bu parçayla tamamlanan bileşenleri döndürür."""
+        self.buffer += text
+        completed = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        # Kök nesnedeki son dize; ardından ':' gelirse anahtardır
+                        self._last_key = buffer[self._string_start + 1:i]
+                continue
+
+            if not self._stack and ch != "{":
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if ch == "[" and len(self._stack) == 1 and self._last_key == "components":
+                    self._in_components = True
+                elif ch == "{" and self._in_components and len(self._stack) == 2:
+                    self._component_start = i
+                self._stack.append(ch)
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if ch == "}" and self._component_start is not None and len(self._stack) == 2:
+                    component = self._parse(buffer[self._component_start:i + 1])
+                    self._component_start = None
+                    if component is not None:
+                        self.components.append(component)
+                        completed.append(component)
+                elif ch == "]" and self._in_components and len(self._stack) == 1:
+                    self._in_components = False
+            elif ch == "," and len(self._stack) == 1:
+                self._last_key = None
+        self._pos = len(buffer)
+        return completed
+
+    @staticmethod
+    def _parse(text):
+        try:
+            component = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return component if isinstance(component, dict) else None
+
+    def result(self):
+        """Tam tasarımı döndürür; bütün JSON çözülemezse çıkarılan bileşenlerle yetinir."""
+        start = self.buffer.find("{")
+        end = self.buffer.rfind("}") + 1
+        if start != -1 and end > start:
+            try:
+                return json.loads(self.buffer[start:end])
+            except json.JSONDecodeError:
+                pass
+        if not self.components:
+            raise ValueError("Akış içinde geçerli bir tasarım bulunamadı.")
+        return {"components": list(self.components)}
+
+
+def stream_design(prompt, model_name, base_url=None, temperature=0.7, max_tokens=800):
+    """
+    Tasarımı akış halinde üretir ve olay sözlükleri üretir:
+      {"event": "component", "component": ..., "index": n, "elapsed": sn}
+      {"event": "done", "design": ..., "stats": {...}}
+    İlk bileşen süresi (time_to_first_component) ile toplam süre stats'ta yer alır.
+    """
+    started = time.perf_counter()
+    parser = IncrementalDesignParser()
+    first_component = None
+    chunks = 0
+    client = get_completion_client(base_url)
+    for text in client.stream(model_name, prompt, temperature=temperature, max_tokens=max_tokens):
+        chunks += 1
+        for component in parser.feed(text):
+            elapsed = time.perf_counter() - started
+            if first_component is None:
+                first_component = elapsed
+            yield {"event": "component", "component": component,
+                   "index": len(parser.components) - 1, "elapsed": round(elapsed, 4)}
+
+    total = time.perf_counter() - started
+    yield {
+        "event": "done",
+        "design": parser.result(),
+        "stats": {
+            "components": len(parser.components),
+            "chunks": chunks,
+            "time_to_first_component": round(first_component, 4) if first_component is not None else None,
+            "total_time": round(total, 4)
+        }
+    }
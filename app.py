@@ -1,10 +1,65 @@
-from flask import Flask, render_template, request, g, make_response, redirect, url_for
+from flask import Flask, render_template, request, g, make_response, redirect, url_for, jsonify, Response, stream_with_context, send_from_directory, session
 import os
-import random
+import json
+import secrets
+import threading
+import time
+from collections import deque
+from ai_core.activity_log import get_activity_feed
+from ai_core.design_store import get_design_store
+from ai_core.feedback_manager import save_feedback
+from ai_core.tenant import TenantContext, get_tenant
+from generate_ui import get_latest_design_file, render_component
+from ai_dashboard.design_stream import stream_design
+from theme_registry import ThemeRegistry
+from page_cache import RenderedPageCache
+from design_pool import DesignPool
+from design_patch import DesignPatcher
 
 app = Flask(__name__)
 app.config.from_pyfile('config.py')
 
+# Temalar başlangıçta bir kez taranır; sonrasında yalnızca TTL dolunca değişiklik kontrol edilir
+theme_registry = ThemeRegistry()
+THEME_COOKIE_MAX_AGE = 30*24*60*60
+
+# Üretilmiş arayüz sayfaları (tasarım özeti, tema) anahtarıyla bellekte tutulur
+page_cache = RenderedPageCache()
+# HTML her istekte ETag ile doğrulanır; CSS adı içerik özeti taşıdığı için değişmez
+GENERATED_UI_CACHE_CONTROL = "no-cache"
+GENERATED_CSS_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# "Yeniden Oluştur" isteği önceden render edilmiş tasarım havuzundan karşılanır
+# (üretici ilk istekte başlar; uygulamayı içe aktarmak iş parçacığı başlatmaz)
+design_pool = DesignPool()
+# Akış halinde tasarım üretiminde kullanılan model; ücretli olduğu için
+# istemci seçemez, yalnızca sunucuda değiştirilir
+DESIGN_STREAM_MODEL = "gpt-4o-mini"
+# Her çağrı ücretli bir tamamlama başlatır: yalnızca /design_stream sayfasının
+# oturumuna verilen belirteçle, istemci (IP) başına pencere içinde sınırlı
+# sayıda ve kısa prompt'larla çağrılabilir. Sınır süreç başınadır.
+DESIGN_STREAM_MAX_PROMPT = 500
+DESIGN_STREAM_RATE_LIMIT = 5
+DESIGN_STREAM_RATE_WINDOW = 60.0
+_design_stream_calls = {}
+_design_stream_lock = threading.Lock()
+
+
+def _current_design(digest):
+    """Diskteki güncel tasarım, özeti istenenle aynıysa (yama tabanı olarak)."""
+    try:
+        design, current = page_cache.load_design(get_latest_design_file())
+    except FileNotFoundError:
+        return None
+    return design if current == digest else None
+
+
+# Yeniden oluşturmada istemcinin sayfası tam HTML yerine DOM yamasıyla güncellenir
+design_patcher = DesignPatcher(resolve=_current_design)
+# Etkinlik listesi sayfa boyutu ve akışta bağlantıyı canlı tutan yorum satırı aralığı (sn)
+ACTIVITY_PAGE_SIZE = 20
+ACTIVITY_PAGE_MAX = 100
+ACTIVITY_STREAM_HEARTBEAT = 15.0
+
 # Tema yükleme fonksiyonu
 def load_theme(theme_name='default'):
     theme_path = os.path.join('themes', theme_name)
@@ -14,25 +69,34 @@ def load_theme(theme_name='default'):
     }
 
 
-def get_recent_activities():
-    """Return a list of recent activities for the dashboard."""
-    return []
+def get_recent_activities(limit=ACTIVITY_PAGE_SIZE):
+    """Panel için son etkinlikler (en yeni önce); bellekteki halkadan, geçmiş taranmadan."""
+    return get_activity_feed().recent(limit=limit)
 
 # Tema seçimi middleware'i
 @app.before_request
 def set_theme():
-    themes = [
-        d for d in os.listdir("static/themes")
-        if os.path.isdir(os.path.join("static/themes", d))
-    ]
-    selected_theme = random.choice(themes)
+    # Statik dosyalar tema bilgisine ihtiyaç duymaz
+    if request.endpoint == 'static':
+        return
+    requested = request.cookies.get('theme')
+    selected_theme = theme_registry.resolve(requested)
     g.theme = selected_theme
-    g.theme_config = load_theme(selected_theme)
+    g.theme_config = theme_registry.get(selected_theme) or load_theme(selected_theme)
+    # Çerezde geçerli tema yoksa seçilen temayı kalıcı yap
+    g.persist_theme = requested != selected_theme
+
+@app.after_request
+def persist_theme(response):
+    cookies = response.headers.getlist('Set-Cookie')
+    if g.get('persist_theme') and not any(c.startswith('theme=') for c in cookies):
+        response.set_cookie('theme', g.theme, max_age=THEME_COOKIE_MAX_AGE)
+    return response
 
 # Dinamik template loader
 @app.context_processor
 def inject_theme():
-    return dict(theme=g.theme)
+    return dict(theme=g.get('theme', 'default'))
 
 @app.route("/")
 def index():
@@ -41,7 +105,7 @@ def index():
 @app.route('/change_theme/<theme_name>')
 def change_theme(theme_name):
     response = make_response(redirect(request.referrer or url_for('index')))
-    response.set_cookie('theme', theme_name, max_age=30*24*60*60)
+    response.set_cookie('theme', theme_name, max_age=THEME_COOKIE_MAX_AGE)
     return response
 
 @app.route('/dashboard')
@@ -52,3 +116,233 @@ def dashboard():
                            activities=get_recent_activities())
     else:
         return render_template(f'themes/{theme}/dashboard.html')
+
+def _existing_tenant(tenant_id):
+    """Kiracı bağlamı; yalnızca klasörü önceden oluşturulmuş kiracılar kabul edilir (yoksa None)."""
+    candidate = TenantContext(str(tenant_id))
+    if not candidate.is_default and not os.path.isdir(candidate.root):
+        return None
+    return get_tenant(candidate.tenant_id)
+
+@app.route('/feedback', methods=['POST'])
+def feedback():
+    payload = request.get_json(silent=True) or {}
+    if "approved" not in payload:
+        return jsonify(status="error", message="'approved' alanı zorunludur."), 400
+    # İsteğe bağlı kiracı
+    tenant = None
+    if payload.get("tenant"):
+        try:
+            tenant = _existing_tenant(payload["tenant"])
+        except ValueError as e:
+            return jsonify(status="error", message=str(e)), 400
+        if tenant is None:
+            return jsonify(status="error", message="Kiracı bulunamadı."), 404
+    # Geri bildirim, depodaki son tasarımın kalıcı kimliğine bağlanır
+    record = get_design_store(tenant).latest_record()
+    if record:
+        design = record.get("name") or f"tasarim-{record['id']}"
+    else:
+        try:
+            design = os.path.basename(get_latest_design_file(tenant))
+        except FileNotFoundError:
+            design = None
+    save_feedback({
+        "approved": bool(payload["approved"]),
+        "comments": str(payload.get("comments", "")),
+        "design": design
+    }, tenant=tenant)
+    return jsonify(status="ok")
+
+@app.route('/generated_ui')
+def generated_ui():
+    try:
+        page = page_cache.get_page(g.theme)
+    except FileNotFoundError as e:
+        return render_template('hata.html', hata_kodu=404, hata_mesajı=str(e)), 404
+
+    if page.etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response = make_response(page.html)
+    response.set_etag(page.etag)
+    response.headers['Cache-Control'] = GENERATED_UI_CACHE_CONTROL
+    response.vary.add('Cookie')
+    return response
+
+@app.route('/generated_ui/<digest>.css')
+def generated_ui_css(digest):
+    css = page_cache.find_css(digest) or design_pool.find_css(digest)
+    if css is None:
+        try:
+            if page_cache.current_digest() == digest:
+                css = page_cache.get_page(g.theme).css
+        except FileNotFoundError:
+            pass
+    if css is None:
+        return render_template('hata.html', hata_kodu=404, hata_mesajı="Stil dosyası bulunamadı."), 404
+
+    if digest in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response = make_response(css)
+        response.mimetype = 'text/css'
+    response.set_etag(digest)
+    response.headers['Cache-Control'] = GENERATED_CSS_CACHE_CONTROL
+    return response
+
+# Kiracının üretilmiş sayfası ve statik dosyaları (generate_ui bu adreslere bağlar)
+@app.route('/t/<tenant_id>/')
+def tenant_generated_ui(tenant_id):
+    try:
+        tenant = _existing_tenant(tenant_id)
+    except ValueError:
+        tenant = None
+    if tenant is None or not os.path.exists(tenant.output_html):
+        return render_template('hata.html', hata_kodu=404, hata_mesajı="Kiracı sayfası bulunamadı."), 404
+    response = send_from_directory(os.path.abspath(os.path.dirname(tenant.output_html)),
+                                   os.path.basename(tenant.output_html))
+    response.headers['Cache-Control'] = GENERATED_UI_CACHE_CONTROL
+    return response
+
+@app.route('/t/<tenant_id>/static/<path:filename>')
+def tenant_static(tenant_id, filename):
+    try:
+        tenant = _existing_tenant(tenant_id)
+    except ValueError:
+        tenant = None
+    if tenant is None:
+        return render_template('hata.html', hata_kodu=404, hata_mesajı="Kiracı bulunamadı."), 404
+    # send_from_directory klasör dışına çıkan yolları reddeder
+    return send_from_directory(os.path.abspath(tenant.path("static")), filename)
+
+@app.route('/api/regenerate_ui', methods=['POST'])
+def api_regenerate_ui():
+    """
+    Havuzdan hazır bir tasarım alır; istek yolunda üretim/disk yazması yapılmaz (ıskalama hariç).
+    İstemci gösterdiği tasarımın özetini (`base`) gönderirse ve sunucu o tasarımı
+    biliyorsa yalnızca DOM yaması (`mode="patch"`), aksi halde tam HTML döner.
+    """
+    payload = request.get_json(silent=True) or {}
+    base = payload.get("base")
+    try:
+        entry = design_pool.take()
+        patch = design_patcher.patch(base if isinstance(base, str) else None, entry.digest, entry.design, entry.html)
+    except Exception as e:
+        return jsonify(status="error", message=str(e)), 500
+    if patch is not None:
+        return jsonify(status="ok", mode="patch", **patch)
+    return jsonify(status="ok", mode="full", html=entry.html, digest=entry.digest)
+
+@app.route('/api/design_pool/stats')
+def api_design_pool_stats():
+    return jsonify({**design_pool.stats(), "patch": design_patcher.stats()})
+
+def _sse(event, data, event_id=None):
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _int_arg(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+@app.route('/api/activities')
+def api_activities():
+    """Son etkinlikler, en yeni önce; `before` imleciyle sayfalanır (`next` bir sonraki sayfa)."""
+    limit = max(1, min(_int_arg(request.args.get('limit'), ACTIVITY_PAGE_SIZE), ACTIVITY_PAGE_MAX))
+    activities = get_activity_feed().recent(
+        limit=limit, before=_int_arg(request.args.get('before')), kind=request.args.get('kind') or None
+    )
+    next_cursor = activities[-1]["id"] if len(activities) == limit else None
+    return jsonify(activities=activities, next=next_cursor)
+
+@app.route('/api/activities/stream')
+def api_activities_stream():
+    """Yeni etkinlikleri SSE ile iletir; yeniden bağlanan istemci Last-Event-ID'den devam eder."""
+    feed = get_activity_feed()
+    last = _int_arg(request.headers.get('Last-Event-ID') or request.args.get('after'))
+    if last is None:
+        last = feed.last_id()
+
+    def events():
+        cursor = last
+        # Başlıklar hemen gönderilsin (vekil sunucular ve istemci bağlantıyı açık görsün)
+        yield ": bağlandı\n\n"
+        while True:
+            activities = feed.wait(cursor, timeout=ACTIVITY_STREAM_HEARTBEAT)
+            if not activities:
+                yield ": ping\n\n"
+                continue
+            for activity in activities:
+                cursor = activity["id"]
+                yield _sse("activity", activity, event_id=activity["id"])
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def _design_stream_retry_after(client):
+    """İstemci sınırı aştıysa beklemesi gereken süre (sn), aşmadıysa None (çağrı sayılır)."""
+    now = time.monotonic()
+    with _design_stream_lock:
+        calls = _design_stream_calls.setdefault(client, deque())
+        while calls and now - calls[0] >= DESIGN_STREAM_RATE_WINDOW:
+            calls.popleft()
+        if len(calls) >= DESIGN_STREAM_RATE_LIMIT:
+            return DESIGN_STREAM_RATE_WINDOW - (now - calls[0])
+        calls.append(now)
+        # Boşalan istemciler silinir; sözlük yalnızca son penceredeki istemcileri tutar
+        for key in [k for k, v in _design_stream_calls.items() if v and now - v[-1] >= DESIGN_STREAM_RATE_WINDOW]:
+            del _design_stream_calls[key]
+        return None
+
+@app.route('/design_stream')
+def design_stream_page():
+    # Akış API'si yalnızca bu sayfanın oturumundaki belirteçle çağrılabilir
+    if 'stream_token' not in session:
+        session['stream_token'] = secrets.token_urlsafe(16)
+    return render_template('design_stream.html', stream_token=session['stream_token'],
+                           max_prompt=DESIGN_STREAM_MAX_PROMPT)
+
+@app.route('/api/design_stream')
+def api_design_stream():
+    """
+    Tasarımı akış halinde üretir; her bileşen hazır oldukça SSE ile HTML parçası gönderilir.
+    Aynı kaynaktan, oturum belirteciyle ve istemci başına hız sınırı içinde çağrılmalıdır.
+    """
+    token = session.get('stream_token')
+    if (not token or not secrets.compare_digest(token, request.args.get('token', ''))
+            or request.headers.get('Sec-Fetch-Site', 'same-origin') != 'same-origin'):
+        return jsonify(status="error", message="Geçersiz oturum."), 403
+    prompt = request.args.get('prompt', '').strip()
+    if not prompt:
+        return jsonify(status="error", message="prompt parametresi gerekli"), 400
+    if len(prompt) > DESIGN_STREAM_MAX_PROMPT:
+        return jsonify(status="error", message=f"prompt en fazla {DESIGN_STREAM_MAX_PROMPT} karakter olabilir"), 400
+    retry_after = _design_stream_retry_after(request.remote_addr)
+    if retry_after is not None:
+        response = jsonify(status="error", message="Çok fazla istek; biraz sonra tekrar deneyin.")
+        response.headers['Retry-After'] = str(int(retry_after) + 1)
+        return response, 429
+
+    def events():
+        try:
+            for event in stream_design(prompt, DESIGN_STREAM_MODEL):
+                if event["event"] == "component":
+                    yield _sse("component", {
+                        "index": event["index"],
+                        "elapsed": event["elapsed"],
+                        "html": render_component(event["component"])
+                    })
+                else:
+                    yield _sse("done", {"design": event["design"], "stats": event["stats"]})
+        except Exception as e:
+            yield _sse("error", {"message": str(e)})
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
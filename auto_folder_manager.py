@@ -1,11 +1,19 @@
 import os
 import json
+import errno
 import shutil
 import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from generate_ui import generate_ui_from_design
+from ai_core.activity_log import ACTIVITY_FILE, record_activity
+from ai_core.design_store import DESIGN_STORE_DIR
+from ai_core.file_manifest import FileManifest
+from ai_core.tenant import TENANTS_ROOT
 
 # --- 1. Klasör yapısı tanımı ---
 def get_folder_structure():
@@ -65,69 +73,452 @@ def create_folders(base_path="."):
     return created
 
 # --- 5. Dosyaları oluştur ---
+# Yönetilen dosyaların listesi (yol, boyut, mtime, özet, hedef); ilk kullanımda açılır
+_manifest = None
+
+
+def get_manifest():
+    global _manifest
+    if _manifest is None:
+        _manifest = FileManifest()
+    return _manifest
+
+
 def create_files():
+    """Varsayılan dosyaları yazar; içeriği değişmemiş olanlar yeniden yazılmaz."""
+    manifest = get_manifest()
     files = get_default_files()
     created_files = []
     for path, content in files.items():
-        folder = os.path.dirname(path)
-        if folder and folder.strip():
-            os.makedirs(folder, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
+        data = content.encode("utf-8")
+        if not manifest.content_matches(path, data):
+            folder = os.path.dirname(path)
+            if folder and folder.strip():
+                os.makedirs(folder, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        manifest.record(path, route="default", data=data)
         created_files.append(path)
     return created_files
 
 # --- 6. Dosya taşıma ---
+# Oluşturulduğu bilinen hedef klasörler (her dosyada makedirs yapılmasın)
+_known_dirs = set()
+
+
+def _ensure_dir(path):
+    if path not in _known_dirs:
+        os.makedirs(path, exist_ok=True)
+        _known_dirs.add(path)
+
+
+def _move(src, dst, overwrite=False):
+    """Aynı dosya sisteminde tek bir rename; farklı cihazlar arasında kopyala+sil."""
+    try:
+        if overwrite:
+            os.replace(src, dst)
+        else:
+            os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+
 def auto_organize_file(file_path):
     ext = os.path.splitext(file_path)[1].lower()
     target = FILE_ROUTING.get(ext)
     if not target:
         return None
-    os.makedirs(target, exist_ok=True)
+    _ensure_dir(target)
     filename = os.path.basename(file_path)
     new_path = os.path.join(target, filename)
     if os.path.abspath(file_path) != os.path.abspath(new_path):
-        shutil.move(file_path, new_path)
+        _move(file_path, new_path, overwrite=True)
+        get_manifest().record_moves([(file_path, new_path, target, os.stat(new_path))])
+        record_activity(ACTIVITY_FILE, f"{filename} ➜ {target}", src=file_path, dst=new_path)
     return new_path
 
+# --- 6b. Toplu yerleştirme ---
+ORGANIZE_WORKERS = 8
+ORGANIZE_PLAN_FILE = "logs/organize_plan.jsonl"
+# Taramada hiç inilmeyen klasörler
+SKIPPED_SCAN_DIRS = {".git", "__pycache__", ".venv", "venv", "node_modules"}
+
+
+def scan_files(source_dir, recursive=True, skip_dirs=()):
+    """os.scandir ile dosya yollarını üretir (sembolik bağlar izlenmez)."""
+    skip_dirs = {os.path.abspath(d) for d in skip_dirs}
+    stack = [source_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        yield entry.path
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        if entry.name in SKIPPED_SCAN_DIRS or os.path.abspath(entry.path) in skip_dirs:
+                            continue
+                        stack.append(entry.path)
+        except OSError as e:
+            print(f"⚠️  Klasör okunamadı: {current} ({e})")
+
+
+def _unique_name(name, taken):
+    """Hedefte alınmış isimlerle çakışmayan 'ad-1.uzantı' biçiminde bir isim döndürür."""
+    if name not in taken:
+        return name
+    stem, ext = os.path.splitext(name)
+    counter = 1
+    while f"{stem}-{counter}{ext}" in taken:
+        counter += 1
+    return f"{stem}-{counter}{ext}"
+
+
+def plan_moves(source_dir, base_path=".", recursive=True, on_conflict="rename"):
+    """
+    Kaynak klasördeki dosyalar için taşıma planı çıkarır; diske dokunmaz.
+    (plan, taranan_dosya_sayısı) döndürür; plan [{"src", "dst", "conflict"}] listesidir. `on_conflict`: rename
+    (ad-1.uzantı), skip (taşıma) ya da overwrite (hedefin üzerine yaz).
+    """
+    targets = {ext: os.path.abspath(os.path.join(base_path, folder)) for ext, folder in FILE_ROUTING.items()}
+    routes = {target: FILE_ROUTING[ext] for ext, target in targets.items()}
+    taken = {}  # hedef klasör -> kullanılan isimler (mevcut dosyalar + plandakiler)
+    plan = []
+    scanned = 0
+    for path in scan_files(source_dir, recursive=recursive, skip_dirs=set(targets.values())):
+        scanned += 1
+        name = os.path.basename(path)
+        target = targets.get(os.path.splitext(name)[1].lower())
+        if target is None or name.startswith(IGNORED_PREFIXES) or name.endswith(IGNORED_SUFFIXES):
+            continue
+        if os.path.dirname(os.path.abspath(path)) == target:
+            continue
+        if target not in taken:
+            taken[target] = set(os.listdir(target)) if os.path.isdir(target) else set()
+        names = taken[target]
+        conflict = name in names
+        if conflict and on_conflict == "skip":
+            plan.append({"src": path, "dst": None, "route": routes[target], "conflict": True})
+            continue
+        if conflict and on_conflict == "rename":
+            name = _unique_name(name, names)
+        names.add(name)
+        plan.append({"src": path, "dst": os.path.join(target, name), "route": routes[target], "conflict": conflict})
+    return plan, scanned
+
+
+def write_plan(plan, path=ORGANIZE_PLAN_FILE):
+    """Planı JSONL olarak yazar (kuru çalıştırma çıktısı)."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for item in plan:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+    return path
+
+
+def execute_plan(plan, workers=ORGANIZE_WORKERS, on_conflict="rename"):
+    """Planı paralel taşıma işçileriyle uygular; sayaçları döndürür."""
+    stats = {"moved": 0, "renamed": 0, "skipped": 0, "failed": 0}
+    moves = [item for item in plan if item["dst"]]
+    stats["skipped"] = len(plan) - len(moves)
+    for folder in {os.path.dirname(item["dst"]) for item in moves}:
+        _ensure_dir(folder)
+
+    overwrite = on_conflict == "overwrite"
+
+    def move_chunk(chunk):
+        failed, done = [], []
+        for item in chunk:
+            try:
+                _move(item["src"], item["dst"], overwrite=overwrite)
+                done.append((item["src"], item["dst"], item["route"], os.stat(item["dst"])))
+            except OSError as e:
+                print(f"❌ Taşınamadı: {item['src']} ➜ {item['dst']} ({e})")
+                failed.append(item)
+        return failed, done
+
+    # Dosya başına bir future yerine işçi başına birkaç büyük parça
+    size = max(1, -(-len(moves) // (workers * 4)))
+    chunks = [moves[i:i + size] for i in range(0, len(moves), size)]
+    failed, done = [], []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for chunk_failed, chunk_done in pool.map(move_chunk, chunks):
+            failed.extend(chunk_failed)
+            done.extend(chunk_done)
+    # Tüm taşımalar listeye tek bir ekleme ile yazılır
+    get_manifest().record_moves(done)
+    # Toplu yerleştirme halkayı doldurmasın: tek özet etkinlik
+    if done:
+        record_activity(ACTIVITY_FILE, f"{len(done)} dosya yerleştirildi", moved=len(done), failed=len(failed))
+    stats["failed"] = len(failed)
+    stats["moved"] = len(moves) - len(failed)
+    if on_conflict == "rename":
+        failed_ids = {id(item) for item in failed}
+        stats["renamed"] = sum(1 for item in moves if item["conflict"] and id(item) not in failed_ids)
+    return stats
+
+
+def organize_tree(source_dir, base_path=".", dry_run=False, workers=ORGANIZE_WORKERS,
+                  recursive=True, on_conflict="rename", plan_file=ORGANIZE_PLAN_FILE):
+    """
+    Kaynak klasörü tek seferde tarar ve FILE_ROUTING'e göre yerleştirir.
+    Kuru çalıştırmada yalnızca plan yazılır. Sayaçları döndürür.
+    """
+    started = time.perf_counter()
+    plan, scanned = plan_moves(source_dir, base_path=base_path, recursive=recursive, on_conflict=on_conflict)
+    planned = time.perf_counter() - started
+    stats = {"scanned": scanned, "planned": len(plan),
+             "conflicts": sum(item["conflict"] for item in plan), "plan_time": round(planned, 3)}
+    if dry_run:
+        stats["plan_file"] = write_plan(plan, plan_file)
+    else:
+        stats.update(execute_plan(plan, workers=workers, on_conflict=on_conflict))
+    stats["elapsed"] = round(time.perf_counter() - started, 3)
+    return stats
+
 # --- 7. Log tutma ---
 def log_creation(paths, log_dir="logs"):
+    """Yol listesini yazar; liste bir önceki çalıştırmayla aynıysa dosyaya dokunmaz."""
     os.makedirs(log_dir, exist_ok=True)
     log_file = os.path.join(log_dir, "folder_structure.json")
+    if os.path.exists(log_file):
+        try:
+            with open(log_file, "r", encoding="utf-8") as f:
+                if json.load(f).get("created") == paths:
+                    return False
+        except (OSError, ValueError):
+            pass
     with open(log_file, "w", encoding="utf-8") as f:
         json.dump({"timestamp": datetime.now().isoformat(), "created": paths}, f, indent=2, ensure_ascii=False)
+    return True
+
+
+def sync_manifest():
+    """Yönetilen klasörleri listeyle karşılaştırır (yalnızca değişen dosyaların özeti hesaplanır)."""
+    return get_manifest().diff(
+        set(FILE_ROUTING.values()),
+        route_of=lambda path: FILE_ROUTING.get(os.path.splitext(path)[1].lower())
+    )
+
+# --- 8. Olay kuyruğu (debounce + birleştirme) ---
+# Aynı dosyaya gelen olaylar bu süre sessizlik olana kadar birleştirilir (sn)
+WATCH_DEBOUNCE = 0.5
+# Olaylar sürekli gelse bile iş en geç bu süre sonunda çalışır (sn)
+WATCH_MAX_DELAY = 5.0
+WATCH_WORKERS = 2
+# Kendi ürettiğimiz çıktılar ve çalışma zamanı dosyaları izlenmez. Kiracı
+# klasörleri kök izleyicinin değildir (çıktıları agent zamanlayıcısı kiracı
+# bağlamıyla üretir); tasarım deposu parçaları da taşınmamalıdır.
+IGNORED_DIRS = {"templates", "static", "logs", ".git", "__pycache__", TENANTS_ROOT, DESIGN_STORE_DIR}
+IGNORED_PREFIXES = (".tmp-",)
+IGNORED_SUFFIXES = (".lock", ".jsonl", ".sqlite3", "-wal", "-shm")
 
-# --- 8. İzleme event handler ---
+
+def is_ignored_path(path, base_path="."):
+    """Yol, izleyicinin tepki vermemesi gereken bir çıktı/geçici dosya mı?"""
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(base_path))
+    parts = rel.split(os.sep)
+    rel = "/".join(parts)
+    if any(rel == d or rel.startswith(d + "/") for d in IGNORED_DIRS):
+        return True
+    name = parts[-1]
+    return name.startswith(IGNORED_PREFIXES) or name.endswith(IGNORED_SUFFIXES)
+
+
+class DebouncedWorkQueue:
+    """
+    Anahtar (dosya yolu) başına debounce edilen iş kuyruğu.
+
+    `submit()` yalnızca son tarihi günceller ve hemen döner; süresi dolan işler
+    tek bir dağıtıcı iş parçacığı tarafından işçi havuzuna verilir. Aynı yol
+    için aynı anda tek iş çalışır; çalışırken yeni olay gelirse iş bittikten
+    sonra bir kez daha çalıştırılır.
+    """
+
+    def __init__(self, callback, debounce=WATCH_DEBOUNCE, max_delay=WATCH_MAX_DELAY, workers=WATCH_WORKERS):
+        self.callback = callback
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._pending = {}   # yol -> (ilk olay zamanı, son tarih)
+        self._running = set()
+        self._rerun = set()
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ui-regen")
+        self._thread = None
+        self._stopped = False
+        self.coalesced = 0
+        self.runs = 0
+        self.errors = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._dispatch, name="ui-regen-dispatch", daemon=True)
+        self._thread.start()
+
+    def submit(self, key):
+        now = time.monotonic()
+        with self._cond:
+            if key in self._pending:
+                self.coalesced += 1
+                first = self._pending[key][0]
+            else:
+                first = now
+            self._pending[key] = (first, min(now + self.debounce, first + self.max_delay))
+            self._cond.notify()
+
+    def _dispatch(self):
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                for key in [k for k, (_, due) in self._pending.items() if due <= now]:
+                    del self._pending[key]
+                    if key in self._running:
+                        self._rerun.add(key)
+                    else:
+                        self._running.add(key)
+                        self._pool.submit(self._run, key)
+                if self._pending:
+                    self._cond.wait(min(due for _, due in self._pending.values()) - now)
+                else:
+                    self._cond.wait()
+
+    def _run(self, key):
+        failed = False
+        try:
+            self.callback(key)
+        except Exception as e:
+            failed = True
+            print(f"❌ Arayüz üretimi başarısız ({key}): {e}")
+        finally:
+            with self._cond:
+                self.runs += 1
+                self.errors += int(failed)
+                self._running.discard(key)
+                if key in self._rerun:
+                    self._rerun.discard(key)
+                    now = time.monotonic()
+                    self._pending[key] = (now, now)
+                self._cond.notify()
+
+    def idle(self):
+        with self._cond:
+            return not self._pending and not self._running
+
+    def flush(self, timeout=None):
+        """Bekleyen ve çalışan işler bitene kadar bekler; bittiyse True."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.idle():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+        self._pool.shutdown(wait=True)
+
+
+# --- 9. İzleme event handler ---
 class NewFileHandler(FileSystemEventHandler):
+    """
+    Yeni dosyaları yerleştirir ve design.json değişince arayüzü yeniden üretir.
+    Watchdog iş parçacığı yalnızca olayı kuyruğa ekler; üretim işçi havuzunda
+    ve dosya başına debounce edilerek yapılır.
+    """
+
+    def __init__(self, base_path=".", debounce=WATCH_DEBOUNCE, workers=WATCH_WORKERS):
+        super().__init__()
+        self.base_path = base_path
+        self.events_received = 0
+        self.events_ignored = 0
+        self.queue = DebouncedWorkQueue(self.regenerate, debounce=debounce, workers=workers)
+        self.queue.start()
+
+    def regenerate(self, file_path):
+        print("🎨 Yeni tasarım dosyası algılandı, arayüz oluşturuluyor...")
+        generate_ui_from_design(design_file_path=file_path)
+
     def process_design_file(self, file_path):
-        """design.json dosyasını yakalayıp UI üretir"""
+        """design.json dosyasını yakalayıp UI üretimini kuyruğa ekler"""
         if file_path.endswith("design.json"):
-            print("🎨 Yeni tasarım dosyası algılandı, arayüz oluşturuluyor...")
-            generate_ui_from_design(design_file_path=file_path)
+            self.queue.submit(os.path.abspath(file_path))
+
+    def _accept(self, event, path):
+        self.events_received += 1
+        if event.is_directory or is_ignored_path(path, self.base_path):
+            self.events_ignored += 1
+            return False
+        return True
 
     def on_created(self, event):
-        if not event.is_directory:
-            moved_path = auto_organize_file(event.src_path)
-            if moved_path:
-                print(f"📁 Yeni dosya taşındı: {event.src_path} ➜ {moved_path}")
-                self.process_design_file(moved_path)
-            else:
-                self.process_design_file(event.src_path)
+        if not self._accept(event, event.src_path):
+            return
+        moved_path = auto_organize_file(event.src_path)
+        if moved_path:
+            print(f"📁 Yeni dosya taşındı: {event.src_path} ➜ {moved_path}")
+            self.process_design_file(moved_path)
+        else:
+            self.process_design_file(event.src_path)
 
     def on_modified(self, event):
-        if not event.is_directory:
+        if self._accept(event, event.src_path):
             # Tasarım dosyası güncellenince de çalışsın
             self.process_design_file(event.src_path)
 
+    def on_moved(self, event):
+        # Atomik yazma (geçici dosya + os.replace) hedefte "moved" olayı üretir
+        if self._accept(event, event.dest_path):
+            self.process_design_file(event.dest_path)
+
+    def stats(self):
+        return {
+            "events_received": self.events_received,
+            "events_ignored": self.events_ignored,
+            "events_coalesced": self.queue.coalesced,
+            "regenerations": self.queue.runs,
+            "errors": self.queue.errors
+        }
+
+    def close(self):
+        self.queue.stop()
+
+
+# --- 10. Çalıştır ---
+def main():
+    parser = argparse.ArgumentParser(description="Klasör yapısını hazırlar, dosyaları yerleştirir ve izler.")
+    parser.add_argument("--sweep", metavar="KLASÖR", help="Bu klasördeki dosyaları toplu olarak yerleştir")
+    parser.add_argument("--dry-run", action="store_true", help="Taşımadan yalnızca planı yaz")
+    parser.add_argument("--workers", type=int, default=ORGANIZE_WORKERS, help="Paralel taşıma işçisi sayısı")
+    parser.add_argument("--no-recursive", action="store_true", help="Alt klasörlere inme")
+    parser.add_argument("--on-conflict", choices=["rename", "skip", "overwrite"], default="rename")
+    parser.add_argument("--watch", action="store_true", help="--sweep sonrasında izlemeye devam et")
+    args = parser.parse_args()
 
-# --- 9. Çalıştır ---
-if __name__ == "__main__":
     all_paths = create_folders() + create_files()
     log_creation(all_paths)
     print("📦 Klasörler ve dosyalar hazırlandı.")
+    print(f"🗂  Dosya listesi güncellendi: {sync_manifest()}")
 
+    if args.sweep:
+        stats = organize_tree(args.sweep, dry_run=args.dry_run, workers=args.workers,
+                              recursive=not args.no_recursive, on_conflict=args.on_conflict)
+        if args.dry_run:
+            print(f"📝 Kuru çalıştırma: {stats['planned']} taşıma planlandı ({stats['conflicts']} çakışma) ➜ {stats['plan_file']}")
+        else:
+            print(f"📁 Toplu yerleştirme: {stats}")
+        if not args.watch:
+            return
+
+    handler = NewFileHandler()
     observer = Observer()
-    observer.schedule(NewFileHandler(), path=".", recursive=True)
+    observer.schedule(handler, path=".", recursive=True)
     observer.start()
     print("👁 İzleme başlatıldı...")
     try:
@@ -137,4 +528,9 @@ if __name__ == "__main__":
         observer.stop()
         print("🛑 İzleme durdu.")
     observer.join()
+    handler.close()
+    print(f"📈 İzleyici istatistikleri: {handler.stats()}")
+
 
+if __name__ == "__main__":
+    main()
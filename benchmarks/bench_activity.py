@@ -0,0 +1,127 @@
+# bench_activity.py - Son etkinlikler: her istekte geçmişi tarama / bellekteki halka
+#
+# Geçici bir klasörde H kayıtlık geçmiş (data/feedback_loop.json dizi dosyası +
+# data/tasarim-*.json dosyaları) oluşturulur ve "son 20 etkinlik" isteği ölçülür:
+#   1) naif yol: her istekte geri bildirim dosyası ve tüm tasarım dosyaları okunur
+#   2) ActivityFeed.recent: bellekteki halka (+ günlükteki yeni satırlar için tek stat)
+# Ayrıca başka bir süreçte (ayrı işçi) kaydedilen etkinliğin bu süreçteki
+# halkaya ve bekleyen akış okuyucusuna ulaşma süresi ölçülür.
+#
+#   python benchmarks/bench_activity.py --history 5000 --requests 200
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_core.activity_log import ACTIVITY_DESIGN, ACTIVITY_FEEDBACK, ActivityFeed
+
+WRITER = """
+import sys, time
+sys.path.append({root!r})
+from ai_core.activity_log import ActivityFeed
+feed = ActivityFeed({path!r})
+for i in range({count}):
+    feed.record("ui_regenerated", f"başka işçi {{i}}", sent=time.time())
+    time.sleep({interval})
+"""
+
+
+def build_history(count, feed):
+    feedback = [{"timestamp": f"2025-01-01T00:00:{i % 60:02d}", "approved": i % 2 == 0, "comments": "yorum"}
+                for i in range(count)]
+    with open("data/feedback_loop.json", "w", encoding="utf-8") as f:
+        json.dump(feedback, f)
+    for i in range(count):
+        with open(f"data/tasarim-{i}.json", "w", encoding="utf-8") as f:
+            json.dump({"title": f"Tasarım {i}", "cards": []}, f)
+        feed.record(ACTIVITY_DESIGN, f"Tasarım {i}")
+        feed.record(ACTIVITY_FEEDBACK, "yorum")
+
+
+def naive_recent(limit=20):
+    with open("data/feedback_loop.json", "r", encoding="utf-8") as f:
+        events = [{"kind": ACTIVITY_FEEDBACK, "timestamp": r["timestamp"]} for r in json.load(f)]
+    for path in glob.glob("data/tasarim-*.json"):
+        with open(path, "r", encoding="utf-8") as f:
+            events.append({"kind": ACTIVITY_DESIGN, "title": json.load(f)["title"],
+                           "timestamp": str(os.path.getmtime(path))})
+    events.sort(key=lambda e: e["timestamp"], reverse=True)
+    return events[:limit]
+
+
+def timed(fn, requests):
+    times = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Etkinlik halkası benchmark'ı.")
+    parser.add_argument("--history", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--remote", type=int, default=20, help="Diğer süreçte kaydedilen etkinlik sayısı")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.makedirs("data")
+        log_path = os.path.join(tmp, "data", "activity.jsonl")
+        feed = ActivityFeed(log_path)
+        build_history(args.history, feed)
+
+        naive = timed(naive_recent, args.requests)
+        ring = timed(lambda: feed.recent(20), args.requests)
+        page = feed.recent(20)
+        second = feed.recent(20, before=page[-1]["id"])
+        paged_ok = len(second) == 20 and second[0]["id"] < page[-1]["id"]
+
+        # Yeni başlayan işçi halkasını günlüğün sonundan doldurur
+        started = time.perf_counter()
+        fresh = ActivityFeed(log_path)
+        bootstrap = time.perf_counter() - started
+        bootstrap_ok = [e["id"] for e in fresh.recent(20)] == [e["id"] for e in page]
+
+        # Başka süreç -> bu süreçteki bekleyen akış okuyucusu
+        latencies = []
+
+        def reader():
+            cursor = fresh.last_id()
+            while len(latencies) < args.remote:
+                for event in fresh.wait(cursor, timeout=5):
+                    cursor = event["id"]
+                    latencies.append(time.time() - event["sent"])
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        subprocess.run([sys.executable, "-c", WRITER.format(
+            root=PROJECT_ROOT, path=log_path, count=args.remote, interval=0.05)], check=True)
+        thread.join(timeout=10)
+        os.chdir(PROJECT_ROOT)
+
+    print(f"\n📊 {args.history} tasarım + {args.history} geri bildirim geçmişi, {args.requests} istek (medyan)")
+    print(f"   naif tarama (her istekte)  : {naive * 1000:9.3f} ms")
+    print(f"   halka (recent)             : {ring * 1000:9.3f} ms | x{naive / ring:.0f} hızlı")
+    print(f"   sayfalama (before imleci)  : {'✅' if paged_ok else '❌'}")
+    print(f"   yeni işçinin açılışı       : {bootstrap * 1000:9.3f} ms | halka aynı: {'✅' if bootstrap_ok else '❌'}")
+    if latencies:
+        print(f"   diğer süreçten akışa       : {len(latencies)}/{args.remote} etkinlik | p50 "
+              f"{statistics.median(latencies) * 1000:.0f} ms, en kötü {max(latencies) * 1000:.0f} ms "
+              f"(kontrol aralığı {fresh.poll_interval * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
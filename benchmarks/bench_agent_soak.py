@@ -0,0 +1,147 @@
+# bench_agent_soak.py - agent_loop.smart_modify_design uzun süreli (soak) testi
+#
+# Geçici bir klasörde data/design.json üzerinde N geri bildirim olayı
+# (varsayılan 100k, karışık palet/kart/layout kararları) agent'tan geçirilir.
+# Belirli aralıklarla ölçülenler:
+#   - tracemalloc ile süreç belleği
+#   - design.json boyutu ve kart sayısı
+#   - render_design süresi (HTML + CSS)
+# Sonda ilk ve son ölçüm karşılaştırılır; bütçe aşılırsa ya da bellek/render
+# süresi büyümeye devam ederse betik hata koduyla çıkar. Karşılaştırma için
+# bütçesiz eski davranış da (daha az olayla) ölçülür.
+#
+#   python benchmarks/bench_agent_soak.py --events 100000 --checkpoints 10
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import agent_loop
+from ai_core.design_model import get_design_loader
+from generate_ui import render_design
+
+INITIAL_DESIGN = {
+    "title": "Modern Yönetim Paneli",
+    "header": "Otomatik Tasarım",
+    "description": "Otomasyon ve yaratıcılık birleşti!",
+    "background": "#f4f4f4",
+    "color": "#333",
+    "cards": [
+        {"title": "Motivasyon", "content": "Bugün öğrenmek için iyi bir gün!"},
+        {"title": "Haber", "content": "Yeni güncellemeler eklendi."},
+        {"title": "Rastgele Not", "content": "Kodlama bir sanattır."}
+    ],
+    "buttons": [{"text": "Kaydet", "action": "#"}]
+}
+
+
+def random_feedback(rng):
+    """FeedbackAggregator.decide() çıktısına benzeyen karar (en az bir değişiklik)."""
+    return {
+        "force_new_palette": rng.random() < 0.5,
+        "more_cards": rng.random() < 0.7,
+        "force_new_layout": True
+    }
+
+
+def render_ms(repeat=20):
+    design = get_design_loader().load(agent_loop.DESIGN_FILE).data
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render_design(design)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def measure():
+    # Toplanmayı bekleyen döngüsel çöp (json kodlayıcı kapanışları vb.) sızıntı sayılmasın
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    with open(agent_loop.DESIGN_FILE, "r", encoding="utf-8") as f:
+        cards = len(json.load(f)["cards"])
+    return {
+        "memory_kb": current / 1024,
+        "file_bytes": os.path.getsize(agent_loop.DESIGN_FILE),
+        "cards": cards,
+        "render_ms": render_ms()
+    }
+
+
+def soak(events, checkpoints, seed=42):
+    rng = random.Random(seed)
+    random.seed(seed)
+    with open(agent_loop.DESIGN_FILE, "w", encoding="utf-8") as f:
+        json.dump(INITIAL_DESIGN, f, indent=2, ensure_ascii=False)
+
+    every = max(1, events // checkpoints)
+    samples = []
+    started = time.perf_counter()
+    for i in range(1, events + 1):
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent_loop.smart_modify_design(random_feedback(rng))
+        if i % every == 0 or i == events:
+            samples.append({"event": i, **measure()})
+    return samples, time.perf_counter() - started
+
+
+def print_samples(label, samples, elapsed):
+    print(f"\n📊 {label} ({elapsed:.1f} sn)")
+    for s in samples:
+        print(f"   olay {s['event']:7d} | bellek {s['memory_kb']:8.0f} KB | dosya {s['file_bytes']:8d} B | "
+              f"kart {s['cards']:6d} | render {s['render_ms']:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent döngüsü soak benchmark'ı.")
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--legacy-events", type=int, default=500, help="Bütçesiz eski davranış için olay sayısı")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.makedirs("data")
+        tracemalloc.start()
+
+        # Eski davranış: bütçe yok (kartlar her olumsuz geri bildirimde birikir)
+        budget = (agent_loop.DESIGN_MAX_CARDS, agent_loop.DESIGN_MAX_BYTES)
+        original_compact = agent_loop.compact_design
+        agent_loop.compact_design = lambda design, **_: 0
+        legacy, legacy_elapsed = soak(args.legacy_events, min(args.checkpoints, 5))
+        agent_loop.compact_design = original_compact
+
+        get_design_loader().invalidate()
+        samples, elapsed = soak(args.events, args.checkpoints)
+        tracemalloc.stop()
+        os.chdir(PROJECT_ROOT)
+
+    print_samples(f"bütçesiz eski davranış, {args.legacy_events} olay", legacy, legacy_elapsed)
+    print_samples(f"bütçeli ({budget[0]} kart, {budget[1]} B), {args.events} olay", samples, elapsed)
+
+    first, last = samples[0], samples[-1]
+    checks = {
+        "kart sayısı bütçede": all(s["cards"] <= budget[0] for s in samples),
+        "dosya boyutu bütçede": all(s["file_bytes"] <= budget[1] for s in samples),
+        "bellek düz (+%20 / 256 KB)": last["memory_kb"] <= max(first["memory_kb"] * 1.2, first["memory_kb"] + 256),
+        "render süresi düz (x2)": last["render_ms"] <= first["render_ms"] * 2 + 0.05
+    }
+    print()
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+    if not all(checks.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# bench_ai_batch.py - ai_designer toplu (asyncio) üretim modu ölçümü
+#
+# Yerel sahte sunucuya (mock_openai_server.py) karşı:
+#   1) eski yol: prompt'lar tek tek, bloklayan istemciyle
+#   2) toplu mod: --concurrency eşzamanlı istek, 429'larda geri çekilme
+#   3) çökme sonrası devam: çıktı yarıda kesilip yeniden çalıştırılır
+#
+#   python benchmarks/bench_ai_batch.py --prompts 200 --concurrency 16 --delay 0.1
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+os.environ.setdefault("OPENAI_API_KEY", "sk-mock")
+
+import openai
+
+from ai_dashboard import ai_designer
+from benchmarks.mock_openai_server import start_mock_server
+
+MODEL = "gpt-4o-mini"
+
+
+def write_prompts(path, n):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({"id": f"tema-{i:04d}", "prompt": f"{i}. tema için pastel renkli dashboard JSON'u üret."},
+                               ensure_ascii=False) + "\n")
+
+
+def sequential(base_url, items):
+    client = openai.OpenAI(base_url=base_url)
+    for _, prompt in items:
+        response = client.chat.completions.create(
+            model=MODEL, messages=[{"role": "user", "content": prompt}], max_tokens=800, temperature=0.7
+        )
+        ai_designer.clean_ai_response(response.choices[0].message.content)
+
+
+def count_ids(path):
+    ids = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "design" in record:
+                ids.append(record["id"])
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ai_designer toplu üretim benchmark'ı (yerel sahte sunucu).")
+    parser.add_argument("--prompts", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--delay", type=float, default=0.1, help="Sahte sunucu gecikmesi (sn)")
+    parser.add_argument("--rate-limit-every", type=int, default=10, help="Her N. isteği 429 ile reddet")
+    args = parser.parse_args()
+
+    # Benchmark'ta geri çekilme kısa tutulur; davranış aynıdır
+    ai_designer.BATCH_BACKOFF_BASE = 0.05
+    server, base_url = start_mock_server(delay=args.delay, rate_limit_every=args.rate_limit_every, retry_after=0.05)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "prompts.jsonl")
+        output_path = os.path.join(tmp, "out.jsonl")
+        write_prompts(input_path, args.prompts)
+        items = ai_designer.load_batch_prompts(input_path)
+
+        # Eski yol tüm listede çok uzun sürer; ilk 20 prompt'tan prompt başına süre çıkarılır
+        server.rate_limit_every = 0
+        sample = items[:20]
+        started = time.perf_counter()
+        sequential(base_url, sample)
+        per_prompt = (time.perf_counter() - started) / len(sample)
+        server.rate_limit_every = args.rate_limit_every
+
+        stats = asyncio.run(ai_designer.run_batch(input_path, output_path, model_name=MODEL,
+                                                  concurrency=args.concurrency, base_url=base_url))
+
+        # Çökme benzetimi: çıktının yarısı + yarım bir satır bırakılır
+        with open(output_path, encoding="utf-8") as f:
+            lines = f.readlines()
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.writelines(lines[:len(lines) // 2])
+            f.write(lines[len(lines) // 2][:20])
+        before = server.requests
+        resumed = asyncio.run(ai_designer.run_batch(input_path, output_path, model_name=MODEL,
+                                                    concurrency=args.concurrency, base_url=base_url))
+        resumed_requests = server.requests - before
+        ids = count_ids(output_path)
+
+        print(f"\n📊 {args.prompts} prompt, gecikme {args.delay * 1000:.0f} ms, her {args.rate_limit_every}. istek 429")
+        print(f"   eski yol (tahmini) : {per_prompt * args.prompts:8.2f} sn  ({per_prompt * 1000:.1f} ms/prompt)")
+        print(f"   toplu mod          : {stats['elapsed']:8.2f} sn  (yeniden deneme {stats['retries']}, hata {stats['failed']})")
+        print(f"🔁 Devam: {resumed['skipped']} atlandı, {resumed['succeeded']} üretildi, {resumed_requests} istek; "
+              f"benzersiz tamamlanan {len(set(ids))}/{args.prompts}, tekrar {len(ids) - len(set(ids))}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
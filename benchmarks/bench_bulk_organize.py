@@ -0,0 +1,98 @@
+# bench_bulk_organize.py - Toplu dosya yerleştirme: dosya başına eski yol / toplu mod
+#
+# Sentetik bir ağaç (varsayılan 100k dosya, karışık uzantılar, iç içe klasörler,
+# aynı isimli dosyalar) iki kez oluşturulur:
+#   1) eski yol: her dosya için auto_organize_file eşdeğeri (makedirs + shutil.move)
+#   2) toplu mod: os.scandir taraması + plan + paralel rename
+# Ayrıca kuru çalıştırmanın (yalnızca plan) süresi ölçülür.
+#
+#   python benchmarks/bench_bulk_organize.py --files 100000 --workers 8
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import auto_folder_manager
+from auto_folder_manager import FILE_ROUTING, organize_tree
+
+EXTENSIONS = list(FILE_ROUTING) + [".txt", ".md"]
+
+
+def build_tree(root, files, per_dir=500, distinct_names=None):
+    """`files` dosyalık ağaç; `distinct_names` verilirse isimler tekrar eder (çakışma)."""
+    distinct_names = distinct_names or files
+    for i in range(files):
+        folder = os.path.join(root, f"export-{i // per_dir // 20}", f"batch-{i // per_dir}")
+        if i % per_dir == 0:
+            os.makedirs(folder, exist_ok=True)
+        name_id = i % distinct_names
+        ext = EXTENSIONS[name_id % len(EXTENSIONS)]
+        with open(os.path.join(folder, f"asset-{name_id}{ext}"), "w") as f:
+            f.write("x")
+
+
+def legacy_organize(root):
+    """Eski davranış: her dosyada makedirs + shutil.move (çakışan isim üzerine yazılır)."""
+    moved = 0
+    for folder, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(folder, name)
+            target = FILE_ROUTING.get(os.path.splitext(name)[1].lower())
+            if not target:
+                continue
+            os.makedirs(target, exist_ok=True)
+            shutil.move(path, os.path.join(target, name))
+            moved += 1
+    return moved
+
+
+def count_files(folder):
+    return sum(len(names) for _, _, names in os.walk(folder))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu dosya yerleştirme benchmark'ı.")
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1, help="Aynı isimli dosya oranı")
+    args = parser.parse_args()
+    distinct = max(1, int(args.files * (1 - args.duplicate_ratio)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_base = os.path.join(tmp, "legacy")
+        bulk_base = os.path.join(tmp, "bulk")
+        for base in (legacy_base, bulk_base):
+            started = time.perf_counter()
+            build_tree(os.path.join(base, "incoming"), args.files, distinct_names=distinct)
+            print(f"🏗  {args.files} dosya oluşturuldu ({time.perf_counter() - started:.1f} sn): {base}")
+
+        os.chdir(legacy_base)
+        started = time.perf_counter()
+        legacy_moved = legacy_organize("incoming")
+        legacy = time.perf_counter() - started
+        legacy_kept = sum(count_files(os.path.join(legacy_base, t)) for t in set(FILE_ROUTING.values()) if os.path.isdir(t))
+
+        os.chdir(bulk_base)
+        dry = organize_tree("incoming", dry_run=True, plan_file=os.path.join(tmp, "plan.jsonl"))
+        auto_folder_manager._known_dirs.clear()
+        bulk = organize_tree("incoming", workers=args.workers)
+        bulk_kept = sum(count_files(os.path.join(bulk_base, t)) for t in set(FILE_ROUTING.values()) if os.path.isdir(t))
+        os.chdir(PROJECT_ROOT)
+
+    routable = legacy_moved
+    print(f"\n📊 {args.files} dosya, {routable} yönlendirilebilir, işçi {args.workers}")
+    print(f"   eski yol     : {legacy:7.2f} sn, hedefte kalan {legacy_kept} (çakışanlar üzerine yazıldı)")
+    print(f"   kuru çalıştırma: {dry['elapsed']:5.2f} sn, {dry['planned']} plan, {dry['conflicts']} çakışma")
+    print(f"   toplu mod    : {bulk['elapsed']:7.2f} sn (plan {bulk['plan_time']} sn), hedefte kalan {bulk_kept}, "
+          f"yeniden adlandırılan {bulk['renamed']}, hata {bulk['failed']}")
+
+
+if __name__ == "__main__":
+    main()
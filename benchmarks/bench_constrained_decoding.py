@@ -0,0 +1,65 @@
+# bench_constrained_decoding.py - Serbest üretim + onarım ile şemaya kısıtlı çözümleme
+#
+# Aynı küçük GPT-2 ile N tasarım üretilir; geçerli JSON oranı, geçerli tasarım
+# başına token ve süre karşılaştırılır.
+#
+#   python benchmarks/bench_constrained_decoding.py --designs 30
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import ai_core.design_generator as design_generator
+from ai_core.model_server import GenerationServer
+from benchmarks.tiny_gpt2 import build_tiny_gpt2
+
+
+def run(label, fn, designs):
+    started = time.perf_counter()
+    for _ in range(designs):
+        fn()
+    return label, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kısıtlı JSON çözümleme benchmark'ı.")
+    parser.add_argument("--designs", type=int, default=30, help="Mod başına üretim turu")
+    parser.add_argument("--max-new-tokens", type=int, default=200)
+    parser.add_argument("--temperature", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = GenerationServer(build_tiny_gpt2(os.path.join(tmp, "tiny-gpt2")))
+
+        # Ham çıktı yazdırmalarını bastır
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w", encoding="utf-8")
+        try:
+            timings = [
+                run("free", lambda: design_generator.generate_free(
+                    server, max_new_tokens=args.max_new_tokens, temperature=args.temperature), args.designs),
+                run("constrained", lambda: design_generator.generate_constrained(
+                    server, temperature=args.temperature), args.designs),
+            ]
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    stats = design_generator.get_generation_stats()
+    print(f"📊 {args.designs} tur / mod (free modunda tur başına {len(design_generator.PROMPTS)} prompt)")
+    print(f"{'mod':>12} | {'deneme':>6} | {'geçerli':>7} | {'oran':>6} | {'token/geçerli':>13} | {'sn/geçerli':>10}")
+    for mode, elapsed in timings:
+        s = stats[mode]
+        per_valid = f"{elapsed / s['valid']:.4f}" if s["valid"] else "∞"
+        tokens = s["tokens_per_valid_design"] if s["valid"] else "∞"
+        print(f"{mode:>12} | {s['attempts']:>6} | {s['valid']:>7} | {s['valid_rate']:>6} | {tokens:>13} | {per_valid:>10}")
+    print(f"   Çözümleyici istatistikleri: {server.decoding_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# bench_design_store.py - Tasarım geçmişi: ayrı JSON dosyaları / tasarım deposu
+#
+# Geçici bir klasörde N tasarım (bir kısmı birebir tekrar) iki biçimde saklanır:
+#   1) eski yol: her tasarım data/tasarim-N.json (indent=2) + sayaç + latest.txt
+#   2) DesignStore: içerik adresli, zlib ile paketlenmiş segmentler + dizin
+# Ölçülenler: yazma süresi, diskte kaplanan alan, dosya sayısı, latest() ve
+# get(id) süreleri, eşzamanlı yazıcılarda tekrar eden numara sayısı.
+#
+#   python benchmarks/bench_design_store.py --designs 5000 --duplicate-ratio 0.3
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_core.design_store import DesignStore
+
+
+def make_designs(count, duplicate_ratio):
+    rng = random.Random(42)
+    designs = []
+    for i in range(count):
+        if designs and rng.random() < duplicate_ratio:
+            designs.append(dict(rng.choice(designs)))
+            continue
+        designs.append({
+            "title": rng.choice(["Otomatik Tasarım", "Modern Panel", "Yaratıcı Dashboard"]),
+            "header": "Hoş Geldiniz!",
+            "description": f"Bu panel yapay zeka tarafından oluşturuldu. ({i})",
+            "background": "#ffffff",
+            "color": "#222222",
+            "cards": [{"title": f"Kart {j}", "content": "Kreatif düşün ve farklı şeyler dene."} for j in range(3)],
+            "buttons": [{"text": "Raporları Gör", "action": "#"}, {"text": "Kaydet", "action": "#"}]
+        })
+    return designs
+
+
+def legacy_save(data_dir, design):
+    """Eski create_design_json yolu: kilitsiz sayaç + ayrı dosya + latest.txt."""
+    counter = os.path.join(data_dir, "design_counter.txt")
+    count = 1
+    if os.path.exists(counter):
+        with open(counter, "r", encoding="utf-8") as f:
+            count = int(f.read().strip() or 0) + 1
+    with open(counter, "w", encoding="utf-8") as f:
+        f.write(str(count))
+    name = f"tasarim-{count}.json"
+    with open(os.path.join(data_dir, name), "w", encoding="utf-8") as f:
+        json.dump(design, f, indent=2, ensure_ascii=False)
+    with open(os.path.join(data_dir, "latest.txt"), "w", encoding="utf-8") as f:
+        f.write(name)
+    return count
+
+
+def legacy_latest(data_dir):
+    with open(os.path.join(data_dir, "latest.txt"), "r", encoding="utf-8") as f:
+        name = f.read().strip()
+    with open(os.path.join(data_dir, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def disk_usage(folder):
+    total = files = 0
+    for root, _, names in os.walk(folder):
+        for name in names:
+            st = os.stat(os.path.join(root, name))
+            total += st.st_blocks * 512
+            files += 1
+    return total, files
+
+
+def timed_calls(fn, args_list):
+    started = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - started) / len(args_list) * 1000
+
+
+def concurrent_duplicates(writer, threads=8, per_thread=25):
+    ids = []
+    lock = threading.Lock()
+
+    def work():
+        for _ in range(per_thread):
+            value = writer()
+            with lock:
+                ids.append(value)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return len(ids) - len(set(ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tasarım deposu benchmark'ı.")
+    parser.add_argument("--designs", type=int, default=5000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    designs = make_designs(args.designs, args.duplicate_ratio)
+    rng = random.Random(7)
+    picks = [(rng.randint(1, args.designs),) for _ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_dir = os.path.join(tmp, "legacy")
+        os.makedirs(legacy_dir)
+        started = time.perf_counter()
+        for design in designs:
+            legacy_save(legacy_dir, design)
+        legacy_write = time.perf_counter() - started
+        legacy_bytes, legacy_files = disk_usage(legacy_dir)
+        legacy_latest_ms = timed_calls(legacy_latest, [(legacy_dir,)] * args.lookups)
+
+        def legacy_get(n):
+            with open(os.path.join(legacy_dir, f"tasarim-{n}.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        legacy_get_ms = timed_calls(legacy_get, picks)
+        legacy_dupes = concurrent_duplicates(lambda: legacy_save(legacy_dir, designs[0]))
+
+        store_root = os.path.join(tmp, "store")
+        store = DesignStore(root=store_root, latest_pointer=os.path.join(store_root, "latest.txt"))
+        started = time.perf_counter()
+        for design in designs:
+            store.put(design, source="bench")
+        store_write = time.perf_counter() - started
+        store_bytes, store_files = disk_usage(store_root)
+        store_latest_ms = timed_calls(store.latest, [()] * args.lookups)
+        cold = DesignStore(root=store_root, latest_pointer=None)
+        cold_get_ms = timed_calls(cold.get, picks)
+        store_get_ms = timed_calls(store.get, picks)
+        store_dupes = concurrent_duplicates(lambda: store.put(designs[0], source="bench")["id"])
+        stats = store.stats()
+
+    print(f"\n📊 {args.designs} tasarım (tekrar oranı {args.duplicate_ratio}), {args.lookups} okuma")
+    print(f"   eski yol : yazma {legacy_write:6.2f} sn, disk {legacy_bytes / 1024:9.0f} KB, {legacy_files:6d} dosya, "
+          f"latest {legacy_latest_ms:.3f} ms, get {legacy_get_ms:.3f} ms, eşzamanlı tekrar numara {legacy_dupes}")
+    print(f"   depo     : yazma {store_write:6.2f} sn, disk {store_bytes / 1024:9.0f} KB, {store_files:6d} dosya, "
+          f"latest {store_latest_ms:.3f} ms, get {store_get_ms:.3f} ms (soğuk {cold_get_ms:.3f} ms), "
+          f"eşzamanlı tekrar numara {store_dupes}")
+    print(f"   benzersiz {stats['unique']}, paketlenmiş {stats['packed_bytes'] / 1024:.0f} KB / ham {stats['raw_bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench_design_stream.py - Akış halinde tasarım üretimi: ilk bileşen süresi / toplam süre
+#
+# Yerel sahte sunucuya (mock_openai_server.py) karşı:
+#   1) eski yol: tam yanıt beklenir, sonra clean_ai_response ile ayrıştırılır
+#   2) akış modu: bileşenler kapandıkça IncrementalDesignParser ile çıkarılır
+# Ayrıca ayrıştırıcı rastgele parça boyutlarıyla tam çözümleme sonucuna karşı doğrulanır.
+#
+#   python benchmarks/bench_design_stream.py --components 20 --rounds 5
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+os.environ.setdefault("OPENAI_API_KEY", "sk-mock")
+
+from ai_dashboard import ai_client, ai_designer
+from ai_dashboard.ai_client import CachedCompletionClient, ResponseCache
+from ai_dashboard.design_stream import IncrementalDesignParser, stream_design
+from benchmarks.mock_openai_server import start_mock_server
+
+MODEL = "gpt-4o-mini"
+
+
+def check_parser(samples=200):
+    """Rastgele bölünmüş metinde akış sonucu json.loads sonucuyla aynı mı?"""
+    for i in range(samples):
+        design = {
+            "title": f"Tasarım {i} \"tırnak\" {{parantez}}",
+            "header": "Başlık [köşeli]",
+            "style": {"background": "#fff", "color": "#000"},
+            "components": [
+                {"type": "card", "title": f"Kart {j}", "value": "a\\\\b \"c\" }", "meta": {"x": [1, {"y": 2}]}}
+                for j in range(random.randint(0, 8))
+            ]
+        }
+        text = "İşte tasarım:\n```json\n" + json.dumps(design, ensure_ascii=False, indent=random.choice([None, 2])) + "\n```"
+        parser = IncrementalDesignParser()
+        emitted = []
+        pos = 0
+        while pos < len(text):
+            step = random.randint(1, 16)
+            emitted.extend(parser.feed(text[pos:pos + step]))
+            pos += step
+        if emitted != design["components"] or parser.result() != design:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Akış halinde tasarım ayrıştırma benchmark'ı (yerel sahte sunucu).")
+    parser.add_argument("--components", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="Parça başına gecikme (sn)")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(delay=0.0, chunk_delay=args.chunk_delay, components=args.components)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = CachedCompletionClient(cache=ResponseCache(os.path.join(tmp, "cache.sqlite3")), base_url=base_url)
+        ai_client._completion_clients[base_url] = client
+
+        blocking, ttfc, totals = [], [], []
+        for i in range(args.rounds):
+            # Eski yol: aynı akış sonuna kadar beklenip tek seferde ayrıştırılır
+            started = time.perf_counter()
+            text = "".join(client.stream(MODEL, f"eski yol {i}"))
+            ai_designer.clean_ai_response(text)
+            blocking.append(time.perf_counter() - started)
+
+            for event in stream_design(f"akış {i}", MODEL, base_url=base_url):
+                if event["event"] == "done":
+                    ttfc.append(event["stats"]["time_to_first_component"])
+                    totals.append(event["stats"]["total_time"])
+
+        # Önbellekteki yanıt tek parça halinde gelir
+        started = time.perf_counter()
+        list(stream_design("akış 0", MODEL, base_url=base_url))
+        cached = time.perf_counter() - started
+
+        mean = lambda values: sum(values) / len(values)
+        print(f"\n📊 {args.components} bileşenli tasarım, {args.rounds} tur")
+        print(f"   eski yol: ilk bileşen = toplam   : {mean(blocking) * 1000:8.1f} ms")
+        print(f"   akış    : ilk bileşen            : {mean(ttfc) * 1000:8.1f} ms")
+        print(f"   akış    : toplam                 : {mean(totals) * 1000:8.1f} ms")
+        print(f"   önbellekten akış                 : {cached * 1000:8.1f} ms")
+        print(f"✅ Ayrıştırıcı doğruluğu (rastgele parçalar): {check_parser()}")
+        client.cache.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
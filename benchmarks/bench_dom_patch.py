@@ -0,0 +1,173 @@
+# bench_dom_patch.py - Yeniden oluşturma: tam HTML (document.write) / DOM yaması
+#
+# Tipik tasarım değişiklikleri için /api/regenerate_ui yanıtının iki hali
+# karşılaştırılır:
+#   1) tam: {"mode": "full", "html": ...} -> istemci document.write ile sayfayı değiştirir
+#   2) yama: {"mode": "patch", "ops": [...]} -> istemci yalnızca değişen düğümleri günceller
+# Ölçülenler: yanıt boyutu (ham ve gzip), sunucuda yama üretim süresi ve
+# yamanın doğruluğu (eski sayfaya uygulanan yama yeni tasarımın tam render'ı
+# ile aynı alanları/öğeleri vermeli).
+#
+# İstemci tarafı uygulama süresi tarayıcı gerektirir: --html ile verilen
+# dosyaya, aynı yanıtları üretilen sayfanın kendi applyDesignPatch/
+# document.write koduyla ölçen bağımsız bir sayfa yazılır; tarayıcıda açın.
+#
+#   python benchmarks/bench_dom_patch.py --repeat 200 --html /tmp/dom_patch.html
+
+import argparse
+import copy
+import gzip
+import json
+import os
+import random
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_dashboard.create_design import build_random_design
+from design_patch import PATCH_FIELDS, PATCH_LIST_FIELDS, DesignPatcher, _field_value
+from generate_ui import design_hash, render_design, render_design_items
+
+BASE_DESIGN = {
+    "title": "AI Panel",
+    "header": "Hoş Geldiniz!",
+    "description": "Kişisel gösterge paneli",
+    "background": "#ffffff",
+    "color": "#222222",
+    "layout": "grid",
+    "cards": [{"title": f"Kart {i}", "content": f"Kart {i} için açıklama metni."} for i in range(8)],
+    "buttons": [{"text": "Kaydet", "action": "#"}, {"text": "Paylaş", "action": "/share"}]
+}
+
+
+def scenarios(rng):
+    palette = copy.deepcopy(BASE_DESIGN)
+    palette.update(background="#1e1e2f", color="#f0f0f0")
+    added = copy.deepcopy(BASE_DESIGN)
+    added["cards"].append({"title": "Öneri", "content": "Kullanıcı geri bildirimine göre eklendi.", "source": "agent"})
+    compacted = copy.deepcopy(added)
+    del compacted["cards"][2]
+    compacted["header"] = "Tekrar Hoş Geldiniz!"
+    layout = copy.deepcopy(BASE_DESIGN)
+    layout["layout"] = "list"
+    layout["buttons"][1]["text"] = "Dışa Aktar"
+    return [
+        ("renk paleti", BASE_DESIGN, palette),
+        ("kart ekleme", BASE_DESIGN, added),
+        ("kart çıkarma + başlık", added, compacted),
+        ("yerleşim + buton", BASE_DESIGN, layout),
+        ("rastgele tasarım (havuz)", build_random_design(rng), build_random_design(rng)),
+    ]
+
+
+def apply_ops(design, ops):
+    """İstemcideki applyDesignPatch'in yaptığını sayfa modelinde (alan metinleri + öğe HTML'leri) uygular."""
+    page = {field: _field_value(design, field) for field in PATCH_FIELDS}
+    for field in PATCH_LIST_FIELDS:
+        page[field] = render_design_items(field, design.get(field) or [])
+    for op in ops:
+        if op["op"] == "set":
+            page[op["field"]] = op["value"]
+        else:
+            page[op["field"]][op["index"]:op["index"] + op["remove"]] = op["html"]
+    return page
+
+
+def expected_page(design):
+    return apply_ops(design, [])
+
+
+def body_of(response):
+    return json.dumps(response, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+HARNESS = """<!DOCTYPE html>
+<html lang="tr"><head><meta charset="UTF-8"><title>DOM yaması ölçümü</title></head>
+<body><pre id="out">ölçülüyor...</pre><iframe id="frame" style="width:1024px;height:768px"></iframe>
+<script>
+const CASES = %(cases)s;
+const REPEAT = %(repeat)d;
+const frame = document.getElementById('frame');
+function load(html) {
+    const doc = frame.contentDocument;
+    doc.open(); doc.write(html); doc.close();
+    return frame.contentWindow;
+}
+const out = [];
+for (const c of CASES) {
+    let patchTime = 0, fullTime = 0;
+    for (let i = 0; i < REPEAT; i++) {
+        const win = load(c.old_html);
+        win.document.body.offsetHeight;
+        let t = performance.now();
+        if (!win.applyDesignPatch(c.patch)) throw new Error('yama uygulanamadı: ' + c.name);
+        win.document.body.offsetHeight;
+        patchTime += performance.now() - t;
+
+        load(c.old_html).document.body.offsetHeight;
+        t = performance.now();
+        const doc = frame.contentDocument;
+        doc.open(); doc.write(c.new_html); doc.close();
+        doc.body.offsetHeight;
+        fullTime += performance.now() - t;
+    }
+    out.push(c.name.padEnd(26) + ' | yama ' + (patchTime / REPEAT).toFixed(3) + ' ms | tam ' + (fullTime / REPEAT).toFixed(3) + ' ms');
+}
+document.getElementById('out').textContent = out.join('\\n');
+</script></body></html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DOM yaması benchmark'ı.")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--html", help="Tarayıcıda istemci süresini ölçen sayfanın yazılacağı yol")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    rows = []
+    cases = []
+    for name, old, new in scenarios(rng):
+        old_digest, new_digest = design_hash(old), design_hash(new)
+        old_html, _ = render_design(old, css_url=f"/generated_ui/{old_digest}.css", digest=old_digest)
+        new_html, _ = render_design(new, css_url=f"/generated_ui/{new_digest}.css", digest=new_digest)
+
+        patcher = DesignPatcher()
+        patcher.remember(old_digest, old)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            patch = patcher.patch(old_digest, new_digest, new, new_html)
+        patch_ms = (time.perf_counter() - started) / args.repeat * 1000
+        if patch is None:
+            rows.append((name, None, None, None, None, patch_ms, False))
+            continue
+
+        full = body_of({"status": "ok", "mode": "full", "html": new_html, "digest": new_digest})
+        patched = body_of({"status": "ok", "mode": "patch", **patch})
+        correct = apply_ops(old, patch["ops"]) == expected_page(new)
+        rows.append((name, len(full), len(patched), len(gzip.compress(full)), len(gzip.compress(patched)), patch_ms, correct))
+        cases.append({"name": name, "old_html": old_html, "new_html": new_html, "patch": patch})
+
+    print(f"\n📊 yanıt boyutu ve sunucu süresi ({args.repeat} tekrar)")
+    for name, full, patched, full_gz, patched_gz, patch_ms, correct in rows:
+        if full is None:
+            print(f"   {name:26s} | yama tam sayfadan büyük, tam render'a düşüldü")
+            continue
+        print(f"   {name:26s} | tam {full:6d} B (gzip {full_gz:5d}) | yama {patched:5d} B (gzip {patched_gz:5d}) | "
+              f"x{full / patched:5.1f} küçük | üretim {patch_ms:6.3f} ms | doğru: {'✅' if correct else '❌'}")
+
+    if args.html:
+        # </script> kapanışı gömülü JSON'u bölmesin
+        cases_json = re.sub(r"</", r"<\\/", json.dumps(cases, ensure_ascii=False))
+        with open(args.html, "w", encoding="utf-8") as f:
+            f.write(HARNESS % {"cases": cases_json, "repeat": args.repeat})
+        print(f"\n🌐 İstemci uygulama süresi için tarayıcıda açın: {args.html}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# bench_feedback_writes.py - Eşzamanlı geri bildirim yazma stres testi
+#
+# N süreç x T iş parçacığı aynı JSONL dosyasına GroupCommitWriter ile yazar.
+# Sonunda saniyedeki olay sayısı raporlanır ve kayıp kayıt olmadığı doğrulanır.
+#
+#   python benchmarks/bench_feedback_writes.py --processes 4 --threads 8 --events 250
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_core.jsonl_store import GroupCommitWriter, JsonlStore
+
+
+def writer_process(path, proc_id, threads, events, flush_interval):
+    store = JsonlStore(path)
+    writer = GroupCommitWriter(store, flush_interval=flush_interval)
+
+    def worker(thread_id):
+        for i in range(events):
+            writer.submit({
+                "timestamp": datetime.now().isoformat(),
+                "id": f"{proc_id}-{thread_id}-{i}",
+                "approved": i % 2 == 0
+            })
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    writer.close()
+    return writer.commits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geri bildirim yazıcısı için eşzamanlılık stres testi.")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--events", type=int, default=250, help="İş parçacığı başına olay sayısı")
+    parser.add_argument("--flush-interval", type=float, default=0.02)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feedback_loop.jsonl")
+        started = time.perf_counter()
+        with multiprocessing.Pool(args.processes) as pool:
+            commits = pool.starmap(writer_process, [
+                (path, p, args.threads, args.events, args.flush_interval)
+                for p in range(args.processes)
+            ])
+        elapsed = time.perf_counter() - started
+
+        expected = args.processes * args.threads * args.events
+        ids = [r["id"] for r in JsonlStore(path).iter_records()]
+        lost = expected - len(set(ids))
+        duplicates = len(ids) - len(set(ids))
+
+    print(f"📊 {args.processes} süreç x {args.threads} iş parçacığı, toplam {expected} olay")
+    print(f"   Süre          : {elapsed:.2f} sn")
+    print(f"   Olay/sn       : {expected / elapsed:,.0f}")
+    print(f"   Commit sayısı : {sum(commits)} (ortalama grup: {expected / max(1, sum(commits)):.1f} olay)")
+    print(f"   Kayıp kayıt   : {lost}, tekrar eden: {duplicates}")
+    if lost or duplicates:
+        sys.exit(1)
+    print("✅ Kayıp kayıt yok.")
+
+
+if __name__ == "__main__":
+    main()
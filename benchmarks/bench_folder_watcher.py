@@ -0,0 +1,109 @@
+# bench_folder_watcher.py - auto_folder_manager izleyicisi: eski / debounce'lu karşılaştırma
+#
+# Geçici bir klasörde data/design.json art arda kaydedilir (agent_loop gibi
+# json.dump ile). Ölçülenler:
+#   - alınan olay sayısı ve yapılan arayüz üretimi sayısı
+#   - watchdog iş parçacığının olay başına en uzun bloklanma süresi
+#
+#   python benchmarks/bench_folder_watcher.py --saves 50 --interval 0.02
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+import auto_folder_manager
+from generate_ui import generate_ui_from_design
+
+
+class LegacyHandler(FileSystemEventHandler):
+    """Eski davranış: her olayda watchdog iş parçacığında senkron üretim."""
+
+    def __init__(self):
+        super().__init__()
+        self.events_received = 0
+        self.regenerations = 0
+
+    def on_modified(self, event):
+        self.events_received += 1
+        if not event.is_directory and event.src_path.endswith("design.json"):
+            generate_ui_from_design(design_file_path=event.src_path)
+            self.regenerations += 1
+
+    on_created = on_modified
+
+
+def timed(handler):
+    """Handler'ın dispatch süresini ölçen sarmalayıcı."""
+    original = handler.dispatch
+    handler.max_block = 0.0
+
+    def dispatch(event):
+        started = time.perf_counter()
+        original(event)
+        handler.max_block = max(handler.max_block, time.perf_counter() - started)
+
+    handler.dispatch = dispatch
+    return handler
+
+
+def run(handler, saves, interval, settle):
+    design = {"title": "Panel", "header": "Başlık", "description": "", "cards": [], "buttons": []}
+    observer = Observer()
+    observer.schedule(handler, path=".", recursive=True)
+    observer.start()
+    time.sleep(0.2)
+    started = time.perf_counter()
+    for i in range(saves):
+        design["cards"].append({"title": f"Kart {i}", "content": "İçerik " * 20})
+        with open("data/design.json", "w", encoding="utf-8") as f:
+            json.dump(design, f, indent=4, ensure_ascii=False)
+        time.sleep(interval)
+    time.sleep(settle)
+    if hasattr(handler, "queue"):
+        handler.queue.flush(timeout=30)
+    elapsed = time.perf_counter() - started
+    observer.stop()
+    observer.join()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="auto_folder_manager izleyici benchmark'ı.")
+    parser.add_argument("--saves", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.02, help="Kayıtlar arası bekleme (sn)")
+    parser.add_argument("--debounce", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.makedirs("data")
+
+        legacy = timed(LegacyHandler())
+        run(legacy, args.saves, args.interval, settle=1.0)
+
+        handler = timed(auto_folder_manager.NewFileHandler(debounce=args.debounce))
+        run(handler, args.saves, args.interval, settle=args.debounce + 0.5)
+        handler.close()
+        stats = handler.stats()
+        os.chdir(PROJECT_ROOT)
+
+    print(f"\n📊 {args.saves} kayıt, {args.interval * 1000:.0f} ms arayla")
+    print(f"   eski       : {legacy.events_received:4d} olay, {legacy.regenerations:4d} üretim, "
+          f"en uzun bloklanma {legacy.max_block * 1000:7.2f} ms")
+    print(f"   debounce'lu: {stats['events_received']:4d} olay, {stats['regenerations']:4d} üretim, "
+          f"en uzun bloklanma {handler.max_block * 1000:7.2f} ms "
+          f"(yok sayılan {stats['events_ignored']}, birleştirilen {stats['events_coalesced']})")
+
+
+if __name__ == "__main__":
+    main()
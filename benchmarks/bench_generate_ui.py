@@ -0,0 +1,56 @@
+# bench_generate_ui.py - render_design için saniyedeki render sayısı
+#
+# 10, 1.000 ve 10.000 kartlı sentetik tasarımlar yalnızca bellekte render
+# edilir (diske yazılmaz).
+#
+#   python benchmarks/bench_generate_ui.py --seconds 2
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from generate_ui import render_design
+
+
+def make_design(card_count):
+    return {
+        "title": "Benchmark Paneli",
+        "header": "Performans Testi",
+        "description": "Sentetik tasarım",
+        "background": "#ffffff",
+        "color": "#222222",
+        "cards": [{"title": f"Kart {i}", "content": f"İçerik <{i}> & açıklama"} for i in range(card_count)],
+        "buttons": [{"text": "Raporları Gör", "action": "#"}, {"text": "Kaydet", "action": "#"}]
+    }
+
+
+def bench(design, seconds):
+    render_design(design)  # ısınma: şablon derleme/bytecode önbelleği
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        html, css = render_design(design)
+        count += 1
+    elapsed = time.perf_counter() - started
+    return count / elapsed, len(html) + len(css)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="generate_ui.render_design mikro benchmark.")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Her boyut için ölçüm süresi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'kart':>8} | {'render/sn':>12} | {'çıktı (KB)':>10}")
+    for size in args.sizes:
+        rate, size_bytes = bench(make_design(size), args.seconds)
+        print(f"{size:>8} | {rate:>12,.1f} | {size_bytes / 1024:>10,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# bench_model_server.py - Sıcak model sunucusu ve çağrı başına pipeline karşılaştırması
+#
+# Rastgele ağırlıklı küçük bir GPT-2 ile (CPU) ölçülenler:
+#   - model yükleme süresi
+#   - ilk token gecikmesi
+#   - saniyedeki token (tek tek / batch)
+#   - eski yöntem: her çağrıda transformers.pipeline(...) kurulumu
+#
+#   python benchmarks/bench_model_server.py --rounds 5 --max-new-tokens 64
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_core.design_generator import PROMPTS
+from ai_core.model_server import GenerationServer
+from benchmarks.tiny_gpt2 import build_tiny_gpt2
+
+
+def legacy_generate(model_path, prompt, max_new_tokens):
+    from transformers import pipeline
+    generator = pipeline('text-generation', model=model_path)
+    return generator(prompt, max_new_tokens=max_new_tokens)[0]['generated_text']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model sunucusu benchmark'ı (küçük rastgele GPT-2).")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--n-layer", type=int, default=2)
+    parser.add_argument("--n-embd", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = build_tiny_gpt2(os.path.join(tmp, "tiny-gpt2"), n_layer=args.n_layer, n_embd=args.n_embd)
+
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            legacy_generate(model_path, PROMPTS[0], args.max_new_tokens)
+        legacy_per_call = (time.perf_counter() - started) / args.rounds
+
+        server = GenerationServer(model_path)
+        ttft = min(server.first_token_latency(PROMPTS[0]) for _ in range(3))
+
+        before = server.generated_tokens
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            for prompt in PROMPTS:
+                server.generate([prompt], max_new_tokens=args.max_new_tokens, temperature=0)
+        sequential = time.perf_counter() - started
+        sequential_tokens = server.generated_tokens - before
+
+        before = server.generated_tokens
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            server.generate(PROMPTS, max_new_tokens=args.max_new_tokens, temperature=0)
+        batched = time.perf_counter() - started
+        batched_tokens = server.generated_tokens - before
+        print(f"📊 Küçük GPT-2 ({args.n_layer} katman, {args.n_embd} boyut), {args.max_new_tokens} yeni token")
+        print(f"   Model yükleme süresi          : {server.load_time * 1000:8.1f} ms")
+        print(f"   İlk token gecikmesi           : {ttft * 1000:8.1f} ms")
+        print(f"   Eski yöntem (pipeline/çağrı)  : {legacy_per_call * 1000:8.1f} ms / tasarım")
+        print(f"   Sunucu, tek tek               : {sequential / (args.rounds * len(PROMPTS)) * 1000:8.1f} ms / tasarım"
+              f" ({sequential_tokens / sequential:,.0f} token/sn)")
+        print(f"   Sunucu, batch ({len(PROMPTS)} prompt)      : {batched / (args.rounds * len(PROMPTS)) * 1000:8.1f} ms / tasarım"
+              f" ({batched_tokens / batched:,.0f} token/sn)")
+        print(f"   Sunucu istatistikleri         : {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# bench_openai_cache.py - OpenAI yanıt önbelleği ve istek birleştirme ölçümü
+#
+# Yerel sahte sunucuya (mock_openai_server.py) karşı ölçülenler:
+#   1) eski yol: her çağrıda yeni openai.OpenAI() istemcisi
+#   2) önbellekli istemci: ilk çağrı (miss) ve tekrarlar (hit)
+#   3) aynı anda gelen özdeş istekler: üst akışa giden çağrı sayısı
+#
+#   python benchmarks/bench_openai_cache.py --calls 50 --concurrent 32 --delay 0.1
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+os.environ.setdefault("OPENAI_API_KEY", "sk-mock")
+
+import openai
+
+from ai_dashboard.ai_client import CachedCompletionClient, ResponseCache
+from benchmarks.mock_openai_server import start_mock_server
+
+MODEL = "gpt-4o-mini"
+PROMPT = "Modern ve minimalist bir dashboard teması için JSON üret."
+
+
+def legacy_call(base_url, prompt):
+    client = openai.OpenAI(base_url=base_url)
+    response = client.chat.completions.create(
+        model=MODEL, messages=[{"role": "user", "content": prompt}], max_tokens=800, temperature=0.7
+    )
+    return response.choices[0].message.content
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI yanıt önbelleği benchmark'ı (yerel sahte sunucu).")
+    parser.add_argument("--calls", type=int, default=50, help="Tekrarlanan çağrı sayısı")
+    parser.add_argument("--concurrent", type=int, default=32, help="Aynı anda gönderilen özdeş istek sayısı")
+    parser.add_argument("--delay", type=float, default=0.1, help="Sahte sunucu gecikmesi (sn)")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(delay=args.delay)
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        for _ in range(args.calls):
+            legacy_call(base_url, PROMPT)
+        legacy = time.perf_counter() - started
+        legacy_requests = server.requests
+
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"))
+        client = CachedCompletionClient(cache=cache, base_url=base_url)
+        started = time.perf_counter()
+        for _ in range(args.calls):
+            client.complete(MODEL, PROMPT)
+        cached = time.perf_counter() - started
+        cached_upstream = client.stats()["upstream_calls"]
+
+        before = server.requests
+        with ThreadPoolExecutor(max_workers=args.concurrent) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(lambda _: client.complete(MODEL, "eşzamanlı istek"), range(args.concurrent)))
+            burst = time.perf_counter() - started
+        burst_upstream = server.requests - before
+
+        # Süreç yeniden başlasa da önbellek diskten okunur
+        reopened = CachedCompletionClient(cache=ResponseCache(os.path.join(tmp, "cache.sqlite3")), base_url=base_url)
+        before = server.requests
+        reopened.complete(MODEL, PROMPT)
+        persisted = server.requests == before
+
+        print(f"📊 {args.calls} tekrarlı çağrı (gecikme {args.delay * 1000:.0f} ms)")
+        print(f"   eski yol      : {legacy / args.calls * 1000:8.2f} ms/çağrı  ({legacy_requests} üst akış isteği)")
+        print(f"   önbellekli    : {cached / args.calls * 1000:8.2f} ms/çağrı  ({cached_upstream} üst akış isteği)")
+        print(f"📊 {args.concurrent} özdeş eşzamanlı istek: {burst * 1000:.1f} ms, "
+              f"üst akış {burst_upstream}, tutarlı yanıt: {len(set(results)) == 1}")
+        print(f"💾 Yeniden açılan önbellekten yanıt: {persisted}")
+        print(f"📈 İstatistikler: {client.stats()}")
+        cache.close()
+        reopened.cache.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
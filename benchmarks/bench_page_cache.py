@@ -0,0 +1,92 @@
+# bench_page_cache.py - /generated_ui gecikme karşılaştırması (p50/p99)
+#
+# Flask test istemcisiyle:
+#   1) eski yol: templates/generated_ui.html her istekte render_template ile
+#   2) önbelleksiz: her istekte tasarım JSON'u okunup render edilir
+#   3) bellek içi sayfa önbelleği (200)
+#   4) If-None-Match ile koşullu GET (304)
+# 2-4 için `--cards` kartlı sentetik bir tasarım kullanılır.
+#
+#   python benchmarks/bench_page_cache.py --requests 3000 --cards 200
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+from flask import render_template
+
+import app as app_module
+import page_cache as page_cache_module
+
+
+def legacy_generated_ui():
+    return render_template('generated_ui.html')
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def measure(client, path, n, headers=None, before_each=None):
+    samples = []
+    status = None
+    for _ in range(n):
+        if before_each:
+            before_each()
+        started = time.perf_counter()
+        response = client.get(path, headers=headers or {})
+        response.get_data()
+        samples.append(time.perf_counter() - started)
+        status = response.status_code
+        response.close()
+    return samples, status
+
+
+def report(label, samples, status):
+    print(f"   {label:<28} | {status} | p50 {percentile(samples, 0.50) * 1000:7.3f} ms"
+          f" | p99 {percentile(samples, 0.99) * 1000:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Üretilmiş arayüz sayfa önbelleği yük testi.")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--cards", type=int, default=200, help="Sentetik tasarımdaki kart sayısı")
+    args = parser.parse_args()
+
+    app = app_module.app
+    app.add_url_rule('/legacy_generated_ui', 'legacy_generated_ui', legacy_generated_ui)
+    client = app.test_client()
+    client.set_cookie('theme', 'dark')
+    cache = app_module.page_cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        design_file = os.path.join(tmp, "design.json")
+        with open(design_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "title": "Yük Testi", "header": "Sayfa Önbelleği", "description": "Sentetik",
+                "cards": [{"title": f"Kart {i}", "content": f"İçerik {i}"} for i in range(args.cards)],
+                "buttons": [{"text": "Kaydet", "action": "#"}]
+            }, f, ensure_ascii=False)
+        page_cache_module.get_latest_design_file = lambda: design_file
+
+        print(f"📊 {args.requests} istek / senaryo, {args.cards} kart")
+        report("Eski (dosyadan render)", *measure(client, '/legacy_generated_ui', args.requests))
+        report("Önbelleksiz (her istekte)", *measure(client, '/generated_ui', args.requests, before_each=cache.invalidate))
+
+        etag = client.get('/generated_ui').headers['ETag']
+        report("Bellek önbelleği (200)", *measure(client, '/generated_ui', args.requests))
+        report("Koşullu GET (304)", *measure(client, '/generated_ui', args.requests, {"If-None-Match": etag}))
+        print(f"   Önbellek: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench_prefix_cache.py - Önek KV önbelleğiyle/önbelleksiz ilk token süresi (TTFT)
+#
+# design_generator prompt'ları ve ai_designer'daki gibi uzun sabit bir
+# prompt bloğu, küçük rastgele GPT-2 ile ölçülür.
+#
+#   python benchmarks/bench_prefix_cache.py --runs 20 --n-layer 4 --n-embd 128
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from ai_core.design_generator import PROMPTS
+from ai_core.model_server import GenerationServer
+from benchmarks.tiny_gpt2 import build_tiny_gpt2
+
+# ai_designer.main içindeki varsayılan prompt ile aynı yapıda uzun sabit blok
+LONG_PROMPT = (
+    "Modern, minimalist ve profesyonel bir web dashboard arayüzü için JSON formatında bir tema üret. "
+    "JSON formatı şu şekilde olmalı: "
+    '{"title": "Sayfa Başlığı", "header": "Ana Başlık", "description": "Kısa bir açıklama", '
+    '"style": {"background": "#rrggbb", "color": "#rrggbb"}, "components": ['
+    '{"type": "card", "title": "Kart Başlığı 1", "value": "İçerik 1"}, '
+    '{"type": "chart", "title": "Grafik Başlığı", "data": {"type": "bar", "label": "Veri", "labels": ["A", "B", "C"], "values": [10, 20, 15]}}, '
+    '{"type": "button", "label": "Eylem Butonu"}'
+    ']} '
+    "Açık ve pastel tonlarda, okunabilir renkler kullan."
+)
+
+
+def ttft(server, prompt, runs):
+    samples = []
+    for _ in range(runs):
+        _, latency = server.generate_cached(prompt, max_new_tokens=1, temperature=0)
+        samples.append(latency)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Önek KV önbelleği TTFT benchmark'ı.")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--n-layer", type=int, default=4)
+    parser.add_argument("--n-embd", type=int, default=128)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = build_tiny_gpt2(os.path.join(tmp, "tiny-gpt2"), n_layer=args.n_layer, n_embd=args.n_embd)
+        uncached = GenerationServer(model_path, prefix_cache=None)
+        cached = GenerationServer(model_path)
+        cached.warm_prefixes(PROMPTS + [LONG_PROMPT])
+
+        print(f"📊 TTFT medyanı ({args.runs} tekrar), GPT-2 {args.n_layer} katman / {args.n_embd} boyut")
+        print(f"{'prompt':>34} | {'token':>5} | {'önbelleksiz':>11} | {'önbellekli':>10} | {'hızlanma':>8}")
+        for prompt in PROMPTS + [LONG_PROMPT]:
+            without = ttft(uncached, prompt, args.runs)
+            with_cache = ttft(cached, prompt, args.runs)
+            tokens = len(cached.tokenizer.encode(prompt))
+            print(f"{prompt[:34]:>34} | {tokens:>5} | {without * 1000:>8.2f} ms | {with_cache * 1000:>7.2f} ms | x{without / with_cache:>6.1f}")
+
+        # Kısmi eşleşme: önbellekteki önek + yeni bir son ek
+        suffix_prompt = LONG_PROMPT + " Koyu tema da öner."
+        print(f"{'kısmi önek (uzun prompt + ek)':>34} | {len(cached.tokenizer.encode(suffix_prompt)):>5} | "
+              f"{ttft(uncached, suffix_prompt, args.runs) * 1000:>8.2f} ms | {ttft(cached, suffix_prompt, 1) * 1000:>7.2f} ms |")
+        print(f"   Önbellek: {cached.prefix_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# bench_regenerate_pool.py - /api/regenerate_ui: istek içinde üretim / önceden üretilmiş havuz
+#
+# Geçici bir klasörde Flask test istemcisiyle POST /api/regenerate_ui çağrılır:
+#   1) istek içinde üretim: create_design_json (depoya yazma + HTML/CSS üretimi)
+#      ve üretilen sayfanın okunması (havuz öncesi bu endpoint'in yapacağı iş)
+#   2) havuz: istek yalnızca hazır bir kaydı alır
+# Havuz için iki yük ölçülür: istekler arası bekleme ile (dolum hızının altında)
+# ve ardışık patlama (dolum hızının üstünde, ıskalamalar görünür).
+#
+#   python benchmarks/bench_regenerate_pool.py --requests 300 --interval 0.005
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def summarize(label, latencies):
+    print(f"   {label:28s} | p50 {statistics.median(latencies) * 1000:7.3f} ms | "
+          f"p99 {percentile(latencies, 0.99) * 1000:7.3f} ms | en kötü {max(latencies) * 1000:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yeniden oluşturma havuzu benchmark'ı.")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--interval", type=float, default=0.005, help="Sürekli yükte istekler arası bekleme (sn)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.makedirs("data")
+        with contextlib.redirect_stdout(io.StringIO()):
+            import app as app_module
+            from ai_dashboard.create_design import create_design_json
+            from generate_ui import get_latest_design_file
+        client = app_module.app.test_client()
+        pool = app_module.design_pool.start()
+
+        inline = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                create_design_json()
+                get_latest_design_file()
+                with open("templates/generated_ui.html", "r", encoding="utf-8") as f:
+                    f.read()
+                inline.append(time.perf_counter() - started)
+
+        pool.wait_full(timeout=30)
+        steady = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                response = client.post("/api/regenerate_ui")
+                steady.append(time.perf_counter() - started)
+                assert response.get_json()["status"] == "ok"
+                time.sleep(args.interval)
+        steady_stats = client.get("/api/design_pool/stats").get_json()
+
+        pool.wait_full(timeout=30)
+        burst = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                client.post("/api/regenerate_ui")
+                burst.append(time.perf_counter() - started)
+        burst_stats = client.get("/api/design_pool/stats").get_json()
+        digest = client.post("/api/regenerate_ui").get_json()["digest"]
+        css_ok = client.get(f"/generated_ui/{digest}.css").status_code == 200
+        pool.stop()
+        os.chdir(PROJECT_ROOT)
+
+    print(f"\n📊 {args.requests} istek / senaryo")
+    summarize("istek içinde üretim", inline)
+    summarize(f"havuz ({args.interval * 1000:.0f} ms arayla)", steady)
+    summarize("havuz (patlama)", burst)
+    print(f"   sürekli yük ıskalama: {steady_stats['misses']} | patlama sonrası toplam ıskalama: {burst_stats['misses']} "
+          f"(oran {burst_stats['miss_rate']}) | dolum hızı {burst_stats['refill_rate_per_sec']}/sn, "
+          f"üretim {burst_stats['avg_produce_ms']} ms | sunulan tasarımın CSS'i: {'✅' if css_ok else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
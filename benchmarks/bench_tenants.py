@@ -0,0 +1,127 @@
+# bench_tenants.py - Çok kiracılı agent: tüm kiracıları tarama / bekleyenleri uyandırma
+#
+# Geçici bir klasörde N kiracı (varsayılan 10k, her biri kendi data/design.json
+# dosyasıyla) oluşturulur. Her turda kiracıların küçük bir kısmına olumsuz
+# geri bildirim yazılır, ardından:
+#   1) eski yol: her kiracı için update_design_based_on_feedback (tek süreçte
+#      tek panel için yazılmış döngünün kiracı sayısı kadar tekrarı); tüm
+#      kiracılar taranmadan örneklem üzerinden tahmin edilir
+#   2) TenantScheduler.run_once: yalnızca bekleyen işareti olan kiracılar
+# Ölçülenler: tur süresi, işlenen kiracı sayısı, kiracılar arası sızıntı
+# (başka kiracının çıktısının değişmemesi) ve en yüksek bellek.
+#
+#   python benchmarks/bench_tenants.py --tenants 10000 --active 0.01 --rounds 5
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import agent_loop
+from ai_core.feedback_manager import save_feedback
+from ai_core.tenant import get_tenant
+
+DESIGN = {
+    "title": "Panel",
+    "header": "Hoş Geldiniz!",
+    "description": "Kiracı paneli",
+    "background": "#ffffff",
+    "color": "#222222",
+    "cards": [{"title": "Motivasyon", "content": "Bugün öğrenmek için iyi bir gün!"}],
+    "buttons": [{"text": "Kaydet", "action": "#"}]
+}
+
+
+def build_tenants(count):
+    ids = [f"t{i:05d}" for i in range(count)]
+    for tenant_id in ids:
+        tenant = get_tenant(tenant_id)
+        os.makedirs(tenant.data_dir)
+        with open(tenant.design_file, "w", encoding="utf-8") as f:
+            json.dump(DESIGN, f)
+    return ids
+
+
+def send_feedback(rng, ids, active):
+    chosen = rng.sample(ids, max(1, int(len(ids) * active)))
+    for tenant_id in chosen:
+        for _ in range(3):
+            save_feedback({"approved": False, "comments": "Beğenmedim", "design": "design.json"}, tenant=tenant_id)
+    return set(chosen)
+
+
+def legacy_round(ids, sample):
+    """Her kiracıyı sırayla kontrol eden döngü; `sample` kiracı ölçülüp tümüne oranlanır."""
+    started = time.perf_counter()
+    for tenant_id in ids[:sample]:
+        agent_loop.update_design_based_on_feedback(tenant=tenant_id)
+    return (time.perf_counter() - started) * len(ids) / sample
+
+
+def mtimes(ids):
+    result = {}
+    for tenant_id in ids:
+        path = get_tenant(tenant_id).output_html
+        result[tenant_id] = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çok kiracılı agent benchmark'ı.")
+    parser.add_argument("--tenants", type=int, default=10000)
+    parser.add_argument("--active", type=float, default=0.01, help="Turda geri bildirim alan kiracı oranı")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--legacy-sample", type=int, default=500, help="Eski yolda gerçekten taranan kiracı sayısı")
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        started = time.perf_counter()
+        ids = build_tenants(args.tenants)
+        print(f"🏗  {args.tenants} kiracı oluşturuldu ({time.perf_counter() - started:.1f} sn)")
+
+        scheduler = agent_loop.TenantScheduler(workers=args.workers).start()
+        rounds = []
+        leaked = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.rounds):
+                chosen = send_feedback(rng, ids, args.active)
+                before = mtimes(ids)
+                started = time.perf_counter()
+                serviced = scheduler.run_once()
+                elapsed = time.perf_counter() - started
+                after = mtimes(ids)
+                changed = {t for t in ids if after[t] != before[t]}
+                leaked += len(changed - chosen)
+                rounds.append((len(chosen), serviced, elapsed, len(changed & chosen)))
+            # Eski yol: aynı kiracılar üzerinde tam tarama (yeni geri bildirim yokken bile)
+            send_feedback(rng, ids, args.active)
+            legacy = legacy_round(ids, min(args.legacy_sample, len(ids)))
+        scheduler.stop()
+        stats = scheduler.stats()
+        os.chdir(PROJECT_ROOT)
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\n📊 {args.tenants} kiracı, turda %{args.active * 100:.1f} aktif, {args.workers} işçi")
+    for i, (active, serviced, elapsed, regenerated) in enumerate(rounds, 1):
+        print(f"   tur {i}: {active:5d} aktif, {serviced:5d} uyandırılan, {regenerated:5d} yeniden üretilen, {elapsed * 1000:8.1f} ms")
+    average = sum(r[2] for r in rounds) / len(rounds)
+    print(f"   zamanlayıcı ortalama tur : {average:8.2f} sn")
+    print(f"   eski yol (tam tarama)    : {legacy:8.2f} sn (tahmini, {args.legacy_sample} kiracı örneklemi)")
+    print(f"   başka kiracıya sızan çıktı: {leaked}, hata: {stats['errors']}, en yüksek bellek {peak_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
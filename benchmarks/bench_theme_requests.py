@@ -0,0 +1,69 @@
+# bench_theme_requests.py - Tema çözümleme kancasının istek/sn ölçümü
+#
+# Flask test istemcisiyle aynı istekler önce eski kancayla (her istekte
+# os.listdir + isdir + rastgele tema), sonra ThemeRegistry tabanlı kancayla
+# gönderilir.
+#
+#   python benchmarks/bench_theme_requests.py --requests 5000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+from flask import g
+
+import app as app_module
+
+PATHS = ["/", "/static/css/style.css", "/static/js/app.js", "/change_theme/dark"]
+
+
+def legacy_set_theme():
+    themes = [
+        d for d in os.listdir("static/themes")
+        if os.path.isdir(os.path.join("static/themes", d))
+    ]
+    selected_theme = random.choice(themes)
+    g.theme = selected_theme
+    g.theme_config = app_module.load_theme(selected_theme)
+
+
+def measure(client, n):
+    started = time.perf_counter()
+    for i in range(n):
+        response = client.get(PATHS[i % len(PATHS)])
+        response.close()
+    return n / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tema kancası için önce/sonra istek/sn karşılaştırması.")
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = app_module.app
+    hooks = app.before_request_funcs[None]
+    current_hook = app_module.set_theme
+    index = hooks.index(current_hook)
+
+    hooks[index] = legacy_set_theme
+    before = measure(app.test_client(), args.requests)
+
+    hooks[index] = current_hook
+    after = measure(app.test_client(), args.requests)
+
+    print(f"📊 {args.requests} istek ({', '.join(PATHS)})")
+    print(f"   Önce (os.listdir her istekte) : {before:,.0f} istek/sn")
+    print(f"   Sonra (ThemeRegistry)         : {after:,.0f} istek/sn")
+    print(f"   Hızlanma                      : x{after / before:.2f}")
+    print(f"   Kayıt yeniden yükleme sayısı  : {app_module.theme_registry.reloads}")
+
+
+if __name__ == "__main__":
+    main()
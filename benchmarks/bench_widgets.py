@@ -0,0 +1,161 @@
+# bench_widgets.py - Panel widget'ları: widget başına sorgu / toplu, önbellekli veri katmanı
+#
+# Geçici bir SQLite veritabanında N kullanıcı oluşturulur ve W widget'lık bir
+# sayfa render edilir:
+#   1) eski yol: her widget kendi metriklerini ayrı COUNT sorgularıyla alır ve
+#      şablonunu render_template ile ayrı ayrı çözer
+#   2) veri katmanı (soğuk): önbellek boşken; tablo başına tek toplama sorgusu
+#   3) veri katmanı (sıcak): TTL içinde, sorgu yok
+# Ayrıca SQL dışı yavaş veri (`load()`) olan widget'ların sıralı / eşzamanlı
+# yüklenmesi ve yazma sonrası geçersiz kılmanın doğruluğu ölçülür.
+#
+#   python benchmarks/bench_widgets.py --users 100000 --widgets 20 --pages 50
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from flask import Flask, render_template
+
+from model.dashboard_widgets import UserStatsWidget, Widget, WidgetDataLayer, render_widgets
+
+DAY = 24 * 60 * 60
+
+
+def user_stats_templates(widget):
+    """Ölçüm widget'ları UserStatsWidget'ın şablonunu paylaşır."""
+    return [f"themes/{widget.theme}/widgets/user_stats.html", "themes/widgets/user_stats.html"]
+
+
+def make_widgets(theme, count, now):
+    """UserStatsWidget + farklı zaman aralıklarında yeni kullanıcı sayan widget'lar."""
+    widgets = [UserStatsWidget(theme)]
+    for days in range(1, count):
+        cutoff = now - days * DAY
+        cls = type(f"NewUsers{days}Widget", (Widget,), {
+            "type": f"new_users_{days}",
+            "metrics": {
+                "total_users": ("users", f"COALESCE(SUM(created >= {cutoff}), 0)"),
+                "active_users": ("users", f"COALESCE(SUM(created >= {cutoff} AND active != 0), 0)")
+            },
+            "template_names": user_stats_templates
+        })
+        widgets.append(cls(theme))
+    return widgets
+
+
+class SlowWidget(Widget):
+    type = "slow"
+    delay = 0.02
+
+    def __init__(self, theme, index):
+        super().__init__(theme)
+        self.index = index
+
+    @property
+    def cache_key(self):
+        return f"slow-{self.index}"
+
+    def template_names(self):
+        return user_stats_templates(self)
+
+    def load(self):
+        time.sleep(self.delay)
+        return {"total_users": self.index, "active_users": self.index}
+
+
+def legacy_page(conn, widgets):
+    html = []
+    for widget in widgets:
+        data = {name: conn.execute(f"SELECT {expr} FROM {table}").fetchone()[0]
+                for name, (table, expr) in widget.metrics.items()}
+        html.append(render_template(widget.template_names(), data=data))
+    return html
+
+
+def timed(fn, pages):
+    times = []
+    for _ in range(pages):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Panel widget veri katmanı benchmark'ı.")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--widgets", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--slow", type=int, default=5, help="SQL dışı yavaş veri yükleyen widget sayısı")
+    args = parser.parse_args()
+    rng = random.Random(42)
+    now = time.time()
+    app = Flask(__name__, template_folder=os.path.join(PROJECT_ROOT, "templates"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        layer = WidgetDataLayer(os.path.join(tmp, "dashboard.sqlite3"))
+        layer._conn.executemany(
+            "INSERT INTO users (name, active, created) VALUES (?, ?, ?)",
+            ((f"kullanıcı {i}", int(rng.random() < 0.3), now - rng.random() * 60 * DAY) for i in range(args.users))
+        )
+        layer._conn.commit()
+        widgets = make_widgets("default", args.widgets, now)
+
+        statements = []
+        layer._conn.set_trace_callback(statements.append)
+        with app.app_context():
+            statements.clear()
+            legacy_page(layer._conn, widgets)
+            legacy_queries = len(statements)
+            legacy = timed(lambda: legacy_page(layer._conn, widgets), args.pages)
+
+            def cold():
+                layer.invalidate()
+                render_widgets(widgets, layer)
+
+            statements.clear()
+            cold()
+            batched_queries = len(statements)
+            cold_time = timed(cold, args.pages)
+            render_widgets(widgets, layer)
+            statements.clear()
+            warm_time = timed(lambda: render_widgets(widgets, layer), args.pages)
+            warm_queries = len(statements)
+
+            # Yazma sonrası geçersiz kılma: yeni kullanıcı hemen görünmeli
+            before = layer.fetch([widgets[0]])[0]["total_users"]
+            layer.execute("INSERT INTO users (name, active, created) VALUES (?, 1, ?)", ("yeni", time.time()), table="users")
+            after = layer.fetch([widgets[0]])[0]["total_users"]
+
+            slow = [SlowWidget("default", i) for i in range(args.slow)]
+            started = time.perf_counter()
+            for widget in slow:
+                render_template(widget.template_names(), data=widget.load())
+            sequential_slow = time.perf_counter() - started
+            started = time.perf_counter()
+            render_widgets(slow, layer)
+            concurrent_slow = time.perf_counter() - started
+        stats = layer.stats()
+        layer.close()
+
+    print(f"\n📊 {args.users} kullanıcı, {args.widgets} widget'lık sayfa, {args.pages} sayfa (medyan)")
+    print(f"   eski yol (widget başına sorgu) : {legacy * 1000:8.2f} ms | sayfa başına {legacy_queries} sorgu")
+    print(f"   veri katmanı, soğuk önbellek   : {cold_time * 1000:8.2f} ms | sayfa başına {batched_queries} sorgu")
+    print(f"   veri katmanı, sıcak önbellek   : {warm_time * 1000:8.2f} ms | {args.pages} sayfada {warm_queries} sorgu")
+    print(f"   yazma sonrası geçersiz kılma   : {before} -> {after} {'✅' if after == before + 1 else '❌'}")
+    print(f"   {args.slow} yavaş widget ({SlowWidget.delay * 1000:.0f} ms) : sıralı {sequential_slow * 1000:.1f} ms | "
+          f"eşzamanlı {concurrent_slow * 1000:.1f} ms")
+    print(f"   önbellek: {stats}")
+
+
+if __name__ == "__main__":
+    main()
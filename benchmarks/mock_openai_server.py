@@ -0,0 +1,154 @@
+# mock_openai_server.py - Çevrimdışı testler için OpenAI uyumlu yerel sahte sunucu
+#
+# POST /v1/chat/completions isteğine sabit gecikmeyle geçerli bir tasarım
+# JSON'u döndürür. İstemciler `base_url` ile bu sunucuya yönlendirilir.
+# `--rate-limit-every N` ile her N. istek 429 (Retry-After) ile reddedilir.
+# "stream": true isteklerine yanıt SSE parçaları halinde, parça başına
+# `--chunk-delay` gecikmeyle gönderilir.
+#
+#   python benchmarks/mock_openai_server.py --port 8765 --delay 0.2
+#   python ai_dashboard/ai_designer.py --base-url http://127.0.0.1:8765/v1
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MOCK_DESIGN = {
+    "title": "Test Paneli",
+    "header": "Sahte Sunucu",
+    "description": "Çevrimdışı test tasarımı",
+    "style": {"background": "#f5f7fa", "color": "#2d3748"},
+    "components": [
+        {"type": "card", "title": "Kullanıcılar", "value": "1.204"},
+        {"type": "card", "title": "Gelir", "value": "₺48.000"},
+        {"type": "button", "label": "Raporu Aç"}
+    ]
+}
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, request, number, content):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        size = self.server.chunk_size
+        for start in range(0, len(content), size):
+            chunk = {
+                "id": f"chatcmpl-mock-{number}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "mock"),
+                "choices": [{"index": 0, "delta": {"content": content[start:start + size]}, "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.server.chunk_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            number = server.requests
+        if server.rate_limit_every and number % server.rate_limit_every == 0:
+            with server.lock:
+                server.rate_limited += 1
+            body = json.dumps({"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}).encode("utf-8")
+            self.send_response(429)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Retry-After", str(server.retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        time.sleep(server.delay)
+
+        prompt = request["messages"][-1]["content"]
+        design = dict(MOCK_DESIGN, description=f"{MOCK_DESIGN['description']} #{number}: {prompt[:40]}")
+        if server.components:
+            design["components"] = [
+                {"type": "card", "title": f"Kart {i + 1}", "value": f"Değer {i + 1}"} for i in range(server.components)
+            ]
+        content = "```json\n" + json.dumps(design, ensure_ascii=False, indent=2) + "\n```"
+        if request.get("stream"):
+            self._send_stream(request, number, content)
+            return
+        self._send_json(200, {
+            "id": f"chatcmpl-mock-{number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 60, "total_tokens": len(prompt.split()) + 60}
+        })
+
+
+def start_mock_server(host="127.0.0.1", port=0, delay=0.05, rate_limit_every=0, retry_after=0.05,
+                      chunk_delay=0.01, chunk_size=8, components=0):
+    """
+    Sunucuyu arka planda başlatır; (sunucu, base_url) döndürür.
+    `components` > 0 ise tasarım o kadar kartla üretilir.
+    """
+    server = ThreadingHTTPServer((host, port), MockOpenAIHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.chunk_delay = chunk_delay
+    server.chunk_size = chunk_size
+    server.components = components
+    server.rate_limit_every = rate_limit_every
+    server.retry_after = retry_after
+    server.requests = 0
+    server.rate_limited = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI uyumlu sahte sunucu.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.2, help="Yanıt başına yapay gecikme (sn)")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Her N. isteği 429 ile reddet (0: kapalı)")
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="Akış modunda parça başına gecikme (sn)")
+    parser.add_argument("--components", type=int, default=0, help="Tasarımdaki kart sayısı (0: varsayılan tasarım)")
+    args = parser.parse_args()
+    server, base_url = start_mock_server(args.host, args.port, args.delay, args.rate_limit_every,
+                                         chunk_delay=args.chunk_delay, components=args.components)
+    print(f"🧪 Sahte OpenAI sunucusu: {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# tiny_gpt2.py - Benchmark'lar için rastgele ağırlıklı küçük GPT-2 modeli
+#
+# Gerçek model ağırlıkları olmadan CPU'da denemek için: tasarım prompt'ları
+# üzerinde eğitilmiş byte-level BPE tokenizer + 2 katmanlı GPT-2.
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+CORPUS = [
+    '{"title": "Uzay Keşfi Paneli", "header": "Galaksi Raporları", "style": {"background": "#0a192f", "color": "#ccd6f6"}, "components": [',
+    '{"type": "card", "title": "Kart Başlığı", "value": "İçerik"}, {"type": "button", "label": "Eylem Butonu"}]}',
+    "Modern, minimalist ve profesyonel bir web dashboard arayüzü için JSON formatında bir tema üret.",
+    "Açık ve pastel tonlarda, okunabilir renkler kullan. Motivasyon, Rastgele Not, Bugünün İpucu, Yeni Özellik",
+]
+
+
+def build_tiny_gpt2(path, vocab_size=1000, n_layer=2, n_embd=64, seed=0):
+    """Model ve tokenizer'ı `path` klasörüne kaydeder ve klasör yolunu döndürür."""
+    import torch
+    from tokenizers import ByteLevelBPETokenizer
+    from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    torch.manual_seed(seed)
+    bpe = ByteLevelBPETokenizer()
+    bpe.train_from_iterator(CORPUS * 10, vocab_size=vocab_size, min_frequency=1, special_tokens=["<|endoftext|>"])
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=bpe, eos_token="<|endoftext|>", bos_token="<|endoftext|>")
+
+    config = GPT2Config(
+        vocab_size=len(tokenizer), n_positions=1024, n_layer=n_layer, n_head=2, n_embd=n_embd,
+        bos_token_id=tokenizer.eos_token_id, eos_token_id=tokenizer.eos_token_id
+    )
+    model = GPT2LMHeadModel(config)
+    os.makedirs(path, exist_ok=True)
+    model.save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return path
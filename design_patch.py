@@ -0,0 +1,110 @@
+import difflib
+import json
+
+from ai_core.lru_cache import LRUCache
+from generate_ui import _css_value, render_design_items
+
+# Yama üretebilmek için bellekte tutulan, istemcilere sunulmuş tasarım sayısı
+DESIGN_PATCH_HISTORY = 64
+
+# Tek değerli alanlar -> tam sayfadaki varsayılanları (generated_ui.html.j2 / .css.j2)
+PATCH_FIELDS = {
+    "title": "AI Panel",
+    "header": None,
+    "description": None,
+    "background": "#f4f4f4",
+    "color": "#333",
+    "layout": ""
+}
+# Satır içi stil olarak uygulanan alanlar (CSS dosyasıyla aynı temizlik)
+PATCH_STYLE_FIELDS = ("background", "color")
+PATCH_LIST_FIELDS = ("cards", "buttons")
+
+
+def _field_value(design, field):
+    value = design.get(field, PATCH_FIELDS[field])
+    if field in PATCH_STYLE_FIELDS:
+        return _css_value(value)
+    # Jinja `None` değerini de metin olarak basar; yama aynı çıktıyı vermeli
+    return str(value)
+
+
+def _item_key(item):
+    return json.dumps(item, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def diff_design(old: dict, new: dict) -> list:
+    """
+    İki tasarım arasındaki yapısal farkı DOM işlemleri olarak döndürür:
+
+        {"op": "set", "field": "header", "value": "..."}
+        {"op": "splice", "field": "cards", "index": 2, "remove": 1, "html": ["<div ...>"]}
+
+    Liste işlemleri sondan başa sıralıdır; sırayla uygulandığında indeksler
+    kaymaz. Eklenen öğelerin HTML'i tam sayfadaki makrolarla üretilir.
+    """
+    ops = []
+    for field in PATCH_FIELDS:
+        value = _field_value(new, field)
+        if value != _field_value(old, field):
+            ops.append({"op": "set", "field": field, "value": value})
+    for field in PATCH_LIST_FIELDS:
+        old_items = old.get(field) or []
+        new_items = new.get(field) or []
+        matcher = difflib.SequenceMatcher(
+            None, [_item_key(i) for i in old_items], [_item_key(i) for i in new_items], autojunk=False
+        )
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag == "equal":
+                continue
+            ops.append({
+                "op": "splice",
+                "field": field,
+                "index": i1,
+                "remove": i2 - i1,
+                "html": render_design_items(field, new_items[j1:j2])
+            })
+    return ops
+
+
+class DesignPatcher:
+    """
+    İstemcinin gösterdiği tasarımdan (`base` özeti) yenisine DOM yaması üretir.
+
+    Sunulan tasarımlar özetleriyle sınırlı bir LRU'da tutulur; `resolve`
+    verilirse (ör. diskteki güncel tasarım) bilinmeyen özetler için ona da
+    bakılır. Temel tasarım bulunamazsa ya da yama tam sayfadan büyükse
+    `None` döner ve çağıran tam render'a düşer.
+    """
+
+    def __init__(self, max_entries=DESIGN_PATCH_HISTORY, resolve=None):
+        self.designs = LRUCache(max_entries=max_entries)
+        self.resolve = resolve
+        self.patches = 0
+        self.fallbacks = 0
+
+    def remember(self, digest, design):
+        self.designs.put(digest, design)
+
+    def find(self, digest):
+        design = self.designs.get(digest)
+        if design is None and self.resolve is not None:
+            design = self.resolve(digest)
+        return design
+
+    def patch(self, base, digest, design, html):
+        """`base` -> `digest` yaması (`{"base", "digest", "ops"}`) ya da None."""
+        self.remember(digest, design)
+        old = self.find(base) if base else None
+        if old is None:
+            self.fallbacks += 1
+            return None
+        ops = diff_design(old, design)
+        if len(json.dumps(ops, ensure_ascii=False)) >= len(html):
+            self.fallbacks += 1
+            return None
+        self.patches += 1
+        return {"base": base, "digest": digest, "ops": ops}
+
+    def stats(self):
+        return {"patches": self.patches, "fallbacks": self.fallbacks, "known_designs": len(self.designs)}
@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from ai_core.design_model import validate_design
+from ai_core.design_store import get_design_store
+from ai_core.lru_cache import LRUCache
+from ai_dashboard.create_design import build_random_design
+from generate_ui import design_hash, render_design
+
+# Hazırda tutulacak önceden render edilmiş tasarım sayısı
+DESIGN_POOL_SIZE = 8
+# Dolum hızı bu pencere (sn) içindeki üretimlerden hesaplanır
+DESIGN_POOL_RATE_WINDOW = 60.0
+# Sunulmuş tasarımların CSS'i bu kadar kayıt için bellekte tutulur
+DESIGN_POOL_SERVED_CSS = 64
+
+PooledDesign = namedtuple("PooledDesign", ["digest", "design", "html", "css", "produced_at"])
+
+
+class DesignPool:
+    """
+    Önceden üretilip render edilmiş tasarımlardan oluşan sınırlı havuz.
+
+    Arka plandaki üretici iş parçacığı havuzu `size` kayda kadar doldurur;
+    istek yolu (`take()`) yalnızca hazır bir kaydı alır, böylece yeniden
+    oluşturma gecikmesi sabittir. Havuz boşsa bu bir ıskalamadır: sayılır ve
+    tasarım istek içinde üretilir. Sunulan tasarım depoya istek dışında,
+    tek iş parçacıklı bir yazıcıyla kaydedilir.
+
+    Üretici, `start()` çağrılmadıysa ilk `take()` ile başlar; havuzu yalnızca
+    içe aktarmak (CLI, benchmark, `flask routes`) iş parçacığı başlatmaz.
+    """
+
+    def __init__(self, size=DESIGN_POOL_SIZE, generator=build_random_design, persist=True,
+                 css_url_pattern="/generated_ui/{digest}.css"):
+        self.size = size
+        self.generator = generator
+        self.persist = persist
+        self.css_url_pattern = css_url_pattern
+        self.produced = 0
+        self.served = 0
+        self.misses = 0
+        self.errors = 0
+        self.produce_time = 0.0
+        self._ready = deque()
+        self._produced_at = deque()
+        self._served_css = LRUCache(max_entries=DESIGN_POOL_SERVED_CSS)
+        self._cond = threading.Condition()
+        self._running = False
+        self._started_at = None
+        self._thread = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="design-pool-writer") if persist else None
+
+    # --- Üretim ---
+    def _produce(self, background=True) -> PooledDesign:
+        started = time.perf_counter()
+        design = validate_design(self.generator()).to_dict()
+        digest = design_hash(design)
+        html, css = render_design(design, css_url=self.css_url_pattern.format(digest=digest), digest=digest)
+        entry = PooledDesign(digest, design, html, css, time.time())
+        if background:
+            # Dolum hızı yalnızca üreticinin katkısını gösterir (ıskalamalar ayrıca sayılır)
+            with self._cond:
+                self.produced += 1
+                self.produce_time += time.perf_counter() - started
+                self._produced_at.append(time.monotonic())
+                self._prune_rate_window()
+        return entry
+
+    def _prune_rate_window(self):
+        now = time.monotonic()
+        while self._produced_at and now - self._produced_at[0] > DESIGN_POOL_RATE_WINDOW:
+            self._produced_at.popleft()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and len(self._ready) >= self.size:
+                    self._cond.wait()
+                if not self._running:
+                    return
+            try:
+                entry = self._produce()
+            except Exception as e:
+                with self._cond:
+                    self.errors += 1
+                print(f"❌ Havuz için tasarım üretilemedi: {e}")
+                time.sleep(1.0)
+                continue
+            with self._cond:
+                self._ready.append(entry)
+                self._cond.notify_all()
+
+    def start(self):
+        with self._cond:
+            if self._running or self._started_at is not None:
+                return self
+            self._running = True
+            self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="design-pool-producer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+
+    def wait_full(self, timeout=None) -> bool:
+        """Havuz dolana kadar bekler (ısınma, testler)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while len(self._ready) < self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # --- İstek yolu ---
+    def take(self) -> PooledDesign:
+        """Hazır bir tasarım döndürür; havuz boşsa (ıskalama) istek içinde üretir."""
+        self.start()
+        with self._cond:
+            entry = self._ready.popleft() if self._ready else None
+            if entry is None:
+                self.misses += 1
+            self.served += 1
+            self._cond.notify_all()
+        if entry is None:
+            entry = self._produce(background=False)
+        self._served_css.put(entry.digest, entry.css)
+        if self._writer is not None:
+            self._writer.submit(self._save, entry)
+        return entry
+
+    def _save(self, entry):
+        try:
+            get_design_store().put(entry.design, source="design_pool")
+        except Exception as e:
+            with self._cond:
+                self.errors += 1
+            print(f"❌ Havuzdan sunulan tasarım kaydedilemedi: {e}")
+
+    def find_css(self, digest):
+        """Havuzdan sunulmuş bir tasarımın CSS'i (yoksa None)."""
+        return self._served_css.peek(digest)
+
+    # --- İstatistik ---
+    def stats(self):
+        with self._cond:
+            self._prune_rate_window()
+            uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+            window = min(DESIGN_POOL_RATE_WINDOW, uptime)
+            return {
+                "depth": len(self._ready),
+                "capacity": self.size,
+                "produced": self.produced,
+                "served": self.served,
+                "misses": self.misses,
+                "miss_rate": round(self.misses / self.served, 3) if self.served else None,
+                "errors": self.errors,
+                "refill_rate_per_sec": round(len(self._produced_at) / window, 3) if window else None,
+                "avg_produce_ms": round(self.produce_time / self.produced * 1000, 3) if self.produced else None
+            }
@@ -1,142 +1,250 @@
+import glob
+import hashlib
 import json
 import os
-import time
+import re
 
-def get_latest_design_file():
-    latest_file = "data/latest.txt"
-    if os.path.exists(latest_file):
-        with open(latest_file, "r", encoding="utf-8") as f:
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from ai_core.activity_log import ACTIVITY_UI, record_activity
+from ai_core.atomic_io import atomic_write
+from ai_core.design_model import load_design
+from ai_core.tenant import get_tenant
+
+# HTML/CSS şablonları (bir kez yüklenir, derlenmiş hali önbellekte tutulur)
+GENERATOR_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "generator")
+HTML_TEMPLATE = "generated_ui.html.j2"
+CSS_TEMPLATE = "generated_ui.css.j2"
+# Kart/buton parçaları (hem tam sayfa hem DOM yamaları aynı makroları kullanır)
+ITEMS_TEMPLATE = "design_items.html.j2"
+# Akış modunda tek bir bileşenin HTML parçası
+COMPONENT_TEMPLATE = "component.html.j2"
+
+# Tasarım özeti: normalize edilmiş JSON + şablon sürümü (şablon değişince çıktı da değişir)
+HASH_LENGTH = 12
+_HASH_META = re.compile(r'<meta name="design-hash" content="([0-9a-f]+)">')
+
+# Tema stil dosyaları (proje geneli; kiracı sayfaları da buradan bağlanır)
+THEME_STATIC_DIR = "static/themes"
+DEFAULT_THEME = "default"
+
+# CSS değerinden bildirim/blok kaçışına yol açabilecek karakterler
+_CSS_UNSAFE = re.compile(r"[;{}<>\"'\\\n\r]")
+
+
+def _css_value(value):
+    """CSS özellik değerini tek bir bildirim dışına taşamayacak şekilde temizler."""
+    return _CSS_UNSAFE.sub("", str(value))
+
+
+_env = Environment(
+    loader=FileSystemLoader(GENERATOR_TEMPLATE_DIR),
+    autoescape=select_autoescape(enabled_extensions=("html.j2",), default_for_string=True),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+)
+_env.filters["css_value"] = _css_value
+
+# Daha önce oluşturulmuş çıktı klasörleri (her çağrıda makedirs yapılmasın)
+_known_dirs = set()
+# Yazılan ve değişmediği için atlanan çıktı sayıları
+WRITE_STATS = {"written": 0, "skipped": 0}
+# Yeni çıktı yazıldığında çağrılacak dinleyiciler (ör. bellek içi sayfa önbelleği)
+_render_listeners = []
+
+
+def _template_fingerprint():
+    digest = hashlib.sha256()
+    for name in (HTML_TEMPLATE, CSS_TEMPLATE, ITEMS_TEMPLATE):
+        with open(os.path.join(GENERATOR_TEMPLATE_DIR, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+_TEMPLATE_FINGERPRINT = _template_fingerprint()
+
+
+def design_hash(design: dict, theme=None) -> str:
+    """
+    Tasarımın içerik özetini döndürür; aynı tasarım her zaman aynı özeti verir.
+    Varsayılan dışı bir tema verilirse özete katılır (tema sayfayı değiştirir).
+    """
+    normalized = json.dumps(design, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    digest = hashlib.sha256(_TEMPLATE_FINGERPRINT.encode("ascii"))
+    digest.update(normalized.encode("utf-8"))
+    if theme and theme != DEFAULT_THEME:
+        digest.update(b"\0theme:" + theme.encode("utf-8"))
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def theme_css_url(theme):
+    """Temanın stil dosyasının adresi; varsayılan tema ya da dosyası yoksa None."""
+    if not theme or theme == DEFAULT_THEME:
+        return None
+    if not os.path.exists(os.path.join(THEME_STATIC_DIR, theme, "css", "main.css")):
+        return None
+    return f"/{THEME_STATIC_DIR}/{theme}/css/main.css"
+
+
+def get_write_stats():
+    """Yazılan/atlanan çıktı sayıları."""
+    return dict(WRITE_STATS)
+
+
+def add_render_listener(callback):
+    """Her yeni çıktı yazıldığında `callback(digest, output_html_path)` çağrılır."""
+    _render_listeners.append(callback)
+
+
+LATEST_POINTER = "data/latest.txt"
+# latest.txt yolu -> (son okunan (inode, mtime, boyut), çözülen yol)
+_latest_pointers = {}
+
+
+def get_latest_design_file(tenant=None):
+    """
+    Kiracının latest.txt'sinin gösterdiği tasarım dosyası, yoksa data/design.json.
+    İşaretçi dosyası değişmedikçe (tek stat ile kontrol) yeniden okunmaz.
+    """
+    tenant = get_tenant(tenant)
+    pointer = LATEST_POINTER if tenant.is_default else tenant.latest_pointer
+    data_dir = os.path.dirname(pointer)
+    try:
+        st = os.stat(pointer)
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        signature = None
+    if signature is not None:
+        cached = _latest_pointers.get(pointer)
+        if cached and cached[0] == signature:
+            return cached[1]
+        with open(pointer, "r", encoding="utf-8") as f:
             name = f.read().strip()
-        path = os.path.join("data", name)
-        if os.path.exists(path):
+        path = os.path.join(data_dir, name)
+        if name and os.path.exists(path):
+            _latest_pointers[pointer] = (signature, path)
             return path
-    if os.path.exists("data/design.json"):
-        return "data/design.json"
+    design_file = os.path.join(data_dir, "design.json")
+    if os.path.exists(design_file):
+        return design_file
     raise FileNotFoundError("Hiçbir tasarım dosyası bulunamadı.")
 
-def generate_ui_from_design(design_file_path=None, output_html_path="templates/generated_ui.html", output_css_path="static/css/generated_ui.css"):
-    design_file = design_file_path or get_latest_design_file()
-
-    with open(design_file, "r", encoding="utf-8") as f:
-        design = json.load(f)
-
-    os.makedirs(os.path.dirname(output_html_path), exist_ok=True)
-    os.makedirs(os.path.dirname(output_css_path), exist_ok=True)
-
-    html_path = output_html_path
-    css_path = output_css_path
-
-    # HTML
-    css_version = int(time.time())
-    html = f"""
-<!DOCTYPE html>
-<html lang="tr">
-<head>
-    <meta charset="UTF-8">
-    <title>{design.get("title","AI Panel")}</title>
-    <link rel="stylesheet" href="/static/css/generated_ui.css?v={css_version}">
-</head>
-<body>
-    <header>
-        <h1>{design.get("header")}</h1>
-        <p>{design.get("description")}</p>
-    </header>
-    <main>
-        <section class="cards">
-            {''.join([f'<div class="card"><h3>{c["title"]}</h3><p>{c["content"]}</p></div>' for c in design.get("cards", [])])}
-        </section>
-        <section class="buttons">
-            {''.join([f'<button onclick="window.location=\'{b["action"]}\'">{b["text"]}</button>' for b in design.get("buttons", [])])}
-        </section>
-
-        <section class="feedback">
-            <button onclick="sendFeedback(true)">👍 Beğendim</button>
-            <button onclick="sendFeedback(false)">👎 Beğenmedim</button>
-        </section>
-
-        <section class="buttons">
-            <button onclick="regenerateUI()">Yeniden Oluştur</button>
-            <button onclick="window.location='/generated_ui'">Raporları Gör</button>
-        </section>
-    </main>
-
-<script>
-function regenerateUI() {{
-    fetch('/api/regenerate_ui', {{method: 'POST'}})
-        .then(r => r.json())
-        .then(data => {{
-            if (data.status === "ok") {{
-                document.open();
-                document.write(data.html);
-                document.close();
-            }} else {{
-                alert("Hata: " + data.message);
-            }}
-        }})
-}}
-function sendFeedback(approved) {{
-    fetch('/feedback', {{
-        method: 'POST',
-        headers: {{'Content-Type': 'application/json'}},
-        body: JSON.stringify({{
-            approved: approved,
-            comments: approved ? "Beğendim" : "Beğenmedim"
-        }})
-    }})
-    .then(r => r.json())
-    .then(data => alert("Geri bildiriminiz kaydedildi!"));
-}}
-</script>
-</body>
-</html>
-"""
-
-    # CSS
-    css = f"""
-body {{
-    font-family: Arial, sans-serif;
-    margin: 0;
-    padding: 0;
-    background: {design.get("background","#f4f4f4")};
-    color: {design.get("color","#333")};
-}}
-header {{
-    text-align: center;
-    padding: 20px;
-    background: white;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-}}
-.cards {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-    gap: 20px;
-    padding: 20px;
-}}
-.card {{
-    background: white;
-    padding: 15px;
-    border-radius: 10px;
-    box-shadow: 0 2px 6px rgba(0,0,0,0.1);
-}}
-.buttons {{
-    text-align: center;
-    padding: 20px;
-}}
-button {{
-    margin: 10px;
-    padding: 10px 20px;
-    font-size: 16px;
-    cursor: pointer;
-}}
-.feedback {{
-    text-align: center;
-    margin-top: 30px;
-}}
-"""
-
-    with open(html_path, "w", encoding="utf-8") as f:
-        f.write(html)
-    with open(css_path, "w", encoding="utf-8") as f:
-        f.write(css)
-
-    print(f"✅ Yeni UI üretildi -> {html_path}")
+
+def render_design(design: dict, css_url="/static/css/generated_ui.css", css_version=None, digest=None, theme=None):
+    """
+    Tasarımdan (html, css) metinlerini üretir; diske hiçbir şey yazmaz.
+    Tüm metin alanları HTML için kaçışlanır. Sürüm verilmezse içerik özeti kullanılır.
+    `theme` verilirse sayfa o temanın sınıfını ve stil dosyasını kullanır.
+    """
+    digest = digest or design_hash(design, theme)
+    if css_version is None:
+        css_version = digest
+    if theme == DEFAULT_THEME:
+        theme = None
+    html = _env.get_template(HTML_TEMPLATE).render(
+        design=design, css_url=css_url, css_version=css_version, design_hash=digest,
+        theme=theme, theme_css_url=theme_css_url(theme)
+    )
+    css = _env.get_template(CSS_TEMPLATE).render(design=design)
+    return html, css
+
+
+def render_design_items(field, items) -> list:
+    """Tasarımın `cards`/`buttons` öğelerini tam sayfadakiyle aynı HTML parçalarına çevirir."""
+    macro = getattr(_env.get_template(ITEMS_TEMPLATE).module, {"cards": "card", "buttons": "button"}[field])
+    return [str(macro(item)) for item in items]
+
+
+def render_component(component: dict) -> str:
+    """Tek bir bileşeni (card/chart/button) HTML parçası olarak üretir."""
+    return _env.get_template(COMPONENT_TEMPLATE).render(component=component)
+
+
+def _ensure_parent_dir(path):
+    folder = os.path.dirname(path)
+    if folder and folder not in _known_dirs:
+        os.makedirs(folder, exist_ok=True)
+        _known_dirs.add(folder)
+
+
+def hashed_css_path(output_css_path, digest):
+    """static/css/generated_ui.css -> static/css/generated_ui.<özet>.css"""
+    stem, ext = os.path.splitext(output_css_path)
+    return f"{stem}.{digest}{ext}"
+
+
+def _static_url(path, tenant):
+    # Kiracının static/ klasörü kendi adresinden sunulur (varsayılan: /static)
+    rel = os.path.relpath(path, tenant.root).replace(os.sep, "/")
+    if rel.startswith("static/"):
+        return tenant.static_url + rel[len("static"):]
+    return f"{tenant.static_url}/css/{os.path.basename(path)}"
+
+
+def _hash_on_disk(html_path):
+    """
+    Diskteki HTML'in hangi tasarım özetiyle üretildiğini okur (yalnızca baş kısım).
+    Süreç içi önbellek tutulmaz; dosyayı başka bir süreç de yazmış olabilir.
+    """
+    try:
+        with open(html_path, "r", encoding="utf-8") as f:
+            head = f.read(1024)
+    except OSError:
+        return None
+    match = _HASH_META.search(head)
+    return match.group(1) if match else None
+
+
+def _remove_stale_css(output_css_path, keep):
+    stem, ext = os.path.splitext(output_css_path)
+    pattern = re.compile(re.escape(os.path.basename(stem)) + r"\.[0-9a-f]{%d}" % HASH_LENGTH + re.escape(ext) + "$")
+    for path in glob.glob(f"{glob.escape(stem)}.*{ext}"):
+        if path != keep and pattern.match(os.path.basename(path)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def generate_ui_from_design(design_file_path=None, output_html_path=None, output_css_path=None, tenant=None):
+    """
+    Tasarımdan HTML/CSS üretir. CSS, içerik özetini taşıyan
+    `<output_css_path gövdesi>.<özet>.css` adıyla yazılır. Diskteki çıktı aynı
+    özetle üretilmişse hiçbir şey yazılmaz. Yazmalar atomiktir. Tasarım
+    ortak yükleyiciyle doğrulanır; geçersizse (DesignValidationError) hiçbir
+    çıktı yazılmaz. Verilmeyen yollar kiracının (varsayılan: proje kökü)
+    tasarımı ve çıktı hedefleridir; sayfa kiracının temasıyla render edilir.
+    Tasarım özetini döndürür.
+    """
+    tenant = get_tenant(tenant)
+    design_file = design_file_path or get_latest_design_file(tenant)
+    output_html_path = output_html_path or tenant.output_html
+    output_css_path = output_css_path or tenant.output_css
+    design = load_design(design_file).data
+
+    digest = design_hash(design, tenant.theme)
+    css_path = hashed_css_path(output_css_path, digest)
+
+    if _hash_on_disk(output_html_path) == digest and os.path.exists(css_path):
+        WRITE_STATS["skipped"] += 1
+        print(f"⏭  Tasarım değişmedi ({digest}), yazma atlandı. "
+              f"(yazılan: {WRITE_STATS['written']}, atlanan: {WRITE_STATS['skipped']})")
+        return digest
+
+    html, css = render_design(design, css_url=_static_url(css_path, tenant), digest=digest, theme=tenant.theme)
+
+    _ensure_parent_dir(output_html_path)
+    _ensure_parent_dir(css_path)
+
+    # Önce CSS: HTML yayınlandığında başvurduğu dosya hazır olmalı
+    atomic_write(css_path, css)
+    atomic_write(output_html_path, html)
+    _remove_stale_css(output_css_path, keep=css_path)
+    WRITE_STATS["written"] += 1
+    for listener in list(_render_listeners):
+        listener(digest, output_html_path)
+    if tenant.is_default:
+        record_activity(ACTIVITY_UI, f"Arayüz yeniden üretildi ({digest})", digest=digest, path=output_html_path)
+
+    print(f"✅ Yeni UI üretildi -> {output_html_path} ({digest})")
+    return digest
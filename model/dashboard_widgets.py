@@ -1,17 +1,228 @@
-# modules/dashboard_widgets.py
+# model/dashboard_widgets.py - Panel widget'ları ve toplu, önbellekli veri katmanı
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, render_template
+
+WIDGET_DB = "data/dashboard.sqlite3"
+# Widget verisinin varsayılan önbellek süresi (sn)
+WIDGET_DEFAULT_TTL = 30.0
+# SQL dışı veri yükleme için eşzamanlı iş parçacığı sayısı
+WIDGET_WORKERS = 4
+
+USERS_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS users ("
+    " id INTEGER PRIMARY KEY, name TEXT, active INTEGER NOT NULL DEFAULT 1, created REAL)"
+)
+
+# Metrik tablolarının adları SQL'e doğrudan yazılır; yalnızca düz tanımlayıcılar kabul edilir
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
 class Widget:
+    """
+    Panel widget'ı. Verisini iki yoldan tanımlar:
+
+    - `metrics`: {ad: (tablo, SQL toplama ifadesi)}. Sayfadaki tüm widget'ların
+      aynı tablodaki metrikleri tek bir SELECT'te hesaplanır.
+    - `load()`: SQL dışı veri; diğer widget'larınkiyle eşzamanlı çağrılır.
+
+    Sonuç `ttl` saniye boyunca veri katmanının önbelleğinden verilir.
+    """
+    type = None
+    metrics = {}
+    ttl = WIDGET_DEFAULT_TTL
+
     def __init__(self, theme):
         self.theme = theme
-    
-    def render(self):
-        return render_template(f'themes/{self.theme}/widgets/{self.type}.html',
-                           data=self.get_data())
+
+    @property
+    def cache_key(self):
+        return self.type
+
+    def template_names(self):
+        # Temaya özel şablon yoksa ortak widget şablonu kullanılır
+        return [f'themes/{self.theme}/widgets/{self.type}.html', f'themes/widgets/{self.type}.html']
+
+    def load(self):
+        return {}
+
+    def get_data(self, data_layer=None):
+        return (data_layer or get_widget_data_layer()).fetch([self])[0]
+
+    def render(self, data_layer=None):
+        return render_template(self.template_names(), data=self.get_data(data_layer))
+
 
 class UserStatsWidget(Widget):
     type = 'user_stats'
-    
-    def get_data(self):
+    metrics = {
+        'total_users': ('users', 'COUNT(*)'),
+        'active_users': ('users', 'COALESCE(SUM(active != 0), 0)')
+    }
+
+
+class WidgetDataLayer:
+    """
+    Bir sayfadaki widget'ların verisini toplu olarak getirir.
+
+    Önbellekte olmayan widget'ların metrikleri tabloya göre gruplanır ve her
+    tablo için tek bir toplama sorgusu çalışır; SQL dışı `load()` çağrıları
+    eşzamanlı yürütülür. Sonuçlar widget'ın `ttl` süresi kadar tutulur;
+    `invalidate(tablo)` o tabloya bağlı kayıtları hemen düşürür.
+
+    Her tablonun bir nesil sayacı vardır; `invalidate` sayacı artırır. Sürmekte
+    olan bir getirme, başladığından beri bağlı tablolarından birinin nesli
+    değiştiyse sonucunu önbelleğe yazmaz (yalnızca çağırana döndürür).
+    """
+
+    def __init__(self, path=WIDGET_DB, workers=WIDGET_WORKERS):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.queries = 0
+        self.hits = 0
+        self.misses = 0
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="widget")
+        self._cache = {}
+        self._generations = {}   # tablo -> nesil
+        self._epoch = 0          # tüm önbelleği düşüren invalidate() sayısı
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(USERS_SCHEMA)
+        self._conn.commit()
+
+    def fetch(self, widgets) -> list:
+        """Widget'ların verilerini aynı sırayla döndürür."""
+        now = time.monotonic()
+        results = [None] * len(widgets)
+        pending = {}
+        with self._lock:
+            for i, widget in enumerate(widgets):
+                entry = self._cache.get(widget.cache_key)
+                if entry is not None and entry[0] > now:
+                    self.hits += 1
+                    results[i] = entry[2]
+                else:
+                    pending.setdefault(widget.cache_key, (widget, []))[1].append(i)
+            self.misses += len(pending)
+            epoch, generations = self._epoch, dict(self._generations)
+        if not pending:
+            return results
+
+        loads = {
+            key: self.executor.submit(widget.load)
+            for key, (widget, _) in pending.items()
+            if type(widget).load is not Widget.load
+        }
+        values = self._aggregate([widget for widget, _ in pending.values()])
+
+        loaded_at = time.monotonic()
+        with self._lock:
+            for key, (widget, indices) in pending.items():
+                data = {name: values[(table, expr)] for name, (table, expr) in widget.metrics.items()}
+                if key in loads:
+                    data.update(loads[key].result())
+                tables = frozenset(table for table, _ in widget.metrics.values())
+                # Getirme sürerken geçersiz kılındıysa eski sonuç önbelleğe yazılmaz
+                if self._epoch == epoch and all(
+                        self._generations.get(t, 0) == generations.get(t, 0) for t in tables):
+                    self._cache[key] = (loaded_at + widget.ttl, tables, data)
+                for i in indices:
+                    results[i] = data
+        return results
+
+    def _aggregate(self, widgets):
+        # tablo -> benzersiz toplama ifadeleri (sıralı)
+        by_table = {}
+        for widget in widgets:
+            for table, expr in widget.metrics.values():
+                if not _IDENTIFIER.match(table):
+                    raise ValueError(f"Geçersiz tablo adı: {table!r}")
+                by_table.setdefault(table, {})[expr] = None
+        values = {}
+        with self._lock:
+            for table, exprs in by_table.items():
+                row = self._conn.execute(f"SELECT {', '.join(exprs)} FROM {table}").fetchone()
+                self.queries += 1
+                values.update(zip(((table, expr) for expr in exprs), row))
+        return values
+
+    def invalidate(self, *tables):
+        """Verilen tablolara bağlı (tablo verilmezse tüm) önbellek kayıtlarını siler."""
+        with self._lock:
+            if not tables:
+                self._epoch += 1
+                self._cache.clear()
+                return
+            changed = set(tables)
+            for table in changed:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            for key in [k for k, entry in self._cache.items() if entry[1] & changed]:
+                del self._cache[key]
+
+    def execute(self, sql, params=(), table=None):
+        """Yazma sorgusu çalıştırır; `table` verilirse ona bağlı önbellek kayıtları düşer."""
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+        if table:
+            self.invalidate(table)
+        return cursor.rowcount
+
+    def stats(self):
+        total = self.hits + self.misses
         return {
-            'total_users': User.query.count(),
-            'active_users': User.query.filter_by(active=True).count()
-        }
\ No newline at end of file
+            "queries": self.queries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+            "entries": len(self._cache)
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+
+def render_widgets(widgets, data_layer=None) -> list:
+    """
+    Sayfadaki widget'ları render eder: veri tek toplu çağrıyla gelir
+    (yavaş `load()`'lar eşzamanlı), her farklı şablon bir kez çözülür.
+    Render çağıran iş parçacığında yapılır; şablonlar `url_for`/`g` gibi
+    uygulama/istek bağlamına ihtiyaç duyabilir. Flask uygulama bağlamında
+    çağrılmalıdır.
+    """
+    layer = data_layer or get_widget_data_layer()
+    data = layer.fetch(widgets)
+    env = current_app.jinja_env
+    templates = {}
+    for widget in widgets:
+        names = tuple(widget.template_names())
+        if names not in templates:
+            templates[names] = env.get_or_select_template(list(names))
+    # Bağlam işlemcileri (ör. tema) bir kez çalışır
+    context = {}
+    current_app.update_template_context(context)
+    return [templates[tuple(widget.template_names())].render(context, data=item)
+            for widget, item in zip(widgets, data)]
+
+
+_data_layer = None
+_init_lock = threading.Lock()
+
+
+def get_widget_data_layer() -> WidgetDataLayer:
+    global _data_layer
+    with _init_lock:
+        if _data_layer is None:
+            _data_layer = WidgetDataLayer()
+    return _data_layer
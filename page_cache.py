@@ -0,0 +1,81 @@
+import threading
+from collections import namedtuple
+
+from ai_core.design_model import load_design
+from ai_core.lru_cache import LRUCache
+from generate_ui import add_render_listener, design_hash, get_latest_design_file, render_design
+
+# Bellekte tutulacak en fazla render edilmiş sayfa (tasarım özeti x tema)
+PAGE_CACHE_SIZE = 64
+
+RenderedPage = namedtuple("RenderedPage", ["digest", "theme", "etag", "html", "css"])
+
+
+class RenderedPageCache:
+    """
+    Üretilmiş arayüzü (tasarım özeti, tema) anahtarıyla bellekte tutar.
+
+    Tasarım ortak yükleyiciden (ai_core.design_model) alınır ve dosya
+    (yol, mtime, boyut) değişmedikçe yeniden okunmaz/özetlenmez; dosya
+    değiştiğinde yeni özet yeni anahtar demektir, eski sayfa doğrudan
+    kullanılmaz olur. Aynı süreçte `generate_ui_from_design` yeni çıktı
+    yazdığında önbellek ayrıca hemen temizlenir.
+    """
+
+    def __init__(self, max_entries=PAGE_CACHE_SIZE, css_url_pattern="/generated_ui/{digest}.css"):
+        self.pages = LRUCache(max_entries=max_entries)
+        self.css_url_pattern = css_url_pattern
+        self.renders = 0
+        self.invalidations = 0
+        self._designs = {}
+        self._lock = threading.Lock()
+        add_render_listener(self._on_render)
+
+    def _on_render(self, digest, output_html_path):
+        self.invalidate()
+
+    def invalidate(self):
+        self.invalidations += 1
+        self.pages.clear()
+        with self._lock:
+            self._designs.clear()
+
+    def load_design(self, design_file):
+        """(tasarım, özet) döndürür; dosya değişmediyse yeniden ayrıştırmaz."""
+        loaded = load_design(design_file)
+        with self._lock:
+            cached = self._designs.get(loaded.path)
+            if cached and cached[0] == loaded.version:
+                return loaded.data, cached[1]
+        digest = design_hash(loaded.data)
+        with self._lock:
+            self._designs[loaded.path] = (loaded.version, digest)
+        return loaded.data, digest
+
+    def current_digest(self, design_file=None):
+        _, digest = self.load_design(design_file or get_latest_design_file())
+        return digest
+
+    def get_page(self, theme, design_file=None) -> RenderedPage:
+        design, digest = self.load_design(design_file or get_latest_design_file())
+        key = (digest, theme)
+        page = self.pages.get(key)
+        if page is None:
+            html, css = render_design(design, css_url=self.css_url_pattern.format(digest=digest), digest=digest,
+                                      theme=theme)
+            page = RenderedPage(digest, theme, f"{digest}-{theme}", html, css)
+            self.pages.put(key, page)
+            self.renders += 1
+        return page
+
+    def find_css(self, digest):
+        """Önbellekteki herhangi bir temadan verilen özetin CSS'ini döndürür."""
+        for key in self.pages.keys():
+            if key[0] == digest:
+                page = self.pages.peek(key)
+                if page is not None:
+                    return page.css
+        return None
+
+    def stats(self):
+        return {**self.pages.stats(), "renders": self.renders, "invalidations": self.invalidations}
@@ -0,0 +1,114 @@
+import json
+import os
+import random
+import threading
+import time
+
+THEMES_DIR = "static/themes"
+THEME_TEMPLATES_DIR = "templates/themes"
+# Tema klasörleri en fazla bu aralıkla (sn) değişiklik için kontrol edilir
+THEME_REFRESH_TTL = 30
+
+
+class ThemeRegistry:
+    """
+    `static/themes/<ad>/theme.json` dosyalarından bir kez oluşturulan tema kaydı.
+
+    İstek başına dosya sistemi taraması yapılmaz; `ttl` saniye geçtikten sonra
+    klasör ve theme.json değişiklik zamanlarına bakılır, yalnızca değişiklik
+    varsa kayıt yeniden kurulur.
+    """
+
+    def __init__(self, themes_dir=THEMES_DIR, templates_dir=THEME_TEMPLATES_DIR, ttl=THEME_REFRESH_TTL):
+        self.themes_dir = themes_dir
+        self.templates_dir = templates_dir
+        self.ttl = ttl
+        self.reloads = 0
+        self._themes = {}
+        self._selectable = []
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.refresh(force=True)
+
+    # --- Tarama ---
+    def _scan_signature(self):
+        entries = []
+        for root in (self.themes_dir, self.templates_dir):
+            try:
+                entries.append((root, os.stat(root).st_mtime_ns))
+            except FileNotFoundError:
+                continue
+        if os.path.isdir(self.themes_dir):
+            with os.scandir(self.themes_dir) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        meta = os.path.join(entry.path, "theme.json")
+                        mtime = os.stat(meta).st_mtime_ns if os.path.exists(meta) else 0
+                        entries.append((entry.name, mtime))
+        return tuple(sorted(entries))
+
+    def _build(self):
+        themes = {}
+        if os.path.isdir(self.themes_dir):
+            with os.scandir(self.themes_dir) as it:
+                for entry in it:
+                    if not entry.is_dir():
+                        continue
+                    meta = {}
+                    meta_path = os.path.join(entry.path, "theme.json")
+                    if os.path.exists(meta_path):
+                        try:
+                            with open(meta_path, "r", encoding="utf-8") as f:
+                                meta = json.load(f)
+                        except (OSError, json.JSONDecodeError) as e:
+                            print(f"⚠️ {meta_path} okunamadı: {e}")
+                    themes[entry.name] = {
+                        "name": entry.name,
+                        "static": f"static/themes/{entry.name}",
+                        "template": f"themes/{entry.name}",
+                        "meta": meta,
+                        "has_dashboard": os.path.exists(
+                            os.path.join(self.templates_dir, entry.name, "dashboard.html")
+                        )
+                    }
+        return themes
+
+    def refresh(self, force=False):
+        """TTL dolduysa (ya da `force`) değişiklik kontrolü yapar, gerekirse yeniden kurar."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.ttl:
+            return False
+        with self._lock:
+            if not force and now - self._checked_at < self.ttl:
+                return False
+            self._checked_at = now
+            signature = self._scan_signature()
+            if not force and signature == self._signature:
+                return False
+            themes = self._build()
+            self._themes = themes
+            # Rastgele seçim yalnızca dashboard şablonu olan temalar arasından yapılır
+            self._selectable = sorted(n for n, t in themes.items() if t["has_dashboard"]) or sorted(themes)
+            self._signature = signature
+            self.reloads += 1
+            return True
+
+    # --- Sorgular ---
+    def names(self):
+        self.refresh()
+        return sorted(self._themes)
+
+    def get(self, name):
+        self.refresh()
+        return self._themes.get(name)
+
+    def is_valid(self, name) -> bool:
+        theme = self.get(name)
+        return bool(theme and theme["has_dashboard"])
+
+    def resolve(self, requested=None):
+        """Çerezdeki tema geçerliyse onu, değilse rastgele bir temayı döndürür."""
+        if requested and self.is_valid(requested):
+            return requested
+        return random.choice(self._selectable) if self._selectable else "default"